@@ -0,0 +1,153 @@
+import argparse
+import sys
+
+from game_of_life import benchmarks
+
+
+class BenchmarkRunnerCreatorFromArgs(object):
+    """Turns the results of `argparse.ArgumentParser.parse_args()` into
+    benchmark runs.
+    """
+
+    def __init__(self, args):
+        """Creates a `BenchmarkRunnerCreatorFromArgs` object
+
+        Args:
+            args - a `argparse.Namespace` object that describes the command
+                line arguments of the script
+        """
+        self._args = args
+
+    def get_cases(self):
+        """Returns the `benchmarks.Case`s selected by the arguments."""
+        if self._args.cases:
+            try:
+                return [
+                    benchmarks.parse_case_name(name)
+                    for name in self._args.cases.split(',')
+                ]
+            except ValueError as error:
+                raise argparse.ArgumentTypeError(str(error))
+
+        cases = benchmarks.DEFAULT_CASES
+        for field in ['benchmark', 'workload', 'engine']:
+            selected = getattr(self._args, field + 's')
+            if selected:
+                values = selected.split(',')
+                cases = [
+                    case for case in cases if getattr(case, field) in values
+                ]
+        return cases
+
+    def run(self, output_file):
+        """Runs the selected cases, printing a line per result to
+        `output_file`. Returns the process exit status: 1 if any case
+        regressed against the baseline and 0 otherwise.
+        """
+        if self._args.min_time < 0:
+            raise argparse.ArgumentTypeError('--min-time can not be negative.')
+        if self._args.tolerance < 0:
+            raise argparse.ArgumentTypeError(
+                '--tolerance can not be negative.'
+            )
+
+        baseline_results = None
+        if self._args.baseline:
+            with open(self._args.baseline) as baseline_file:
+                baseline_results = benchmarks.load_results(baseline_file)
+
+        def report(result):
+            output_file.write(benchmarks.format_result(result) + '\n')
+            output_file.flush()
+
+        results = benchmarks.run_cases(
+            self.get_cases(),
+            min_time=self._args.min_time,
+            report=report
+        )
+
+        if self._args.output:
+            with open(self._args.output, 'w') as results_file:
+                benchmarks.save_results(results, results_file)
+
+        if baseline_results is None:
+            return 0
+
+        regressions = benchmarks.compare_results(
+            results,
+            baseline_results,
+            tolerance=self._args.tolerance
+        )
+        for regression in regressions:
+            output_file.write('REGRESSION: %s\n' % regression)
+        return 1 if regressions else 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        usage=""" %(prog)s [options].
+
+Times stepping boards with every engine, loading board files and drawing
+boards, on random soups and grids of glider guns of up to 16k x 16k cells.
+Every case runs in its own process and reports its rate, its peak memory and
+the objects it left allocated. Results can be saved with "--output" and
+compared against an earlier run with "--baseline", in which case the exit
+status is 1 if any case got worse by more than "--tolerance".
+
+Sample Calls:
+python %(prog)s --output=baseline.json
+python %(prog)s --baseline=baseline.json --benchmarks=step --engines=packed
+python %(prog)s --cases=step/soup-256/dense,draw/gun-1k/packed --min-time=5
+"""
+    )
+    parser.add_argument(
+        '--benchmarks',
+        help="""Comma separated benchmarks to run out of "step", "load" and
+        "draw". Defaults to all of them."""
+    )
+    parser.add_argument(
+        '--workloads',
+        help="""Comma separated workloads to run, such as "soup-1k" or
+        "gun-4k". Defaults to all of them."""
+    )
+    parser.add_argument(
+        '--engines',
+        help="""Comma separated engines to run, or file formats out of
+        "text", "rle" and "binary" for the "load" benchmark. Defaults to all
+        of them."""
+    )
+    parser.add_argument(
+        '--cases',
+        help="""Comma separated BENCHMARK/WORKLOAD/ENGINE cases to run instead
+        of the default ones, such as "step/soup-2k/dense". Workloads are
+        "soup-SIZE" or "gun-SIZE" boards of SIZE x SIZE cells, where SIZE may
+        end with "k"."""
+    )
+    parser.add_argument(
+        '--min-time',
+        type=float,
+        default=benchmarks.DEFAULT_MIN_TIME,
+        help="""Number of seconds to repeat every case for. Defaults to
+        %s.""" % benchmarks.DEFAULT_MIN_TIME
+    )
+    parser.add_argument(
+        '--output',
+        help='JSON file to save the results to.'
+    )
+    parser.add_argument(
+        '--baseline',
+        help='JSON file of earlier results to compare the results to.'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=benchmarks.DEFAULT_TOLERANCE,
+        help="""Fraction by which a case may be slower or use more memory than
+        the baseline before it counts as a regression. Defaults to %s.""" %
+        benchmarks.DEFAULT_TOLERANCE
+    )
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    sys.exit(BenchmarkRunnerCreatorFromArgs(parse_args()).run(sys.stdout))
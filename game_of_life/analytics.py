@@ -0,0 +1,139 @@
+"""Population and activity statistics kept up to date while a board steps.
+
+A `Statistics` object is fed the cells born and died in every step, which the
+set based engines know as a by-product of working out the next generation, so
+keeping it up to date costs time in proportion to the cells that changed
+rather than to the population. It holds:
+
+- the population and the number of births and deaths of the last step, as
+  well as of the whole run,
+- the bounding box of the live cells, and
+- a heatmap with the number of times every cell was born or died.
+
+The bounding box is worked out from the number of live cells in every column
+and row. It only needs a scan of the occupied columns and rows after a step
+emptied one on its edge, and only when it's asked for.
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _add_count(counts, key, delta):
+    count = counts.get(key, 0) + delta
+    if count:
+        counts[key] = count
+    else:
+        del counts[key]
+    return count
+
+
+class Statistics(object):
+    """Statistics of a run, see the top of this module."""
+
+    def __init__(self, live_cells=()):
+        """Creates a `Statistics` object for a board that starts with
+        `live_cells`.
+
+        Keyword Args:
+            live_cells - iterable of (x, y) integer pairs representing the
+                live cells of the board
+        """
+        self.step_count = 0
+        self.population = 0
+        self.births = 0
+        self.deaths = 0
+        self.total_births = 0
+        self.total_deaths = 0
+        self._column_counts = {}
+        self._row_counts = {}
+        self._bounding_box = None
+        self._heatmap = {}
+        for x, y in live_cells:
+            self.population += 1
+            _add_count(self._column_counts, x, 1)
+            _add_count(self._row_counts, y, 1)
+
+    def update(self, born_cells, died_cells):
+        """Accounts for a step of the board.
+
+        Args:
+            born_cells - sized iterable of the cells that came alive in the
+                step
+            died_cells - sized iterable of the cells that died in the step
+        """
+        self.step_count += 1
+        self.births = len(born_cells)
+        self.deaths = len(died_cells)
+        self.total_births += self.births
+        self.total_deaths += self.deaths
+        self.population += self.births - self.deaths
+
+        heatmap = self._heatmap
+        column_counts = self._column_counts
+        row_counts = self._row_counts
+        bounding_box = self._bounding_box
+        for cell in born_cells:
+            heatmap[cell] = heatmap.get(cell, 0) + 1
+            x, y = cell
+            _add_count(column_counts, x, 1)
+            _add_count(row_counts, y, 1)
+            if bounding_box is not None:
+                x_start, y_start, x_stop, y_stop = bounding_box
+                bounding_box = (
+                    min(x_start, x),
+                    min(y_start, y),
+                    max(x_stop, x + 1),
+                    max(y_stop, y + 1)
+                )
+        for cell in died_cells:
+            heatmap[cell] = heatmap.get(cell, 0) + 1
+            x, y = cell
+            is_column_empty = not _add_count(column_counts, x, -1)
+            is_row_empty = not _add_count(row_counts, y, -1)
+            if bounding_box is None:
+                continue
+
+            x_start, y_start, x_stop, y_stop = bounding_box
+            # Only emptying a column or row on the edge shrinks the box.
+            if is_column_empty and x in (x_start, x_stop - 1) or \
+                    is_row_empty and y in (y_start, y_stop - 1):
+                bounding_box = None
+        self._bounding_box = bounding_box
+
+    def get_bounding_box(self):
+        """Returns the `(x_start, y_start, x_stop, y_stop)` bounding box of
+        the live cells, the stops being one past the last live column and row,
+        or `None` if there are no live cells.
+        """
+        if not self._column_counts:
+            return None
+        if self._bounding_box is None:
+            self._bounding_box = (
+                min(self._column_counts),
+                min(self._row_counts),
+                max(self._column_counts) + 1,
+                max(self._row_counts) + 1
+            )
+        return self._bounding_box
+
+    def get_heatmap(self):
+        """Returns a dict of every cell that was ever born or died to the
+        number of times it was.
+        """
+        return dict(self._heatmap)
+
+    def get_heatmap_array(self, x_start, y_start, x_stop, y_stop):
+        """Returns the heatmap of the cells with `x_start <= x < x_stop` and
+        `y_start <= y < y_stop` as a (y_stop - y_start, x_stop - x_start)
+        NumPy `int64` array. Requires NumPy.
+        """
+        heatmap = numpy.zeros(
+            (y_stop - y_start, x_stop - x_start),
+            dtype=numpy.int64
+        )
+        for (x, y), count in self._heatmap.iteritems():
+            if x_start <= x < x_stop and y_start <= y < y_stop:
+                heatmap[y - y_start, x - x_start] = count
+        return heatmap
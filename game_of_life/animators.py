@@ -4,23 +4,67 @@
 object that represents the initial game board state.
 """
 import curses
+import itertools
 import time
 
+from game_of_life.board import BOUNDED
+from game_of_life.cycles import CycleDetector
+from game_of_life.generations import Frame
+from game_of_life.hashlife import HashLifeBoard
+from game_of_life.simulation import DEFAULT_GENERATIONS_PER_FRAME
+from game_of_life.simulation import Simulation
+from game_of_life.viewport import Viewport
+
+# Number of steps from which `SingleFrameAnimator` jumps straight to the
+# requested step with HashLife rather than stepping one generation at a time.
+HASHLIFE_STEP_THRESHOLD = 1000
+
+DEFAULT_FRAMES_PER_SECOND = 1.0
+
+# Seconds to wait before checking again for a frame that isn't ready yet.
+FRAME_POLL_INTERVAL = 0.01
+
 
 class PrintAllAnimator(object):
-    """`Animator` that prints an iteration of the `Board` one step at a time,
-    onto the screen, sleeping for a short time in between printing.
-    """
+    """`Animator` that prints an iteration of the `Board` one frame at a time,
+    onto the screen, at a steady number of frames per second.
 
-    _sleep_time = 1
+    The board is stepped on a background thread, see
+    `game_of_life.simulation`. If printing falls behind, the frames it had no
+    time for are dropped.
+    """
 
-    def __init__(self, drawer):
+    def __init__(
+        self,
+        drawer,
+        generations_per_frame=DEFAULT_GENERATIONS_PER_FRAME,
+        frames_per_second=DEFAULT_FRAMES_PER_SECOND,
+        hooks=None,
+        first_generation=0,
+        checkpointer=None
+    ):
         """Creates the `PrintAllAnimator`
 
         Args:
            drawer - `Drawer` object that describes how each board will be drawn
+
+        Keyword Args:
+            generations_per_frame - number of generations the board is stepped
+                between two printed iterations
+            frames_per_second - number of iterations printed every second
+            hooks - `instrumentation.Hooks` object told about every step and
+                every printed iteration
+            first_generation - generation of the board being animated
+            checkpointer - `checkpoints.Checkpointer` object that saves
+                checkpoints of the board as it's stepped. It's closed when
+                the animation ends.
         """
         self._drawer = drawer
+        self._generations_per_frame = generations_per_frame
+        self._frames_per_second = frames_per_second
+        self._hooks = hooks
+        self._first_generation = first_generation
+        self._checkpointer = checkpointer
 
     def animate(self, board):
         """Given a `Board` representing the initial game state, draws the
@@ -30,30 +74,229 @@ class PrintAllAnimator(object):
         Args:
             board - `Board` to animate
         """
-        iteration = 1
+        simulation = Simulation(
+            board,
+            generations_per_frame=self._generations_per_frame,
+            hooks=self._hooks,
+            first_generation=self._first_generation,
+            checkpointer=self._checkpointer,
+            track_step_diffs=False
+        )
+        simulation.start()
+        try:
+            self._print_frames(simulation)
+        finally:
+            simulation.stop()
+            if self._checkpointer is not None:
+                self._checkpointer.close()
+
+    def _print_frames(self, simulation):
+        frame_interval = 1.0 / self._frames_per_second
+        next_frame_time = time.time()
         while True:
-            to_print = 'Iteration %s\n' % iteration
-            to_print += self._drawer.draw(board)
-            to_print += '\n'
+            is_behind = time.time() > next_frame_time + frame_interval
+            frame = simulation.get_frame(
+                timeout=FRAME_POLL_INTERVAL,
+                drop_queued_frames=is_behind
+            )
+            if frame is None:
+                continue
+
+            render_start_time = time.time()
+            to_print = 'Iteration %s\n%s\n' % (
+                frame.generation + 1,
+                self._drawer.draw(frame.board)
+            )
             print to_print
-            iteration += 1
-            board.step()
-            time.sleep(self._sleep_time)
+            if self._hooks is not None:
+                self._hooks.on_render(
+                    frame.generation,
+                    time.time() - render_start_time,
+                    len(to_print) + 1
+                )
+
+            next_frame_time = max(
+                next_frame_time + frame_interval,
+                time.time() - frame_interval
+            )
+            time.sleep(max(next_frame_time - time.time(), 0))
+
+
+class RecordingAnimator(object):
+    """`Animator` that records the iterations of the `Board` to a file or a
+    pipe as fast as it can be stepped, see `game_of_life.recording`.
+
+    The board is stepped on a background thread, see
+    `game_of_life.simulation`, while every frame is encoded and handed to a
+    `recording.FrameWriter`. No frame is dropped: if encoding or writing falls
+    behind, the simulation waits for it. The cells born and died of every
+    step are only worked out for encoders that use them.
+    """
+
+    def __init__(
+        self,
+        encoder,
+        writer,
+        generations_per_frame=DEFAULT_GENERATIONS_PER_FRAME,
+        frame_count=None,
+        hooks=None,
+        first_generation=0,
+        checkpointer=None
+    ):
+        """Creates the `RecordingAnimator`
+
+        Args:
+            encoder - encoder object from `recording.create_encoder()` or
+                `exporters.create_exporter()` that turns frames into bytes
+            writer - `recording.FrameWriter` object the encoded frames are
+                written to. It's closed when the animation ends.
+
+        Keyword Args:
+            generations_per_frame - number of generations the board is stepped
+                between two recorded iterations
+            frame_count - number of iterations recorded, including the
+                initial one, or `None` to record until interrupted
+            hooks - `instrumentation.Hooks` object told about every step and
+                every recorded iteration
+            first_generation - generation of the board being animated
+            checkpointer - `checkpoints.Checkpointer` object that saves
+                checkpoints of the board as it's stepped. It's closed when
+                the animation ends.
+        """
+        self._encoder = encoder
+        self._writer = writer
+        self._generations_per_frame = generations_per_frame
+        self._frame_count = frame_count
+        self._hooks = hooks
+        self._first_generation = first_generation
+        self._checkpointer = checkpointer
+        self._recorded_frame_count = 0
+
+    def animate(self, board):
+        """Given a `Board` representing the initial game state, records
+        `frame_count` iterations of the board, or runs until interrupted.
+
+        Args:
+            board - `Board` to animate
+        """
+        simulation = Simulation(
+            board,
+            generations_per_frame=self._generations_per_frame,
+            hooks=self._hooks,
+            first_generation=self._first_generation,
+            checkpointer=self._checkpointer,
+            track_step_diffs=self._encoder.uses_step_diffs
+        )
+        simulation.start()
+        try:
+            self._record_frames(simulation)
+        finally:
+            simulation.stop()
+            try:
+                # Interrupted recordings are ended properly as well.
+                if self._recorded_frame_count:
+                    self._writer.write(self._encoder.get_trailer())
+                self._writer.close()
+                if self._recorded_frame_count:
+                    for offset, data in self._encoder.get_header_updates():
+                        self._writer.overwrite(offset, data)
+            finally:
+                if self._checkpointer is not None:
+                    self._checkpointer.close()
+
+    def _record_frames(self, simulation):
+        if self._frame_count is None:
+            frame_numbers = itertools.count()
+        else:
+            frame_numbers = xrange(self._frame_count)
+
+        for frame_number in frame_numbers:
+            # Waiting with a timeout lets KeyboardInterrupt through.
+            frame = None
+            while frame is None:
+                frame = simulation.get_frame(timeout=FRAME_POLL_INTERVAL)
+
+            render_start_time = time.time()
+            if not frame_number:
+                self._writer.write(self._encoder.get_header(frame.board))
+            encoded_frame = self._encoder.encode(frame)
+            self._writer.write(encoded_frame)
+            self._recorded_frame_count += 1
+            if self._hooks is not None:
+                self._hooks.on_render(
+                    frame.generation,
+                    time.time() - render_start_time,
+                    len(encoded_frame)
+                )
 
 
 class CursesAnimator(object):
     """`Animator` that uses `curses`
     http://en.wikipedia.org/wiki/Curses_(programming_library), a terminal
     control library to animate the board.
+
+    The board is stepped on a background thread, see
+    `game_of_life.simulation`, while frames are drawn at a steady number of
+    frames per second. If drawing falls behind, the frames it had no time for
+    are dropped.
+
+    Only the part of the board that fits on the screen is drawn, and it can be
+    panned with the arrow keys or h/j/k/l and zoomed out and in with - and +.
+    The visible part is drawn in full once. After that, unless zoomed out,
+    only the visible cells that changed since the last frame are redrawn, so
+    the time a frame takes depends on the size of the screen and the activity
+    on the board rather than the size of the board.
     """
 
-    def __init__(self, drawer):
+    _board_row = 5
+
+    _key_to_pan_direction = {
+        curses.KEY_LEFT: (-1, 0),
+        curses.KEY_RIGHT: (1, 0),
+        curses.KEY_UP: (0, -1),
+        curses.KEY_DOWN: (0, 1),
+        ord('h'): (-1, 0),
+        ord('l'): (1, 0),
+        ord('k'): (0, -1),
+        ord('j'): (0, 1),
+    }
+
+    def __init__(
+        self,
+        drawer,
+        generations_per_frame=DEFAULT_GENERATIONS_PER_FRAME,
+        frames_per_second=DEFAULT_FRAMES_PER_SECOND,
+        hooks=None,
+        first_generation=0,
+        checkpointer=None,
+        history=None
+    ):
         """Creates the `CursesAnimator`
 
         Args:
            drawer - `Drawer` object that describes how each board will be drawn
+
+        Keyword Args:
+            generations_per_frame - number of generations the board is stepped
+                between two frames
+            frames_per_second - number of frames drawn every second
+            hooks - `instrumentation.Hooks` object told about every step and
+                every drawn frame
+            first_generation - generation of the board being animated
+            checkpointer - `checkpoints.Checkpointer` object that saves
+                checkpoints of the board as it's stepped. It's closed when
+                the animation ends.
+            history - `history.History` object every drawn frame is recorded
+                in, which lets the user step back through them. If `None`,
+                frames can't be stepped back to.
         """
         self._drawer = drawer
+        self._generations_per_frame = generations_per_frame
+        self._frames_per_second = frames_per_second
+        self._hooks = hooks
+        self._first_generation = first_generation
+        self._checkpointer = checkpointer
+        self._history = history
 
     def animate(self, board):
         """Animates the game board using curses to continually draw and refresh
@@ -63,37 +306,247 @@ class CursesAnimator(object):
 
     def _run_curses(self, board):
         screen = self._initialize_curses_screen()
+        viewport = Viewport(
+            board.x_size,
+            board.y_size,
+            *self._get_board_area(screen),
+            cell_width=self._drawer.get_cell_width()
+        )
+
+        simulation = Simulation(
+            board,
+            generations_per_frame=self._generations_per_frame,
+            hooks=self._hooks,
+            first_generation=self._first_generation,
+            checkpointer=self._checkpointer
+        )
+        simulation.start()
+        try:
+            self._animate_frames(screen, viewport, simulation)
+        finally:
+            simulation.stop()
+            if self._checkpointer is not None:
+                self._checkpointer.close()
 
-        key_input = None
-        iteration = 0
+        curses.endwin()
+
+    def _animate_frames(self, screen, viewport, simulation):
+        frame_interval = 1.0 / self._frames_per_second
+        frame = latest_frame = simulation.get_frame()
+        self._record_frame(frame)
+        self._draw_header_on_screen(screen)
+        render_start_time = time.time()
+        output_bytes = self._draw_board_on_screen(
+            screen,
+            frame.board,
+            viewport
+        )
+        next_frame_time = time.time() + frame_interval
 
         # Continues to run until the user hits 'q'
-        while key_input != ord('q'):
-            self._draw_board_on_screen(screen, board, iteration)
+        while True:
+            self._draw_iteration_on_screen(
+                screen,
+                frame.generation,
+                is_paused=frame is not latest_frame
+            )
+            screen.noutrefresh()
+            curses.doupdate()
+            # Only passes that drew something new count as renders.
+            if self._hooks is not None and render_start_time is not None:
+                self._hooks.on_render(
+                    frame.generation,
+                    time.time() - render_start_time,
+                    output_bytes
+                )
+            render_start_time = None
+
+            # Waits for a key until the next frame is due, or for as long as
+            # it takes while paused on a past frame.
+            if frame is latest_frame:
+                screen.timeout(
+                    max(int((next_frame_time - time.time()) * 1000), 0)
+                )
+            else:
+                screen.timeout(-1)
             key_input = screen.getch()
-            iteration += 1
-            board.step()
+            if key_input == ord('q'):
+                break
+            elif self._move_viewport(screen, viewport, key_input):
+                self._draw_header_on_screen(screen)
+                render_start_time = time.time()
+                output_bytes = self._draw_board_on_screen(
+                    screen,
+                    frame.board,
+                    viewport
+                )
+                continue
 
-        curses.endwin()
+            # Stepping through past frames pauses the animation until the
+            # latest frame is reached again.
+            past_frame = self._get_past_frame(key_input, frame, latest_frame)
+            if past_frame is not None:
+                frame = past_frame
+                render_start_time = time.time()
+                output_bytes = self._draw_board_on_screen(
+                    screen,
+                    frame.board,
+                    viewport
+                )
+                continue
+            elif frame is not latest_frame:
+                continue
+
+            now = time.time()
+            if key_input == curses.ERR and now < next_frame_time:
+                continue
+
+            # Any other key shows the next frame straight away.
+            next_frame = simulation.get_frame(
+                timeout=0,
+                drop_queued_frames=now > next_frame_time + frame_interval
+            )
+            if next_frame is None:
+                # The simulation is slower than the frame rate.
+                next_frame_time = now + FRAME_POLL_INTERVAL
+                continue
+
+            render_start_time = time.time()
+            output_bytes = self._draw_frame_on_screen(
+                screen,
+                next_frame,
+                viewport
+            )
+            frame = latest_frame = next_frame
+            self._record_frame(frame)
+            next_frame_time = max(next_frame_time + frame_interval, now)
+
+    def _record_frame(self, frame):
+        if self._history is not None:
+            self._history.record(*frame)
+
+    def _get_past_frame(self, key_input, frame, latest_frame):
+        """Returns the frame `key_input` moves to from `frame` through the
+        history, `latest_frame` if it moves past the last recorded frame, or
+        `None` if it doesn't move through the history.
+        """
+        if self._history is None:
+            return None
+
+        if key_input == ord('b'):
+            generation = self._history.get_previous_generation(
+                frame.generation
+            )
+        elif key_input == ord('r'):
+            generations = self._history.get_generations()
+            generation = generations[0] if generations else None
+        elif frame is not latest_frame and key_input != curses.ERR:
+            # Any other key steps forward while looking at past frames.
+            generation = self._history.get_next_generation(frame.generation)
+            if generation is None or generation == latest_frame.generation:
+                return latest_frame
+        else:
+            return None
+
+        if generation is None or generation == frame.generation:
+            return frame
+        return Frame(
+            generation,
+            self._history.get_board(generation),
+            frozenset(),
+            frozenset()
+        )
 
     def _initialize_curses_screen(self):
         screen = curses.initscr()
-        screen.nodelay(1)
-        screen.timeout(1000)
+        screen.keypad(1)
         return screen
 
-    def _draw_board_on_screen(self, screen, board, iteration):
-        screen.addstr(0, 0, 'Game Of Life')
-        screen.addstr(
-            1,
-            0,
-            'Welcome to the game of life! Hit q to quit or press or hold any'
-        )
-        screen.addstr(2, 0, 'other character to speed up the animation')
+    def _get_board_area(self, screen):
+        """Returns the (columns, rows) available to the board. The last column
+        is left empty because curses can't write to the bottom right corner.
+        """
+        rows, columns = screen.getmaxyx()
+        return max(columns - 1, 0), max(rows - self._board_row, 0)
+
+    def _move_viewport(self, screen, viewport, key_input):
+        """Pans, zooms or resizes `viewport` as requested by `key_input`,
+        returning `True` if it did.
+        """
+        if key_input == curses.KEY_RESIZE:
+            screen.clear()
+            viewport.resize(*self._get_board_area(screen))
+        elif key_input in self._key_to_pan_direction:
+            viewport.pan(*self._key_to_pan_direction[key_input])
+        elif key_input in (ord('+'), ord('=')):
+            viewport.zoom_in()
+        elif key_input == ord('-') and self._drawer.can_draw_blocks():
+            viewport.zoom_out()
+        else:
+            return False
+        return True
 
-        screen.addstr(4, 0, 'Iteration %i' % iteration)
-        screen.addstr(5, 0, self._drawer.draw(board))
-        screen.refresh()
+    def _draw_header_on_screen(self, screen):
+        for row, line in enumerate([
+            'Game Of Life',
+            'Welcome to the game of life! Hit q to quit or press or hold any',
+            'other character to speed up the animation. Arrow keys or h/j/k/l',
+            'pan the board, - and + zoom out and in, b steps back, r rewinds.',
+        ]):
+            self._draw_line_on_screen(screen, row, line)
+
+    def _draw_iteration_on_screen(self, screen, iteration, is_paused=False):
+        line = 'Iteration %i' % iteration
+        if is_paused:
+            line += ' (paused, b steps back, any other key steps forward)'
+        self._draw_line_on_screen(screen, 4, line, clear=True)
+
+    def _draw_line_on_screen(self, screen, row, line, clear=False):
+        rows, columns = screen.getmaxyx()
+        if row >= rows:
+            return
+        if clear:
+            screen.move(row, 0)
+            screen.clrtoeol()
+        screen.addnstr(row, 0, line, max(columns - 1, 0))
+
+    def _draw_board_on_screen(self, screen, board, viewport):
+        """Draws the visible part of `board`, returning the number of
+        characters drawn.
+        """
+        if not viewport.rows:
+            return 0
+
+        screen.move(self._board_row, 0)
+        screen.clrtobot()
+        drawn_board = self._drawer.draw_viewport(board, viewport)
+        screen.addstr(self._board_row, 0, drawn_board)
+        return len(drawn_board)
+
+    def _draw_frame_on_screen(self, screen, frame, viewport):
+        """Draws `frame` over the frame before it, redrawing only the cells
+        that changed when possible. Returns the number of characters drawn.
+        """
+        can_draw_cells_in_place = viewport.zoom == 1 and \
+            self._drawer.can_draw_cells_in_place()
+        if not can_draw_cells_in_place:
+            return self._draw_board_on_screen(screen, frame.board, viewport)
+
+        output_bytes = 0
+        for cells, is_live_cell in [
+            (frame.born_cells, True),
+            (frame.died_cells, False)
+        ]:
+            cell_string = self._drawer.draw_cell(is_live_cell)
+            for cell in cells:
+                if not viewport.contains(cell):
+                    continue
+                row, column = self._drawer.get_cell_position(
+                    viewport.get_relative_position(cell)
+                )
+                screen.addstr(self._board_row + row, column, cell_string)
+                output_bytes += len(cell_string)
+        return output_bytes
 
 
 def print_function(string):
@@ -109,7 +562,10 @@ class SingleFrameAnimator(object):
         self,
         drawer,
         step_to_animate,
-        print_function=print_function
+        print_function=print_function,
+        hashlife_step_threshold=HASHLIFE_STEP_THRESHOLD,
+        detect_cycles=False,
+        hooks=None
     ):
         """Creates a `SingleFrameAnimator` object
         Args:
@@ -119,17 +575,73 @@ class SingleFrameAnimator(object):
         Keyword Args:
             print_function - injected dependency that describes how the output
                 will be printed
+            hashlife_step_threshold - number of steps from which the board is
+                advanced with HashLife instead of being stepped one generation
+                at a time
+            detect_cycles - if `True`, stops stepping the board as soon as it
+                repeats an earlier generation and works out the requested
+                step from the cycle it entered
+            hooks - `instrumentation.Hooks` object told about every step and
+                about drawing the frame
         """
         self._drawer = drawer
         self._step_to_animate = step_to_animate
         self._print_function = print_function
+        self._hashlife_step_threshold = hashlife_step_threshold
+        self._detect_cycles = detect_cycles
+        self._hooks = hooks
 
     def animate(self, board):
         """Animates a single frame on the board described by
         `step_to_animate`
         """
-        for _ in xrange(self._step_to_animate - 1):
-            board.step()
+        steps = self._step_to_animate - 1
+        generation = 0
+        if self._detect_cycles:
+            # Boards that haven't settled by the HashLife threshold are left
+            # for HashLife to finish.
+            start_time = time.time()
+            cycle_detector = CycleDetector(board)
+            steps_to_detect = min(steps, self._hashlife_step_threshold)
+            cycle_detector.advance(steps_to_detect)
+            if cycle_detector.has_found_cycle():
+                cycle_detector.advance(steps - steps_to_detect)
+                steps_to_detect = steps
+            board = cycle_detector.get_board()
+            steps -= steps_to_detect
+            generation += steps_to_detect
+            if steps_to_detect:
+                self._report_step(board, generation, start_time)
 
+        # HashLife only steps bounded boards.
+        if steps >= self._hashlife_step_threshold and \
+                board.topology == BOUNDED:
+            start_time = time.time()
+            hashlife_board = HashLifeBoard.from_board(board)
+            hashlife_board.advance(steps)
+            board = hashlife_board.to_board()
+            generation += steps
+            self._report_step(board, generation, start_time)
+        elif self._hooks is None:
+            for _ in xrange(steps):
+                board.step()
+        else:
+            for _ in xrange(steps):
+                start_time = time.time()
+                board.step()
+                generation += 1
+                self._report_step(board, generation, start_time)
+
+        start_time = time.time()
         drawn_board = self._drawer.draw(board)
         self._print_function(drawn_board)
+        if self._hooks is not None:
+            self._hooks.on_render(
+                generation,
+                time.time() - start_time,
+                len(drawn_board)
+            )
+
+    def _report_step(self, board, generation, start_time):
+        if self._hooks is not None:
+            self._hooks.on_step(board, generation, time.time() - start_time)
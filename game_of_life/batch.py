@@ -0,0 +1,327 @@
+"""Runs many boards to a fixed generation and records statistics about each.
+
+`run_batch()` loads board files, such as the ones in `boards/`, advances each
+of them `generations` generations on a `multiprocessing` pool and writes one
+record per board, as JSON lines or CSV, holding its final state in RLE, its
+population and the period of the cycle it settled into, if any.
+
+With a `stack_size`, small boards are stepped together instead: up to
+`stack_size` of them are padded to the same shape and stacked into one
+(boards, y_size, x_size) array that is advanced with a single vectorized
+`next_generation()` call per generation. A mask per board keeps its padding
+dead, so every board behaves exactly as if it was stepped on its own.
+"""
+import collections
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+
+from game_of_life import errors
+from game_of_life.board import Board
+from game_of_life.cycles import CycleDetector
+from game_of_life.cycles import CycleTracker
+from game_of_life.cycles import DEFAULT_MAX_BYTES
+from game_of_life.dense_board import next_generation
+from game_of_life.dense_board import numpy
+from game_of_life.file_formats import create_file_loader
+from game_of_life.pattern_formats import dump_rle
+
+JSON_LINES = 'jsonl'
+CSV = 'csv'
+
+# Largest number of cells of a board that is stepped in a stack.
+STACKED_BOARD_MAX_AREA = 1 << 16
+
+RESULT_FIELDS = [
+    'filename', 'x_size', 'y_size', 'generation', 'population', 'period',
+    'cycle_start', 'rle', 'error'
+]
+
+
+def find_board_filenames(path):
+    """Returns the filenames of the boards to run.
+
+    Args:
+        path - either a directory, all of whose files are boards, or a
+            manifest file listing one board filename per line, relative to
+            the manifest. Blank lines and lines starting with '#' are skipped.
+    """
+    if os.path.isdir(path):
+        return [
+            os.path.join(path, filename)
+            for filename in sorted(os.listdir(path))
+            if not filename.startswith('.') and
+            os.path.isfile(os.path.join(path, filename))
+        ]
+
+    with open(path) as manifest_file:
+        lines = [line.strip() for line in manifest_file]
+    return [
+        os.path.join(os.path.dirname(path), line)
+        for line in lines if line and not line.startswith('#')
+    ]
+
+
+def simulate_board(
+    board,
+    generations,
+    max_cycle_bytes=DEFAULT_MAX_BYTES
+):
+    """Advances a board `generations` generations, stopping early once it
+    repeats itself. Returns the `(board, period, cycle_start)` of the last
+    generation, `period` and `cycle_start` being `None` if no cycle was found.
+
+    Args:
+        board - board object to advance
+        generations - number of generations to advance
+
+    Keyword Args:
+        max_cycle_bytes - estimated size of the fingerprints remembered to
+            detect cycles, see `cycles.CycleTracker`
+    """
+    cycle_detector = CycleDetector(board, max_bytes=max_cycle_bytes)
+    cycle_detector.advance(generations)
+    return (
+        cycle_detector.get_board(),
+        cycle_detector.period,
+        cycle_detector.cycle_start
+    )
+
+
+def simulate_stacked_boards(
+    boards,
+    generations,
+    max_cycle_bytes=DEFAULT_MAX_BYTES
+):
+    """Same as calling `simulate_board()` on every board in `boards`, which
+    have to share the same rule, but steps all of them at once in a stack.
+    Returns a list of `(board, period, cycle_start)` triples. Requires NumPy.
+
+    The generations of every board are fingerprinted at once, by a single
+    product of the stack with random weights. Once every board has entered a
+    cycle, each of them is only stepped to the generation of its cycle that
+    matches the last generation.
+    """
+    rule = boards[0].rule
+    y_size = max(board.y_size for board in boards)
+    x_size = max(board.x_size for board in boards)
+    cells = numpy.zeros((len(boards), y_size, x_size), dtype=numpy.uint8)
+    masks = numpy.zeros_like(cells)
+    for index, board in enumerate(boards):
+        cells[index, :board.y_size, :board.x_size] = board.to_array()
+        masks[index, :board.y_size, :board.x_size] = 1
+
+    # Every generation is fingerprinted with a random linear hash, which is
+    # the same for two different generations with a probability of 2^-64.
+    weights = numpy.random.RandomState(0).randint(
+        0,
+        1 << 64,
+        size=y_size * x_size,
+        dtype=numpy.uint64
+    )
+    cycle_trackers = [CycleTracker(max_cycle_bytes) for _ in boards]
+
+    generation = 0
+    while True:
+        fingerprints = cells.reshape(len(boards), -1).dot(weights)
+        for board_cells, cycle_tracker, fingerprint in zip(
+            cells,
+            cycle_trackers,
+            fingerprints.tolist()
+        ):
+            cycle_tracker.remember(
+                generation,
+                fingerprint,
+                board_cells.tobytes
+            )
+
+        has_found_all_cycles = all(
+            cycle_tracker.has_found_cycle()
+            for cycle_tracker in cycle_trackers
+        )
+        if generation == generations or has_found_all_cycles:
+            break
+        cells = next_generation(cells, rule=rule)
+        cells &= masks
+        generation += 1
+
+    final_cells = cells.copy()
+    if generation < generations:
+        remaining_generations = [
+            (generations - generation) % cycle_tracker.period
+            for cycle_tracker in cycle_trackers
+        ]
+        for step in xrange(1, max(remaining_generations) + 1):
+            cells = next_generation(cells, rule=rule)
+            cells &= masks
+            for index, remaining in enumerate(remaining_generations):
+                if remaining == step:
+                    final_cells[index] = cells[index]
+
+    results = []
+    for board, board_cells, cycle_tracker in zip(
+        boards,
+        final_cells,
+        cycle_trackers
+    ):
+        ys, xs = numpy.nonzero(board_cells)
+        results.append((
+            Board(
+                board.x_size,
+                board.y_size,
+                live_cells=zip(xs.tolist(), ys.tolist()),
+                rule=rule
+            ),
+            cycle_tracker.period,
+            cycle_tracker.cycle_start
+        ))
+    return results
+
+
+def run_batch(
+    filenames,
+    generations,
+    output_file,
+    output_format=JSON_LINES,
+    workers=None,
+    stack_size=None,
+    board_factory=None,
+    max_cycle_bytes=DEFAULT_MAX_BYTES
+):
+    """Advances every board `generations` generations and writes a record
+    with the fields in `RESULT_FIELDS` for each of them, in the order of
+    `filenames`. Boards that fail to load get a record with only their
+    `filename`, `generation` and `error`.
+
+    Args:
+        filenames - filenames of the boards, see `find_board_filenames()`
+        generations - number of generations to advance every board
+        output_file - file object the records are written to
+
+    Keyword Args:
+        output_format - `JSON_LINES` or `CSV`
+        workers - number of worker processes. Defaults to the number of
+            CPUs. With 1 the boards are run in this process.
+        stack_size - if given, boards of at most `STACKED_BOARD_MAX_AREA`
+            cells are stepped `stack_size` at a time in a stack, see the top
+            of this module. Requires NumPy.
+        board_factory - callable taking `(x_size, y_size, live_cells=...)`
+            that creates the boards that aren't stacked. Defaults to the
+            default of every loader.
+        max_cycle_bytes - estimated size of the fingerprints remembered to
+            detect cycles, see `cycles.CycleTracker`
+
+    Raises:
+        `ValueError` if `output_format` isn't supported
+    """
+    write_result = _create_result_writer(output_file, output_format)
+
+    task_size = stack_size or 1
+    tasks = [
+        (
+            filenames[start:start + task_size],
+            generations,
+            stack_size,
+            board_factory,
+            max_cycle_bytes
+        )
+        for start in xrange(0, len(filenames), task_size)
+    ]
+
+    pool = None
+    if workers == 1:
+        task_results = itertools.imap(_run_task, tasks)
+    else:
+        pool = multiprocessing.Pool(workers)
+        task_results = pool.imap(_run_task, tasks)
+
+    try:
+        for results in task_results:
+            for result in results:
+                write_result(result)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+def _create_result_writer(output_file, output_format):
+    if output_format == JSON_LINES:
+        return lambda result: output_file.write(json.dumps(result) + '\n')
+    elif output_format == CSV:
+        writer = csv.DictWriter(output_file, RESULT_FIELDS)
+        writer.writeheader()
+        return writer.writerow
+    raise ValueError('Unsupported output format %r' % output_format)
+
+
+def _run_task(
+    (filenames, generations, stack_size, board_factory, max_cycle_bytes)
+):
+    """Runs the boards of a task, returning their records in order."""
+    results = [None] * len(filenames)
+    # Boards are only stacked with boards stepped with the same rule.
+    boards_to_stack_by_rule = collections.defaultdict(list)
+    for index, filename in enumerate(filenames):
+        try:
+            board = create_file_loader(
+                filename,
+                board_factory=board_factory
+            ).load()
+        except (errors.InvalidBoardError, EnvironmentError) as error:
+            results[index] = _create_result(
+                filename,
+                generations,
+                error=str(error) or type(error).__name__
+            )
+            continue
+
+        can_stack = stack_size and numpy is not None and \
+            board.x_size * board.y_size <= STACKED_BOARD_MAX_AREA
+        if can_stack:
+            boards_to_stack_by_rule[board.rule].append((index, board))
+            continue
+
+        results[index] = _create_result(
+            filename,
+            generations,
+            *simulate_board(board, generations, max_cycle_bytes)
+        )
+
+    for boards_to_stack in boards_to_stack_by_rule.itervalues():
+        indexes, boards = zip(*boards_to_stack)
+        for index, simulation_result in zip(
+            indexes,
+            simulate_stacked_boards(boards, generations, max_cycle_bytes)
+        ):
+            results[index] = _create_result(
+                filenames[index],
+                generations,
+                *simulation_result
+            )
+
+    return results
+
+
+def _create_result(
+    filename,
+    generation,
+    board=None,
+    period=None,
+    cycle_start=None,
+    error=None
+):
+    result = collections.OrderedDict.fromkeys(RESULT_FIELDS)
+    result['filename'] = filename
+    result['generation'] = generation
+    result['error'] = error
+    if board is not None:
+        result['x_size'] = board.x_size
+        result['y_size'] = board.y_size
+        result['population'] = board.get_population()
+        result['period'] = period
+        result['cycle_start'] = cycle_start
+        result['rle'] = dump_rle(board)
+    return result
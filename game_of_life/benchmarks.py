@@ -0,0 +1,403 @@
+"""Times the engines, the loaders and the drawer on canonical workloads.
+
+A benchmark case is a `Case` naming what is timed (`STEP`, `LOAD` or `DRAW`),
+the workload it is timed on and the engine, or file format for `LOAD`. The
+workloads are square boards named after their kind and size:
+
+    soup-1k - 1024 x 1024 board of random cells, each alive with probability
+        `SOUP_DENSITY`
+    gun-4k - 4096 x 4096 board tiled with copies of
+        `boards/gosper_glider_gun.txt`, `GUN_SPACING` cells apart
+
+Every case runs in a fresh child process so that its peak resident set size
+isn't inflated by the cases before it, and repeats its operation until it has
+run for at least `min_time` seconds. Besides rates, each result holds the net
+number of objects tracked by the garbage collector that the timed operations
+allocated without freeing, which catches per-cell Python objects sneaking into
+code that should only allocate arrays.
+
+Results are saved as JSON, and `compare_results()` reports the cases that got
+slower or bigger than a saved baseline by more than a tolerance.
+"""
+import collections
+import gc
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import resource
+import shutil
+import tempfile
+import time
+
+from game_of_life.binary_format import write_board
+from game_of_life.board_factory import ENGINE_NAME_TO_BOARD_CLS
+from game_of_life.dense_board import DenseBoard
+from game_of_life.dense_board import numpy
+from game_of_life.drawer import Drawer
+from game_of_life.file_formats import create_file_loader
+from game_of_life.pattern_formats import dump_rle
+
+STEP = 'step'
+LOAD = 'load'
+DRAW = 'draw'
+
+# File formats of the `LOAD` benchmark, used in place of the engine name.
+TEXT = 'text'
+RLE = 'rle'
+BINARY = 'binary'
+
+SOUP = 'soup'
+GUN = 'gun'
+
+SOUP_DENSITY = 0.5
+SOUP_SEED = 0
+GUN_FILENAME = os.path.join(
+    os.path.dirname(__file__),
+    '..',
+    'boards',
+    'gosper_glider_gun.txt'
+)
+GUN_SPACING = 64
+
+DEFAULT_MIN_TIME = 1.0
+DEFAULT_TOLERANCE = 0.2
+
+# Unit of the operations every benchmark repeats.
+BENCHMARK_TO_UNIT = {
+    STEP: 'generations',
+    LOAD: 'loads',
+    DRAW: 'draws',
+}
+
+Case = collections.namedtuple('Case', ['benchmark', 'workload', 'engine'])
+
+DEFAULT_CASES = [
+    Case(STEP, 'soup-1k', 'sparse'),
+    Case(STEP, 'soup-1k', 'incremental'),
+    Case(STEP, 'soup-1k', 'dense'),
+    Case(STEP, 'soup-1k', 'packed'),
+    Case(STEP, 'soup-4k', 'dense'),
+    Case(STEP, 'soup-4k', 'packed'),
+    # A dense 16k board takes gigabytes to step, so only the packed engine
+    # runs it.
+    Case(STEP, 'soup-16k', 'packed'),
+    Case(STEP, 'gun-1k', 'sparse'),
+    Case(STEP, 'gun-1k', 'incremental'),
+    Case(STEP, 'gun-1k', 'dense'),
+    Case(STEP, 'gun-1k', 'packed'),
+    Case(STEP, 'gun-1k', 'hashlife'),
+    Case(STEP, 'gun-4k', 'dense'),
+    Case(STEP, 'gun-4k', 'packed'),
+    Case(STEP, 'gun-4k', 'hashlife'),
+    Case(LOAD, 'soup-1k', TEXT),
+    Case(LOAD, 'gun-1k', RLE),
+    Case(LOAD, 'soup-4k', BINARY),
+    Case(DRAW, 'soup-1k', 'sparse'),
+    Case(DRAW, 'soup-1k', 'dense'),
+    Case(DRAW, 'soup-1k', 'packed'),
+    Case(DRAW, 'soup-4k', 'dense'),
+]
+
+
+def get_case_name(case):
+    """Returns the name results are saved and compared under, such as
+    'step/soup-1k/dense'.
+    """
+    return '/'.join(case)
+
+
+def parse_case_name(name):
+    """Returns the `Case` named `name`, see `get_case_name()`.
+
+    Raises:
+        `ValueError` if `name` doesn't name a valid case
+    """
+    parts = name.split('/')
+    if len(parts) != 3:
+        raise ValueError('Invalid benchmark case %r' % name)
+
+    case = Case(*parts)
+    parse_workload(case.workload)
+    if case.benchmark == LOAD:
+        engines = (TEXT, RLE, BINARY)
+    elif case.benchmark in (STEP, DRAW):
+        engines = ENGINE_NAME_TO_BOARD_CLS.keys()
+    else:
+        raise ValueError('Invalid benchmark %r' % case.benchmark)
+    if case.engine not in engines:
+        raise ValueError(
+            'Invalid engine %r for %r' % (case.engine, case.benchmark)
+        )
+    return case
+
+
+def parse_workload(workload):
+    """Returns the `(kind, size)` of a workload name such as 'soup-1k' or
+    'gun-300'.
+
+    Raises:
+        `ValueError` if `workload` isn't a valid workload name
+    """
+    match = re.match(r'^(%s|%s)-(\d+)(k?)$' % (SOUP, GUN), workload)
+    if not match:
+        raise ValueError('Invalid workload %r' % workload)
+
+    kind, size, kilo = match.groups()
+    return kind, int(size) * (1024 if kilo else 1)
+
+
+def create_workload(workload):
+    """Returns the cells of a workload as a square `uint8` array of 0's and
+    1's.
+    """
+    kind, size = parse_workload(workload)
+    if kind == SOUP:
+        return create_soup(size)
+    return create_gun_grid(size)
+
+
+def create_soup(size, density=SOUP_DENSITY, seed=SOUP_SEED):
+    """Returns a (size, size) `uint8` array of cells that are alive with
+    probability `density`.
+    """
+    random_bytes = numpy.random.RandomState(seed).randint(
+        0,
+        256,
+        size=(size, size),
+        dtype=numpy.uint8
+    )
+    return (random_bytes < int(density * 256)).view(numpy.uint8)
+
+
+def create_gun_grid(size, spacing=GUN_SPACING):
+    """Returns a (size, size) `uint8` array tiled with Gosper glider guns
+    whose top left corners are `spacing` cells apart.
+    """
+    gun = create_file_loader(GUN_FILENAME).load().to_array()
+    gun_y_size, gun_x_size = gun.shape
+    cells = numpy.zeros((size, size), dtype=numpy.uint8)
+    for y in xrange(0, size - gun_y_size + 1, spacing):
+        for x in xrange(0, size - gun_x_size + 1, spacing):
+            cells[y:y + gun_y_size, x:x + gun_x_size] = gun
+    return cells
+
+
+def create_board(engine, cells):
+    """Creates a board of the engine named `engine` holding `cells`, a
+    (y_size, x_size) array of 0's and 1's.
+    """
+    board_cls = ENGINE_NAME_TO_BOARD_CLS[engine]
+    if hasattr(board_cls, 'from_array'):
+        return board_cls.from_array(cells)
+
+    ys, xs = numpy.nonzero(cells)
+    return board_cls(
+        cells.shape[1],
+        cells.shape[0],
+        live_cells=itertools.izip(xs.tolist(), ys.tolist())
+    )
+
+
+def write_board_file(file_format, cells, output_file):
+    """Writes `cells` to `output_file` in `file_format`, one of `TEXT`, `RLE`
+    and `BINARY`.
+    """
+    board = DenseBoard.from_array(cells)
+    if file_format == TEXT:
+        output_file.write(Drawer().draw(board))
+    elif file_format == RLE:
+        output_file.write(dump_rle(board))
+    else:
+        write_board(board, output_file)
+
+
+def run_case(case, min_time=DEFAULT_MIN_TIME):
+    """Runs a benchmark case in this process and returns its result, an
+    `OrderedDict` with the fields:
+
+        name - see `get_case_name()`
+        benchmark, workload, engine - the fields of `case`
+        cells - number of cells of the workload
+        operations - number of times the operation ran
+        unit - what an operation is, see `BENCHMARK_TO_UNIT`
+        seconds - time the operations took
+        operations_per_second, cells_per_second - rates of the operations
+        net_gc_objects - objects tracked by the garbage collector that the
+            operations allocated and didn't free
+        peak_rss_kb - peak resident set size of this process in kilobytes
+
+    Args:
+        case - `Case` to run
+
+    Keyword Args:
+        min_time - number of seconds to repeat the operation for. It always
+            runs at least once.
+    """
+    cells = create_workload(case.workload)
+    temporary_directory = None
+    if case.benchmark == STEP:
+        board = create_board(case.engine, cells)
+        operation = board.step
+    elif case.benchmark == LOAD:
+        temporary_directory = tempfile.mkdtemp()
+        filename = os.path.join(temporary_directory, 'board')
+        with open(filename, 'wb') as output_file:
+            write_board_file(case.engine, cells, output_file)
+        operation = lambda: create_file_loader(filename).load()
+    else:
+        board = create_board(case.engine, cells)
+        drawer = Drawer()
+        operation = lambda: drawer.draw(board)
+    area = cells.size
+    del cells
+
+    try:
+        operations, seconds, net_gc_objects = _time_operation(
+            operation,
+            min_time
+        )
+    finally:
+        if temporary_directory is not None:
+            shutil.rmtree(temporary_directory)
+
+    result = collections.OrderedDict()
+    result['name'] = get_case_name(case)
+    result.update(case._asdict())
+    result['cells'] = area
+    result['operations'] = operations
+    result['unit'] = BENCHMARK_TO_UNIT[case.benchmark]
+    result['seconds'] = seconds
+    result['operations_per_second'] = operations / seconds
+    result['cells_per_second'] = operations * area / seconds
+    result['net_gc_objects'] = net_gc_objects
+    result['peak_rss_kb'] = \
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def _time_operation(operation, min_time):
+    """Calls `operation` until `min_time` seconds have passed, returning the
+    `(operations, seconds, net_gc_objects)` of the calls.
+    """
+    # The garbage collector is disabled so that its count of generation 0
+    # objects goes up with every allocation and down with every free.
+    gc.collect()
+    gc.disable()
+    try:
+        start_gc_count = gc.get_count()[0]
+        start_time = time.time()
+        operations = 0
+        while True:
+            operation()
+            operations += 1
+            seconds = time.time() - start_time
+            if seconds >= min_time:
+                break
+        net_gc_objects = gc.get_count()[0] - start_gc_count
+    finally:
+        gc.enable()
+    return operations, max(seconds, 1e-9), net_gc_objects
+
+
+def run_cases(cases, min_time=DEFAULT_MIN_TIME, isolate=True, report=None):
+    """Runs benchmark cases and returns the list of their results, see
+    `run_case()`.
+
+    Args:
+        cases - iterable of `Case`s
+
+    Keyword Args:
+        min_time - see `run_case()`
+        isolate - if `True`, every case runs in a fresh child process.
+            Otherwise peak RSS is the peak of this process so far.
+        report - callable that is passed every result as soon as it's ready
+    """
+    results = []
+    for case in cases:
+        if isolate:
+            pool = multiprocessing.Pool(1)
+            try:
+                result = pool.apply(run_case, (case, min_time))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            result = run_case(case, min_time)
+
+        results.append(result)
+        if report is not None:
+            report(result)
+    return results
+
+
+def format_result(result):
+    """Returns a one line summary of a result."""
+    return '%-28s %12.2f %-13s %12.4g cells/s %8d MB %10d objects' % (
+        result['name'],
+        result['operations_per_second'],
+        result['unit'] + '/s',
+        result['cells_per_second'],
+        result['peak_rss_kb'] // 1024,
+        result['net_gc_objects']
+    )
+
+
+def save_results(results, output_file):
+    """Writes a list of results to `output_file` as JSON."""
+    json.dump(results, output_file, indent=2)
+    output_file.write('\n')
+
+
+def load_results(input_file):
+    """Reads a list of results written by `save_results()`."""
+    return json.load(input_file)
+
+
+def compare_results(results, baseline_results, tolerance=DEFAULT_TOLERANCE):
+    """Returns a list of messages describing the regressions of `results`
+    against `baseline_results`: cases whose cells per second dropped, or
+    whose peak RSS grew, by more than `tolerance`. Cases missing from the
+    baseline are skipped.
+
+    Args:
+        results - list of results, see `run_case()`
+        baseline_results - list of results to compare against
+
+    Keyword Args:
+        tolerance - fraction of the baseline a result may be worse by
+    """
+    baseline_by_name = dict(
+        (result['name'], result) for result in baseline_results
+    )
+    regressions = []
+    for result in results:
+        baseline = baseline_by_name.get(result['name'])
+        if baseline is None:
+            continue
+
+        speed = result['cells_per_second']
+        baseline_speed = baseline['cells_per_second']
+        if speed < baseline_speed * (1 - tolerance):
+            regressions.append(
+                '%s: %.4g cells/s is %.0f%% slower than the baseline %.4g' % (
+                    result['name'],
+                    speed,
+                    100 * (1 - speed / baseline_speed),
+                    baseline_speed
+                )
+            )
+
+        peak_rss_kb = result['peak_rss_kb']
+        baseline_peak_rss_kb = baseline['peak_rss_kb']
+        if peak_rss_kb > baseline_peak_rss_kb * (1 + tolerance):
+            regressions.append(
+                '%s: peak RSS of %d KB is %.0f%% over the baseline %d KB' % (
+                    result['name'],
+                    peak_rss_kb,
+                    100 * (float(peak_rss_kb) / baseline_peak_rss_kb - 1),
+                    baseline_peak_rss_kb
+                )
+            )
+    return regressions
@@ -0,0 +1,298 @@
+"""Compact binary board format.
+
+A file starts with a fixed size header, all integers being little-endian:
+
+    magic        4 bytes, "GOLB"
+    version      uint16
+    encoding     uint16, `BITMAP` or `RUN_LENGTH`
+    x_size       uint64
+    y_size       uint64
+    generation   uint64
+    population   uint64
+    rule_length  uint16
+
+followed by `rule_length` bytes holding the rule in B/S notation and zero
+padding up to the next multiple of 8 bytes, where the payload starts.
+
+`BITMAP` payloads are the words of a `PackedBoard`, row after row, so a file
+can be memory mapped and used as the storage of a board without copying it.
+`RUN_LENGTH` payloads are the lengths of alternating runs of dead and live
+cells in row-major order, starting with a run of dead cells, each stored as a
+LEB128 varint. They are much smaller for sparse boards.
+"""
+import collections
+import mmap
+import struct
+
+from game_of_life import errors
+from game_of_life.board_factory import choose_board_cls
+from game_of_life.packed_board import PackedBoard
+from game_of_life.packed_board import WORD_DTYPE
+from game_of_life.packed_board import WORD_SIZE
+from game_of_life.packed_board import get_word_count
+from game_of_life.dense_board import numpy
+from game_of_life.rules import CONWAY
+from game_of_life.rules import parse_rule
+
+MAGIC = 'GOLB'
+VERSION = 1
+BITMAP = 0
+RUN_LENGTH = 1
+CONWAY_RULE = str(CONWAY)
+
+_HEADER_STRUCT = struct.Struct('<4sHHQQQQH')
+_ALIGNMENT = 8
+
+Header = collections.namedtuple(
+    'Header',
+    ['encoding', 'x_size', 'y_size', 'generation', 'population', 'rule',
+     'payload_offset']
+)
+
+
+def is_binary_board_file(input_filename):
+    """Returns `True` if the file starts with the binary format's magic."""
+    with open(input_filename, 'rb') as input_file:
+        return input_file.read(len(MAGIC)) == MAGIC
+
+
+def write_board(
+    board,
+    output_file,
+    generation=0,
+    rule=None,
+    encoding=None
+):
+    """Writes a snapshot of any board object to `output_file`.
+
+    Args:
+        board - board object to write
+        output_file - file object opened in binary mode
+
+    Keyword Args:
+        generation - generation number stored in the header
+        rule - rule stored in the header, in B/S notation. Defaults to the
+            rule of `board`.
+        encoding - `BITMAP` or `RUN_LENGTH`. Defaults to whichever is likely
+            to be smaller, and to `RUN_LENGTH` without NumPy.
+
+    Raises:
+        `ValueError` if `encoding` is `BITMAP` and NumPy isn't installed
+    """
+    population = board.get_population()
+    if rule is None:
+        rule = str(board.rule)
+    if encoding is None:
+        # A run length encoded live cell takes around 4 bytes.
+        is_sparse = population * 4 < board.x_size * board.y_size // 8
+        encoding = RUN_LENGTH if is_sparse or numpy is None else BITMAP
+    elif encoding == BITMAP and numpy is None:
+        raise ValueError('Bitmap board files need NumPy')
+
+    if encoding == BITMAP:
+        payload = _get_packed_board(board).get_words().tobytes()
+    else:
+        payload = _encode_runs(board.x_size, board.get_live_cells())
+
+    output_file.write(_HEADER_STRUCT.pack(
+        MAGIC,
+        VERSION,
+        encoding,
+        board.x_size,
+        board.y_size,
+        generation,
+        population,
+        len(rule)
+    ))
+    output_file.write(rule)
+    header_size = _HEADER_STRUCT.size + len(rule)
+    output_file.write('\0' * (-header_size % _ALIGNMENT))
+    output_file.write(payload)
+
+
+def _get_packed_board(board):
+    if isinstance(board, PackedBoard):
+        return board
+    elif hasattr(board, 'to_array'):
+        return PackedBoard.from_array(board.to_array())
+    return PackedBoard.from_board(board)
+
+
+def _encode_runs(x_size, live_cells):
+    payload = bytearray()
+    position = 0
+    run_start = None
+    for index in sorted(y * x_size + x for x, y in live_cells):
+        if run_start is not None and index == position:
+            position += 1
+            continue
+
+        if run_start is not None:
+            _write_varint(payload, position - run_start)
+        _write_varint(payload, index - position)
+        run_start = index
+        position = index + 1
+
+    if run_start is not None:
+        _write_varint(payload, position - run_start)
+    return str(payload)
+
+
+def _write_varint(payload, value):
+    while value >= 0x80:
+        payload.append(value & 0x7f | 0x80)
+        value >>= 7
+    payload.append(value)
+
+
+def _iterate_varints(payload):
+    value = 0
+    shift = 0
+    for byte in bytearray(payload):
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = 0
+            shift = 0
+
+
+def read_header(input_file):
+    """Reads the header at the start of `input_file`, returning a `Header`.
+
+    Raises:
+        `errors.InvalidBoardError` if the file is not a valid board file
+    """
+    header_bytes = input_file.read(_HEADER_STRUCT.size)
+    if len(header_bytes) != _HEADER_STRUCT.size:
+        raise errors.InvalidBoardError
+
+    (
+        magic, version, encoding, x_size, y_size, generation, population,
+        rule_length
+    ) = _HEADER_STRUCT.unpack(header_bytes)
+    if magic != MAGIC or version != VERSION or \
+            encoding not in (BITMAP, RUN_LENGTH):
+        raise errors.InvalidBoardError
+
+    rule = input_file.read(rule_length)
+    header_size = _HEADER_STRUCT.size + rule_length
+    return Header(
+        encoding,
+        x_size,
+        y_size,
+        generation,
+        population,
+        rule,
+        header_size + -header_size % _ALIGNMENT
+    )
+
+
+class BinaryLoader(object):
+    """Loads a board written by `write_board()`.
+
+    `BITMAP` files are memory mapped into a `PackedBoard` without copying, so
+    loading takes the same time whatever the size of the board. After
+    `load()`, `header` holds the `Header` of the file.
+    """
+
+    def __init__(self, input_filename, board_factory=None):
+        """Creates the `BinaryLoader`
+
+        Args:
+            input_filename - filename of the file to load
+
+        Keyword Args:
+            board_factory - callable taking `(x_size, y_size, live_cells=...)`
+                that creates the board, and `rule=...` for files whose header
+                has another rule than Conway's. Defaults to a memory mapped
+                `PackedBoard` for `BITMAP` files and to picking an engine
+                based on the density of the board for `RUN_LENGTH` files.
+        """
+        self._input_filename = input_filename
+        self._board_factory = board_factory
+        self.header = None
+
+    def load(self):
+        """Reads the file and creates a board.
+
+        Raises:
+            `errors.InvalidBoardError` if the file isn't a valid board file,
+                or if it's a `BITMAP` file and NumPy isn't installed
+        """
+        with open(self._input_filename, 'rb') as input_file:
+            self.header = read_header(input_file)
+            rule = parse_rule(self.header.rule)
+            board_kwargs = {}
+            if rule != CONWAY:
+                board_kwargs['rule'] = rule
+
+            if self.header.encoding == BITMAP:
+                if numpy is None:
+                    raise errors.InvalidBoardError(
+                        'Bitmap board files need NumPy'
+                    )
+                board = self._map_bitmap(input_file, rule)
+                if not self._board_factory:
+                    return board
+                board_factory = self._board_factory
+                live_cells = board.get_live_cells()
+            else:
+                board_factory = self._board_factory or choose_board_cls(
+                    self.header.x_size,
+                    self.header.y_size,
+                    self.header.population
+                )
+                input_file.seek(self.header.payload_offset)
+                live_cells = self._iterate_live_cells(input_file.read())
+
+        return board_factory(
+            self.header.x_size,
+            self.header.y_size,
+            live_cells=live_cells,
+            **board_kwargs
+        )
+
+    def _map_bitmap(self, input_file, rule):
+        shape = (self.header.y_size, get_word_count(self.header.x_size))
+        payload_size = shape[0] * shape[1] * WORD_SIZE // 8
+        if not payload_size:
+            return PackedBoard(
+                self.header.x_size,
+                self.header.y_size,
+                rule=rule
+            )
+
+        try:
+            mapped_file = mmap.mmap(
+                input_file.fileno(),
+                0,
+                access=mmap.ACCESS_READ
+            )
+        except ValueError:
+            raise errors.InvalidBoardError
+        if len(mapped_file) < self.header.payload_offset + payload_size:
+            raise errors.InvalidBoardError
+
+        words = numpy.frombuffer(
+            mapped_file,
+            dtype=WORD_DTYPE,
+            count=shape[0] * shape[1],
+            offset=self.header.payload_offset
+        ).reshape(shape)
+        return PackedBoard.from_words(self.header.x_size, words, rule=rule)
+
+    def _iterate_live_cells(self, payload):
+        x_size = self.header.x_size
+        area = x_size * self.header.y_size
+        position = 0
+        is_live_run = False
+        for run_length in _iterate_varints(payload):
+            if is_live_run:
+                if position + run_length > area:
+                    raise errors.InvalidBoardError
+                for index in xrange(position, position + run_length):
+                    yield index % x_size, index // x_size
+            position += run_length
+            is_live_run = not is_live_run
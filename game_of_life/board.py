@@ -1,14 +1,272 @@
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from game_of_life import errors
+from game_of_life.analytics import Statistics
+from game_of_life.generations import iterate_generations
+from game_of_life.generations import prefetch_frames
+from game_of_life.rules import CONWAY
+from game_of_life.rules import parse_rule
+
+# How the edges of a board behave. Cells beyond the edges of a `BOUNDED` board
+# are always dead, the edges of a `TORUS` wrap around to the opposite side and
+# an `INFINITE` board is a plane that patterns can leave the `x_size` by
+# `y_size` window of.
+BOUNDED = 'bounded'
+TORUS = 'torus'
+INFINITE = 'infinite'
+TOPOLOGIES = [BOUNDED, TORUS, INFINITE]
+
+
+def _get_interior_neighbours(x, y):
+    """Returns the 8 cells next to (x, y), for cells that are far enough from
+    the edges of the board not to need bounds checks or wrapping.
+    """
+    x_before = x - 1
+    x_after = x + 1
+    y_before = y - 1
+    y_after = y + 1
+    return (
+        (x_before, y_before), (x_before, y), (x_before, y_after),
+        (x, y_before), (x, y_after),
+        (x_after, y_before), (x_after, y), (x_after, y_after)
+    )
+
+
+class BaseBoard(object):
+    """Behaviour shared by every Game of Life board engine.
+
+    An engine is created with `(x_size, y_size, live_cells=())` and needs to
+    implement `__getitem__()`, `step()` and `get_live_cells()`. Equality is
+    defined in terms of those so that boards backed by different engines
+    compare equal when they describe the same game state.
+
+    Engines that support other topologies than `BOUNDED` take a `topology`
+    keyword argument and list them in `TOPOLOGIES`. Every engine takes a
+    `rule` keyword argument, a `rules.Rule` or a string accepted by
+    `rules.parse_rule()`, and keeps the parsed `Rule` in `rule`.
+
+    Engines that know the cells born and died as a by-product of a step
+    implement `track_statistics()` and keep `statistics` up to date.
+
+    Engines that hold resources such as worker processes release them in
+    `close()`. Boards are context managers that close themselves on exit.
+    """
+
+    TOPOLOGIES = [BOUNDED]
+    topology = BOUNDED
+    rule = CONWAY
+    statistics = None
+
+    def __eq__(self, board):
+        """Returns `True` if the boards are the same, where equality is defined
+        by having the same dimensions and live cells.
+
+        Args:
+            board - the board object to compare `self` to
+        """
+        return self.x_size == board.x_size and \
+            self.y_size == board.y_size and \
+            self.get_live_cells() == board.get_live_cells()
+
+    def __ne__(self, board):
+        return not self == board
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Releases the resources held by the board. Does nothing for engines
+        that hold none.
+        """
+
+    def get_live_cells(self):
+        """Returns a `frozenset` of the (x, y) integer pairs that are alive."""
+        raise NotImplementedError
+
+    def get_population(self):
+        """Returns the number of live cells on the board."""
+        return len(self.get_live_cells())
+
+    def get_fingerprint(self):
+        """Returns a hash of the live cells, equal for boards of the same
+        engine and size in the same state and most likely different
+        otherwise.
+        """
+        return hash(self.get_live_cells())
+
+    def snapshot(self):
+        """Returns a board holding the current state of `self` that later
+        steps of `self` don't change, so it can be read from another thread.
+        """
+        return Board(
+            self.x_size,
+            self.y_size,
+            self.get_live_cells(),
+            topology=self.topology,
+            rule=self.rule
+        )
+
+    def to_array(self):
+        """Returns the board as a (y_size, x_size) NumPy `uint8` array of 0's
+        and 1's. Requires NumPy.
+        """
+        return self.get_region_array(0, 0, self.x_size, self.y_size)
+
+    def get_region_array(self, x_start, y_start, x_stop, y_stop):
+        """Returns the cells with `x_start <= x < x_stop` and
+        `y_start <= y < y_stop` as a (y_stop - y_start, x_stop - x_start)
+        NumPy `uint8` array of 0's and 1's. The region has to lie within the
+        board. Requires NumPy.
+        """
+        cells = numpy.zeros(
+            (y_stop - y_start, x_stop - x_start),
+            dtype=numpy.uint8
+        )
+        xs, ys = self._get_region_coordinates(x_start, y_start, x_stop, y_stop)
+        cells[ys, xs] = 1
+        return cells
+
+    def get_block_populations(
+        self,
+        x_start,
+        y_start,
+        x_stop,
+        y_stop,
+        block_size
+    ):
+        """Returns a NumPy array with the number of live cells in every
+        `block_size` x `block_size` block of the region described in
+        `get_region_array()`, the first block starting at
+        (`x_start`, `y_start`). Blocks on the right and bottom edges are cut
+        short by the region. Requires NumPy.
+        """
+        shape = (
+            -(-(y_stop - y_start) // block_size),
+            -(-(x_stop - x_start) // block_size)
+        )
+        xs, ys = self._get_region_coordinates(x_start, y_start, x_stop, y_stop)
+        block_indexes = ys // block_size * shape[1] + xs // block_size
+        return numpy.bincount(
+            block_indexes,
+            minlength=shape[0] * shape[1]
+        )[:shape[0] * shape[1]].reshape(shape)
+
+    def _get_region_coordinates(self, x_start, y_start, x_stop, y_stop):
+        """Returns (xs, ys) integer arrays with the coordinates of the live
+        cells in the region, relative to its top left corner.
+        """
+        live_cells = self._get_live_cells_in_region(
+            x_start,
+            y_start,
+            x_stop,
+            y_stop
+        )
+        coordinates = numpy.fromiter(
+            itertools.chain.from_iterable(live_cells),
+            dtype=numpy.intp,
+            count=2 * len(live_cells)
+        )
+        return coordinates[::2] - x_start, coordinates[1::2] - y_start
 
+    def _get_live_cells_in_region(self, x_start, y_start, x_stop, y_stop):
+        live_cells = self.get_live_cells()
+        if self._is_whole_board(x_start, y_start, x_stop, y_stop):
+            return live_cells
+        return [
+            (x, y) for (x, y) in live_cells
+            if x_start <= x < x_stop and y_start <= y < y_stop
+        ]
 
-class Board(object):
+    def _is_whole_board(self, x_start, y_start, x_stop, y_stop):
+        """Returns `True` if no live cell can lie outside of the region."""
+        return self.topology != INFINITE and \
+            x_start <= 0 and y_start <= 0 and \
+            x_stop >= self.x_size and y_stop >= self.y_size
+
+    def get_step_diff(self):
+        """Returns a `(born_cells, died_cells)` pair of `frozenset`s holding
+        the cells that came alive and the cells that died in the last
+        `step()`. Both are empty before the board is first stepped.
+        """
+        raise NotImplementedError
+
+    def track_statistics(self):
+        """Starts keeping `statistics`, an `analytics.Statistics` object, up
+        to date with every step and returns it.
+
+        Raises:
+            `NotImplementedError` if the engine can't keep statistics without
+                an extra pass over the board
+        """
+        raise NotImplementedError
+
+    def generations(
+        self,
+        start=0,
+        stop=None,
+        stride=1,
+        track_step_diffs=False,
+        prefetch=0,
+        hooks=None
+    ):
+        """Returns an iterator over a `generations.Frame` for generations
+        `start`, `start + stride` and so on up to but not including `stop`,
+        counting from the current generation of the board as 0. The board is
+        stepped lazily as frames are taken, see `game_of_life.generations`,
+        and should not be used by anything else in the meantime.
+
+        Keyword Args:
+            start - generation of the first frame. The generations before it
+                are stepped through without snapshots.
+            stop - generation the frames stop before, or `None` to never stop
+            stride - number of generations between two frames
+            track_step_diffs - if `True`, the frames hold the cells born and
+                died since the previous frame
+            prefetch - number of frames stepped ahead on a worker thread. If
+                0, the board is stepped on the thread that takes the frames.
+            hooks - `instrumentation.Hooks` object told about every step
+
+        Raises:
+            `ValueError` if `stride` is less than 1 or `start` is negative
+        """
+        frames = iterate_generations(
+            self,
+            start=start,
+            stop=stop,
+            stride=stride,
+            track_step_diffs=track_step_diffs,
+            hooks=hooks
+        )
+        if prefetch:
+            return prefetch_frames(frames, prefetch, hooks=hooks)
+        return frames
+
+
+class Board(BaseBoard):
     """Represents a Game of Life board.
     A board is described by it's dimensions, `x_size`, and `y_size`, and the
     live cells (`live_cells`) it contains. It knows how to progress itself to
     its next iteration through the `step()` function.
     """
 
-    def __init__(self, x_size, y_size, live_cells=()):
+    TOPOLOGIES = TOPOLOGIES
+
+    def __init__(
+        self,
+        x_size,
+        y_size,
+        live_cells=(),
+        topology=BOUNDED,
+        rule=CONWAY
+    ):
         """Creates a new `Board` object.
 
         Args:
@@ -18,13 +276,34 @@ class Board(object):
         Keyword Args:
             live_cells - iterable of (x, y) integer pairs representing live
                 cells on the `Board` object.
+            topology - one of `TOPOLOGIES`. Live cells of an `INFINITE` board
+                may lie outside of the `x_size` by `y_size` window.
+            rule - `rules.Rule` or string describing the rule the board is
+                stepped with, see `rules.parse_rule()`
+
+        Raises:
+            `ValueError` if `topology` isn't one of `TOPOLOGIES`
+            `errors.InvalidRuleError` if `rule` isn't a valid rule
         """
+        if topology not in self.TOPOLOGIES:
+            raise ValueError('Unsupported topology %r' % (topology,))
         self.x_size = x_size
         self.y_size = y_size
+        self.topology = topology
+        self.rule = parse_rule(rule)
+        self._transitions = self.rule.table
         self._live_cells = set(live_cells)
         self._ensure_live_cells_is_in_bounds()
+        self._step_diff = (frozenset(), frozenset())
+        # Neighbours of the cells on the edges of the board, which are the
+        # only ones that need bounds checks or wrapping, by cell.
+        self._edge_neighbours = {}
+        # Number of cells considered by the last `step()`.
+        self.candidate_count = 0
 
     def _ensure_live_cells_is_in_bounds(self):
+        if self.topology == INFINITE:
+            return
         for cell in self._live_cells:
             if not self._is_cell_in_bounds(cell):
                 raise errors.InvalidBoardError
@@ -46,19 +325,63 @@ class Board(object):
         """
         return cell in self._live_cells
 
-    def __eq__(self, board):
-        """Returns `True` if the boards are the same, where equality is defined
-        by having the same dimensions and live cells.
+    def get_live_cells(self):
+        """Returns a `frozenset` of the (x, y) integer pairs that are alive."""
+        return frozenset(self._live_cells)
 
-        Args:
-            board - the `Board` object to compare `self` to
+    def get_population(self):
+        """Returns the number of live cells on the board."""
+        return len(self._live_cells)
+
+    def snapshot(self):
+        """See `BaseBoard.snapshot()`."""
+        board = Board(
+            self.x_size,
+            self.y_size,
+            topology=self.topology,
+            rule=self.rule
+        )
+        board._live_cells = set(self._live_cells)
+        return board
+
+    def get_step_diff(self):
+        """Returns a `(born_cells, died_cells)` pair of `frozenset`s holding
+        the cells that came alive and the cells that died in the last
+        `step()`. Both are empty before the board is first stepped.
         """
-        return self.x_size == board.x_size and \
-            self.y_size == board.y_size and \
-            self._live_cells == board._live_cells
+        return self._step_diff
+
+    def _get_live_cells_in_region(self, x_start, y_start, x_stop, y_stop):
+        """Same as `BaseBoard._get_live_cells_in_region()`, but goes over the
+        cells of the region instead of the live cells when there are fewer of
+        them, such as when a small window of a crowded board is drawn.
+        """
+        live_cells = self._live_cells
+        if self._is_whole_board(x_start, y_start, x_stop, y_stop):
+            return live_cells
+
+        region_size = max(x_stop - x_start, 0) * max(y_stop - y_start, 0)
+        if region_size < len(live_cells):
+            return [
+                (x, y)
+                for y in xrange(y_start, y_stop)
+                for x in xrange(x_start, x_stop)
+                if (x, y) in live_cells
+            ]
+        return [
+            (x, y) for (x, y) in live_cells
+            if x_start <= x < x_stop and y_start <= y < y_stop
+        ]
+
+    def track_statistics(self):
+        """See `BaseBoard.track_statistics()`."""
+        if self.statistics is None:
+            self.statistics = Statistics(self._live_cells)
+        return self.statistics
 
     def step(self):
-        """Steps the game board according to the following rules (borrowed from
+        """Steps the game board according to `rule`. With the default rule,
+        Conway's B3/S23, these are the following rules (borrowed from
         Wikipedia):
 
         1. Any live cell with fewer than two live neighbours dies, as if caused
@@ -71,35 +394,111 @@ class Board(object):
             cell, as if by reproduction.
 
         Updates `self._live_cells` to represent the new set of live cells after
-        the current iteration.
-        """
-        self._live_cells = set([
-            cell for cell in self._get_cells_with_potential_updates()
-            if self._should_cell_be_alive_in_next_step(cell)
-        ])
-
-    def _get_cells_with_potential_updates(self):
-        cells_with_potential_updates = set([])
-        for live_cell in self._live_cells:
-            cells_in_proximity = self._get_cells_in_proximity(
-                live_cell
-            )
-            cells_with_potential_updates.update(cells_in_proximity)
-        return cells_with_potential_updates
-
-    def _should_cell_be_alive_in_next_step(self, cell):
-        cells_in_proximity = self._get_cells_in_proximity(cell)
-        live_cells_in_proximity = self._live_cells & cells_in_proximity
-
-        len_of_live_cells_in_proximity = len(live_cells_in_proximity)
-        if len_of_live_cells_in_proximity == 3:
-            return True
-        elif len_of_live_cells_in_proximity == 4:
-            return cell in self._live_cells
+        the current iteration, `candidate_count` to the number of cells that
+        were considered, the step diff and `statistics`, if they are tracked.
+
+        The live neighbours of every cell are counted in a single pass over
+        the live cells, so only the cells next to live cells and the live
+        cells themselves are ever considered. The cells born and died are
+        found while the candidates are filtered rather than in another pass
+        over the board.
+        """
+        neighbour_counts = self._count_neighbours()
+        # Live cells without live neighbours aren't counted, but are
+        # considered all the same.
+        isolated_cells = self._live_cells.difference(neighbour_counts)
+        self.candidate_count = len(neighbour_counts) + len(isolated_cells)
+
+        next_live_cells, born_cells, died_cells = self._get_next_live_cells(
+            neighbour_counts,
+            isolated_cells
+        )
+        self._live_cells = next_live_cells
+        self._step_diff = (frozenset(born_cells), frozenset(died_cells))
+        if self.statistics is not None:
+            self.statistics.update(born_cells, died_cells)
+
+    def _get_next_live_cells(self, neighbour_counts, isolated_cells):
+        """Returns the next set of live cells, and lists of the cells born
+        and died.
+        """
+        live_cells = self._live_cells
+        transitions = self._transitions
+        next_live_cells = set()
+        born_cells = []
+        died_cells = []
+        for cell, live_neighbours in neighbour_counts.iteritems():
+            is_alive = cell in live_cells
+            if transitions[is_alive * 9 + live_neighbours]:
+                next_live_cells.add(cell)
+                if not is_alive:
+                    born_cells.append(cell)
+            elif is_alive:
+                died_cells.append(cell)
+        if transitions[9]:
+            next_live_cells |= isolated_cells
         else:
-            return False
+            died_cells.extend(isolated_cells)
+        return next_live_cells, born_cells, died_cells
+
+    def _count_neighbours(self):
+        """Returns a dict of every cell next to a live cell to its number of
+        live neighbours.
+        """
+        neighbour_counts = {}
+        get_count = neighbour_counts.get
+        get_edge_neighbours = self._get_edge_neighbours
+        is_infinite = self.topology == INFINITE
+        x_last = self.x_size - 1
+        y_last = self.y_size - 1
+        for cell in self._live_cells:
+            x, y = cell
+            if is_infinite or 0 < x < x_last and 0 < y < y_last:
+                # Same as `_get_interior_neighbours()`, without the cost of a
+                # call for every live cell.
+                x_before = x - 1
+                x_after = x + 1
+                y_before = y - 1
+                y_after = y + 1
+                neighbours = (
+                    (x_before, y_before), (x_before, y), (x_before, y_after),
+                    (x, y_before), (x, y_after),
+                    (x_after, y_before), (x_after, y), (x_after, y_after)
+                )
+            else:
+                neighbours = get_edge_neighbours(cell)
+            for neighbour in neighbours:
+                neighbour_counts[neighbour] = get_count(neighbour, 0) + 1
+        return neighbour_counts
+
+    def _get_neighbours(self, cell):
+        """Returns a tuple of the distinct cells next to `cell` on the board's
+        topology, leaving out `cell` itself.
+        """
+        x, y = cell
+        is_interior_cell = 0 < x < self.x_size - 1 and \
+            0 < y < self.y_size - 1
+        if self.topology == INFINITE or is_interior_cell:
+            return _get_interior_neighbours(x, y)
+        return self._get_edge_neighbours(cell)
+
+    def _get_edge_neighbours(self, cell):
+        neighbours = self._edge_neighbours.get(cell)
+        if neighbours is None:
+            # Cells on the edges of small tori can wrap around to
+            # themselves.
+            neighbours = tuple(self._get_cells_in_proximity(cell) - {cell})
+            self._edge_neighbours[cell] = neighbours
+        return neighbours
 
     def _get_cells_in_proximity(self, (x, y)):
+        if self.topology != BOUNDED:
+            return set(
+                self._get_cell_on_board((x_candidate, y_candidate))
+                for x_candidate in xrange(x - 1, x + 2)
+                for y_candidate in xrange(y - 1, y + 2)
+            )
+
         cells_in_proximity = set([])
 
         for x_candidate in xrange(x - 1, x + 2):
@@ -108,3 +507,14 @@ class Board(object):
                     cells_in_proximity.add((x_candidate, y_candidate))
 
         return cells_in_proximity
+
+    def _get_cell_on_board(self, (x, y)):
+        """Returns the cell that (x, y) refers to on the board's topology,
+        wrapping it around the edges of a torus, or `None` if it's beyond the
+        edges of a bounded board.
+        """
+        if self.topology == TORUS:
+            return x % self.x_size, y % self.y_size
+        elif self.topology == INFINITE or self._is_cell_in_bounds((x, y)):
+            return x, y
+        return None
@@ -0,0 +1,111 @@
+"""Chooses the board engine that best fits a particular game state."""
+from game_of_life import dense_board
+from game_of_life.board import BOUNDED
+from game_of_life.board import INFINITE
+from game_of_life.board import Board
+from game_of_life.chunked_board import ChunkedBoard
+from game_of_life.hashlife import HashLifeBoard
+from game_of_life.incremental_board import IncrementalBoard
+from game_of_life.packed_board import PackedBoard
+from game_of_life.rules import CONWAY
+
+# Fraction of live cells above which the dense engine beats the set based one.
+# A sparse step costs a few microseconds per live cell while a dense step costs
+# a few nanoseconds per cell, so even fairly empty boards favour the dense
+# engine.
+DENSE_DENSITY_THRESHOLD = 0.01
+
+
+def choose_board_cls(x_size, y_size, population, topology=BOUNDED):
+    """Returns the board class to use for a board with the given dimensions
+    and number of live cells.
+
+    Args:
+        x_size - integer describing the size of the x dimension
+        y_size - integer describing the size of the y dimension
+        population - number of live cells on the board
+
+    Keyword Args:
+        topology - one of `board.TOPOLOGIES`
+    """
+    if dense_board.numpy is None:
+        return Board
+    elif topology == INFINITE:
+        return ChunkedBoard
+
+    area = x_size * y_size
+    if area and float(population) / area >= DENSE_DENSITY_THRESHOLD:
+        return dense_board.DenseBoard
+    return Board
+
+
+def create_board(
+    x_size,
+    y_size,
+    live_cells=(),
+    topology=BOUNDED,
+    rule=CONWAY
+):
+    """Creates a board, picking a sparse `Board` or a `DenseBoard` based on the
+    density of `live_cells`, or a `ChunkedBoard` for the infinite plane.
+
+    Args:
+        x_size - integer describing the size of the x dimension
+        y_size - integer describing the size of the y dimension
+
+    Keyword Args:
+        live_cells - iterable of (x, y) integer pairs representing live cells
+        topology - one of `board.TOPOLOGIES`
+        rule - rule the board is stepped with, see `board.Board`
+    """
+    live_cells = set(live_cells)
+    board_cls = choose_board_cls(
+        x_size,
+        y_size,
+        len(live_cells),
+        topology=topology
+    )
+    return board_cls(
+        x_size,
+        y_size,
+        live_cells=live_cells,
+        topology=topology,
+        rule=rule
+    )
+
+
+def create_board_with_rule(
+    board_factory,
+    forced_rule,
+    x_size,
+    y_size,
+    live_cells=(),
+    **kwargs
+):
+    """Creates a board with `board_factory`, stepped with `forced_rule`
+    whatever rule the loader asked for in `kwargs`, so that a rule picked by
+    the user takes precedence over the rule in the header of a pattern file.
+
+    Args:
+        board_factory - callable taking `(x_size, y_size, live_cells=...)`
+            and the `rule` keyword argument
+        forced_rule - `rules.Rule` or string describing the rule
+        x_size - integer describing the size of the x dimension
+        y_size - integer describing the size of the y dimension
+
+    Keyword Args:
+        live_cells - iterable of (x, y) integer pairs representing live cells
+    """
+    kwargs['rule'] = forced_rule
+    return board_factory(x_size, y_size, live_cells=live_cells, **kwargs)
+
+
+# Board classes that can be picked explicitly instead of by density.
+ENGINE_NAME_TO_BOARD_CLS = {
+    'sparse': Board,
+    'incremental': IncrementalBoard,
+    'dense': dense_board.DenseBoard,
+    'packed': PackedBoard,
+    'hashlife': HashLifeBoard,
+    'chunked': ChunkedBoard,
+}
@@ -0,0 +1,278 @@
+"""Periodic checkpoints of a running simulation, so it can be resumed after the
+process dies.
+
+A checkpoint directory holds the boards of the last few checkpoints, each in
+the binary format of `game_of_life.binary_format` with its generation in the
+header, and a `MANIFEST_FILENAME` JSON file describing the latest one: its
+board file, generation, engine, topology and rule. Every file is written to
+a temporary file first and renamed into place, and the manifest is only
+replaced once the board it points to is complete, so a crash at any point
+leaves the previous checkpoint intact.
+
+Writing a checkpoint only needs a snapshot of the board, which shares the
+arrays of the dense and packed engines, so the encoding and writing can be
+left to a background thread while the simulation keeps stepping.
+"""
+import collections
+import json
+import os
+import tempfile
+import threading
+import time
+
+from game_of_life import errors
+from game_of_life.binary_format import write_board
+from game_of_life.board import BOUNDED
+from game_of_life.board import TOPOLOGIES
+from game_of_life.rules import CONWAY
+from game_of_life.rules import parse_rule
+
+MANIFEST_FILENAME = 'checkpoint.json'
+BOARD_FILENAME_FORMAT = 'checkpoint-%012d.golb'
+
+DEFAULT_INTERVAL_SECONDS = 60.0
+DEFAULT_CHECKPOINTS_TO_KEEP = 2
+
+# Latest checkpoint of a directory, as described by its manifest. `engine` is
+# the name of the engine the board was stepped with, or `None` if it was
+# picked based on the density of the board, and `topology` and `rule` are the
+# topology and `rules.Rule` of the board.
+Checkpoint = collections.namedtuple(
+    'Checkpoint',
+    ['filename', 'generation', 'engine', 'topology', 'rule']
+)
+
+
+def find_latest_checkpoint(directory):
+    """Returns the latest `Checkpoint` saved in `directory`.
+
+    Raises:
+        `errors.CheckpointError` if there is no valid checkpoint in
+            `directory`
+    """
+    manifest_filename = os.path.join(directory, MANIFEST_FILENAME)
+    try:
+        with open(manifest_filename) as manifest_file:
+            manifest = json.load(manifest_file)
+        # Manifests written before the topology and rule were recorded only
+        # held bounded Conway boards.
+        topology = manifest.get('topology', BOUNDED)
+        if topology not in TOPOLOGIES:
+            raise ValueError('Unknown topology %r' % topology)
+        return Checkpoint(
+            os.path.join(directory, manifest['filename']),
+            manifest['generation'],
+            manifest['engine'],
+            topology,
+            parse_rule(manifest.get('rule', CONWAY))
+        )
+    except (
+        EnvironmentError,
+        ValueError,
+        KeyError,
+        TypeError,
+        errors.InvalidRuleError
+    ):
+        raise errors.CheckpointError(
+            'No checkpoint found in %s' % directory
+        )
+
+
+def _write_atomically(filename, write_function):
+    """Calls `write_function` with a temporary file in the directory of
+    `filename` and renames it to `filename` once it's complete. The directory
+    is synced after the rename, so that the new file survives a power loss
+    too.
+    """
+    directory, basename = os.path.split(filename)
+    file_descriptor, temporary_filename = tempfile.mkstemp(
+        dir=directory,
+        prefix='.' + basename
+    )
+    try:
+        with os.fdopen(file_descriptor, 'wb') as output_file:
+            write_function(output_file)
+            output_file.flush()
+            os.fsync(output_file.fileno())
+        os.rename(temporary_filename, filename)
+    except:
+        os.remove(temporary_filename)
+        raise
+
+    directory_descriptor = os.open(directory or os.curdir, os.O_RDONLY)
+    try:
+        os.fsync(directory_descriptor)
+    finally:
+        os.close(directory_descriptor)
+
+
+class Checkpointer(object):
+    """Saves checkpoints of a board every `interval_generations` generations
+    or `interval_seconds` seconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        directory,
+        interval_generations=None,
+        interval_seconds=DEFAULT_INTERVAL_SECONDS,
+        engine=None,
+        background=True,
+        checkpoints_to_keep=DEFAULT_CHECKPOINTS_TO_KEEP,
+        first_generation=0
+    ):
+        """Creates a `Checkpointer` object, creating `directory` if needed.
+
+        Args:
+            directory - directory the checkpoints are saved to
+
+        Keyword Args:
+            interval_generations - number of generations between two
+                checkpoints, or `None`
+            interval_seconds - number of seconds between two checkpoints, or
+                `None`
+            engine - name of the engine the board is stepped with, recorded
+                in the manifest
+            background - if `True`, checkpoints are written on a background
+                thread. If a checkpoint is due while the previous one is
+                still being written, only the latest one waiting is kept.
+            checkpoints_to_keep - number of checkpoint boards kept in
+                `directory`, at least 1
+            first_generation - generation the board starts at, counting from
+                which `interval_generations` is measured
+
+        Raises:
+            `ValueError` if `checkpoints_to_keep` is less than 1
+        """
+        if checkpoints_to_keep < 1:
+            raise ValueError('At least one checkpoint has to be kept')
+        self._directory = directory
+        self._interval_generations = interval_generations
+        self._interval_seconds = interval_seconds
+        self._engine = engine
+        self._background = background
+        self._checkpoints_to_keep = checkpoints_to_keep
+        self._last_generation = first_generation
+        self._last_time = time.time()
+
+        self._condition = threading.Condition()
+        self._pending = None
+        self._is_closed = False
+        self._thread = None
+        self._error = None
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def update(self, board, generation):
+        """Saves a checkpoint of `board` at `generation` if one is due.
+
+        Args:
+            board - board object that isn't changed any more, such as a
+                snapshot
+            generation - generation of `board`
+
+        Raises:
+            the exception that stopped the background thread, if any
+        """
+        is_due = (
+            self._interval_generations is not None and
+            generation - self._last_generation >= self._interval_generations
+        ) or (
+            self._interval_seconds is not None and
+            time.time() - self._last_time >= self._interval_seconds
+        )
+        if is_due:
+            self.save(board, generation)
+
+    def save(self, board, generation):
+        """Saves a checkpoint of `board` at `generation` now, or hands it to
+        the background thread.
+
+        Raises:
+            the exception that stopped the background thread, if any
+        """
+        self._last_generation = generation
+        self._last_time = time.time()
+        if not self._background:
+            self._write_checkpoint(board, generation)
+            return
+
+        with self._condition:
+            if self._error is not None:
+                raise self._error
+            self._pending = (board, generation)
+            self._condition.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def close(self):
+        """Waits for the checkpoint being written, and any waiting one, to
+        be saved and stops the background thread.
+
+        Raises:
+            the exception that stopped the background thread, if any
+        """
+        with self._condition:
+            self._is_closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise self._error
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._is_closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                board, generation = self._pending
+                self._pending = None
+
+            try:
+                self._write_checkpoint(board, generation)
+            except Exception as error:
+                with self._condition:
+                    self._error = error
+                return
+
+    def _write_checkpoint(self, board, generation):
+        board_filename = BOARD_FILENAME_FORMAT % generation
+        _write_atomically(
+            os.path.join(self._directory, board_filename),
+            lambda output_file: write_board(
+                board,
+                output_file,
+                generation=generation
+            )
+        )
+
+        manifest = collections.OrderedDict([
+            ('filename', board_filename),
+            ('generation', generation),
+            ('engine', self._engine),
+            ('topology', board.topology),
+            ('rule', str(board.rule)),
+            ('x_size', board.x_size),
+            ('y_size', board.y_size),
+            ('time', time.time()),
+        ])
+        _write_atomically(
+            os.path.join(self._directory, MANIFEST_FILENAME),
+            lambda output_file: json.dump(manifest, output_file)
+        )
+        self._remove_old_checkpoints()
+
+    def _remove_old_checkpoints(self):
+        board_filenames = sorted(
+            filename for filename in os.listdir(self._directory)
+            if filename.startswith('checkpoint-') and
+            filename.endswith('.golb')
+        )
+        for filename in board_filenames[:-self._checkpoints_to_keep]:
+            os.remove(os.path.join(self._directory, filename))
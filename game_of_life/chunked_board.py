@@ -0,0 +1,353 @@
+"""Chunked, NumPy backed Game of Life engine for the infinite plane.
+
+`ChunkedBoard` splits the plane into `TILE_SIZE` x `TILE_SIZE` tiles and only
+keeps the tiles that hold live cells, in a dict keyed by the (x, y) position of
+the tile. A tile is allocated when a cell is born in it and freed as soon as it
+empties, so memory and the cost of a step follow the live region of the board
+instead of a fixed rectangle, and patterns can travel as far as they like.
+
+On every step the tiles are stacked, each padded with a one cell halo copied
+from its neighbours, and the whole stack is advanced with a single call to
+`dense_board.next_generation()`. Empty tiles that touch live cells on the edge
+of a tile are stepped as well, since cells can be born in them.
+"""
+import itertools
+
+from game_of_life.board import INFINITE
+from game_of_life.board import BaseBoard
+from game_of_life.dense_board import LIVE_CELLS_CHUNK_SIZE
+from game_of_life.dense_board import next_generation
+from game_of_life.dense_board import numpy
+from game_of_life.dense_board import sum_blocks
+from game_of_life.rules import CONWAY
+from game_of_life.rules import parse_rule
+
+TILE_SIZE = 64
+
+# For every (x, y) offset of a neighbouring tile, the part of the padded tile
+# its cells are copied to and the part of the neighbour they're copied from,
+# starting with the tile itself.
+_HALO = [
+    ((0, 0), (slice(1, -1), slice(1, -1)), (slice(None), slice(None))),
+    ((0, -1), (0, slice(1, -1)), (-1, slice(None))),
+    ((0, 1), (-1, slice(1, -1)), (0, slice(None))),
+    ((-1, 0), (slice(1, -1), 0), (slice(None), -1)),
+    ((1, 0), (slice(1, -1), -1), (slice(None), 0)),
+    ((-1, -1), (0, 0), (-1, -1)),
+    ((1, -1), (0, -1), (-1, 0)),
+    ((-1, 1), (-1, 0), (0, -1)),
+    ((1, 1), (-1, -1), (0, 0)),
+]
+
+
+def _get_tile_cells(mask, (tile_x, tile_y)):
+    ys, xs = numpy.nonzero(mask)
+    return zip(
+        (xs + tile_x * TILE_SIZE).tolist(),
+        (ys + tile_y * TILE_SIZE).tolist()
+    )
+
+
+class ChunkedBoard(BaseBoard):
+    """Game of Life board on the infinite plane that stores its live region
+    in NumPy tiles, see the top of this module.
+
+    `x_size` and `y_size` only describe the window of the plane that is drawn
+    and saved. Live cells may lie anywhere, including at negative
+    coordinates.
+    """
+
+    TOPOLOGIES = [INFINITE]
+
+    def __init__(
+        self,
+        x_size,
+        y_size,
+        live_cells=(),
+        topology=INFINITE,
+        rule=CONWAY
+    ):
+        """Creates a new `ChunkedBoard` object.
+
+        Args:
+            x_size - integer describing the size of the x dimension of the
+                window
+            y_size - integer describing the size of the y dimension of the
+                window
+
+        Keyword Args:
+            live_cells - iterable of (x, y) integer pairs representing live
+                cells on the `ChunkedBoard` object.
+            topology - one of `TOPOLOGIES`
+            rule - rule the board is stepped with, see `Board`
+
+        Raises:
+            `ValueError` if `topology` isn't one of `TOPOLOGIES`
+            `errors.InvalidRuleError` if `rule` isn't a valid rule
+        """
+        if topology not in self.TOPOLOGIES:
+            raise ValueError('Unsupported topology %r' % (topology,))
+        self.x_size = x_size
+        self.y_size = y_size
+        self.topology = topology
+        self.rule = parse_rule(rule)
+        self._tiles = {}
+        self._set_live_cells(live_cells)
+        self._previous_tiles = self._tiles
+        # Number of cells considered by the last `step()`.
+        self.candidate_count = 0
+
+    def _set_live_cells(self, live_cells):
+        live_cells = iter(live_cells)
+        while True:
+            chunk = list(itertools.islice(live_cells, LIVE_CELLS_CHUNK_SIZE))
+            if not chunk:
+                return
+
+            coordinates = numpy.array(chunk, dtype=numpy.intp)
+            # Floor division puts negative coordinates in negative tiles.
+            tile_coordinates = coordinates // TILE_SIZE
+            offsets = coordinates - tile_coordinates * TILE_SIZE
+            order = numpy.lexsort(tile_coordinates.T)
+            tile_coordinates = tile_coordinates[order]
+            offsets = offsets[order]
+
+            is_new_tile = numpy.ones(len(order), dtype=bool)
+            is_new_tile[1:] = (tile_coordinates[1:] != tile_coordinates[:-1]) \
+                .any(axis=1)
+            starts = numpy.flatnonzero(is_new_tile)
+            stops = numpy.append(starts[1:], len(order))
+            for start, stop in zip(starts, stops):
+                key = tuple(tile_coordinates[start].tolist())
+                tile = self._tiles.get(key)
+                if tile is None:
+                    tile = numpy.zeros((TILE_SIZE, TILE_SIZE), numpy.uint8)
+                    self._tiles[key] = tile
+                tile[offsets[start:stop, 1], offsets[start:stop, 0]] = 1
+
+    def __getitem__(self, (x, y)):
+        """Gets the current status of a particular cell, returning `True` if
+        the cell is alive and `False` if it is not.
+
+        Args:
+            cell - (x, y) integer tuple representing the position to check
+        """
+        tile = self._tiles.get((x // TILE_SIZE, y // TILE_SIZE))
+        if tile is None:
+            return False
+        return bool(tile[y % TILE_SIZE, x % TILE_SIZE])
+
+    def get_tile_count(self):
+        """Returns the number of tiles allocated for the live region."""
+        return len(self._tiles)
+
+    def get_live_cells(self):
+        """Returns a `frozenset` of the (x, y) integer pairs that are alive."""
+        return frozenset(itertools.chain.from_iterable(
+            _get_tile_cells(tile, key)
+            for key, tile in self._tiles.iteritems()
+        ))
+
+    def get_population(self):
+        """Returns the number of live cells on the board."""
+        return sum(
+            int(tile.sum(dtype=numpy.int64))
+            for tile in self._tiles.itervalues()
+        )
+
+    def snapshot(self):
+        """See `BaseBoard.snapshot()`. `step()` never changes tiles in place,
+        so the snapshot shares them.
+        """
+        board = ChunkedBoard(
+            self.x_size,
+            self.y_size,
+            topology=self.topology,
+            rule=self.rule
+        )
+        board._tiles = self._tiles
+        board._previous_tiles = self._tiles
+        return board
+
+    def _get_tiles_in_region(self, x_start, y_start, x_stop, y_stop):
+        """Yields `(key, tile, x_slice, y_slice)` for every tile that overlaps
+        the region, the slices selecting the part of the tile inside of it.
+        Goes over the tile positions of the region instead of the tiles when
+        there are fewer of them.
+        """
+        tile_x_range = xrange(
+            x_start // TILE_SIZE,
+            -(-x_stop // TILE_SIZE)
+        )
+        tile_y_range = xrange(
+            y_start // TILE_SIZE,
+            -(-y_stop // TILE_SIZE)
+        )
+        if len(tile_x_range) * len(tile_y_range) < len(self._tiles):
+            keys = [
+                (tile_x, tile_y)
+                for tile_y in tile_y_range
+                for tile_x in tile_x_range
+                if (tile_x, tile_y) in self._tiles
+            ]
+        else:
+            keys = self._tiles
+
+        for key in keys:
+            tile_x, tile_y = key
+            x_offset = tile_x * TILE_SIZE
+            y_offset = tile_y * TILE_SIZE
+            tile_x_start = max(x_start - x_offset, 0)
+            tile_y_start = max(y_start - y_offset, 0)
+            tile_x_stop = min(x_stop - x_offset, TILE_SIZE)
+            tile_y_stop = min(y_stop - y_offset, TILE_SIZE)
+            if tile_x_start >= tile_x_stop or tile_y_start >= tile_y_stop:
+                continue
+
+            yield (
+                key,
+                self._tiles[key],
+                slice(tile_x_start, tile_x_stop),
+                slice(tile_y_start, tile_y_stop)
+            )
+
+    def _get_live_cells_in_region(self, x_start, y_start, x_stop, y_stop):
+        """Same as `BaseBoard._get_live_cells_in_region()`, but only goes over
+        the tiles that overlap the region.
+        """
+        live_cells = []
+        for key, tile, x_slice, y_slice in self._get_tiles_in_region(
+            x_start,
+            y_start,
+            x_stop,
+            y_stop
+        ):
+            ys, xs = numpy.nonzero(tile[y_slice, x_slice])
+            live_cells.extend(zip(
+                (xs + key[0] * TILE_SIZE + x_slice.start).tolist(),
+                (ys + key[1] * TILE_SIZE + y_slice.start).tolist()
+            ))
+        return live_cells
+
+    def get_region_array(self, x_start, y_start, x_stop, y_stop):
+        """See `BaseBoard.get_region_array()`. The region can lie anywhere on
+        the plane.
+        """
+        cells = numpy.zeros(
+            (y_stop - y_start, x_stop - x_start),
+            dtype=numpy.uint8
+        )
+        for (tile_x, tile_y), tile, x_slice, y_slice in \
+                self._get_tiles_in_region(x_start, y_start, x_stop, y_stop):
+            x_offset = tile_x * TILE_SIZE - x_start
+            y_offset = tile_y * TILE_SIZE - y_start
+            cells[
+                y_offset + y_slice.start:y_offset + y_slice.stop,
+                x_offset + x_slice.start:x_offset + x_slice.stop
+            ] = tile[y_slice, x_slice]
+        return cells
+
+    def get_block_populations(
+        self,
+        x_start,
+        y_start,
+        x_stop,
+        y_stop,
+        block_size
+    ):
+        """See `BaseBoard.get_block_populations()`."""
+        return sum_blocks(
+            self.get_region_array(x_start, y_start, x_stop, y_stop),
+            (block_size, block_size)
+        )
+
+    def get_step_diff(self):
+        """Returns a `(born_cells, died_cells)` pair of `frozenset`s holding
+        the cells that came alive and the cells that died in the last
+        `step()`. Both are empty before the board is first stepped.
+        """
+        born_cells = []
+        died_cells = []
+        for key in set(self._tiles) | set(self._previous_tiles):
+            tile = self._tiles.get(key)
+            previous_tile = self._previous_tiles.get(key)
+            if tile is previous_tile:
+                continue
+            elif tile is None:
+                died_cells.extend(_get_tile_cells(previous_tile, key))
+            elif previous_tile is None:
+                born_cells.extend(_get_tile_cells(tile, key))
+            else:
+                changed = tile != previous_tile
+                born_cells.extend(_get_tile_cells(changed & (tile == 1), key))
+                died_cells.extend(
+                    _get_tile_cells(changed & (previous_tile == 1), key)
+                )
+        return frozenset(born_cells), frozenset(died_cells)
+
+    def step(self):
+        """Steps the game board using the same rules as `Board.step()`, and
+        updates `candidate_count` to the number of cells in the tiles that
+        were stepped.
+        """
+        self._previous_tiles = self._tiles
+        keys = list(self._tiles)
+        if not keys:
+            self.candidate_count = 0
+            return
+
+        # The extra tile at the end of the stack stands in for every missing
+        # neighbour.
+        stack = numpy.zeros(
+            (len(keys) + 1, TILE_SIZE, TILE_SIZE),
+            dtype=numpy.uint8
+        )
+        for index, key in enumerate(keys):
+            stack[index] = self._tiles[key]
+
+        candidate_keys = keys + self._get_tiles_with_possible_births(
+            keys,
+            stack
+        )
+        indexes = dict((key, index) for index, key in enumerate(keys))
+        padded = numpy.empty(
+            (len(candidate_keys), TILE_SIZE + 2, TILE_SIZE + 2),
+            dtype=numpy.uint8
+        )
+        for (x_offset, y_offset), destination, source in _HALO:
+            neighbour_indexes = numpy.array(
+                [
+                    indexes.get((tile_x + x_offset, tile_y + y_offset), -1)
+                    for tile_x, tile_y in candidate_keys
+                ],
+                dtype=numpy.intp
+            )
+            padded[(slice(None),) + destination] = \
+                stack[(neighbour_indexes,) + source]
+
+        next_tiles = numpy.ascontiguousarray(
+            next_generation(padded, rule=self.rule)[:, 1:-1, 1:-1]
+        )
+        is_alive = next_tiles.any(axis=(1, 2))
+        self._tiles = dict(
+            (candidate_keys[index], next_tiles[index])
+            for index in numpy.flatnonzero(is_alive)
+        )
+        self.candidate_count = len(candidate_keys) * TILE_SIZE * TILE_SIZE
+
+    def _get_tiles_with_possible_births(self, keys, stack):
+        """Returns the keys of the missing tiles next to live cells on the
+        edges of the tiles in `stack`.
+        """
+        tile_keys = set()
+        for (x_offset, y_offset), _, source in _HALO[1:]:
+            # The cells in `source` make up the halo of the tile at the
+            # opposite offset.
+            edges = stack[(slice(None, -1),) + source]
+            has_live_cells = edges.reshape(len(keys), -1).any(axis=1)
+            for index in numpy.flatnonzero(has_live_cells):
+                tile_x, tile_y = keys[index]
+                key = (tile_x - x_offset, tile_y - y_offset)
+                if key not in self._tiles:
+                    tile_keys.add(key)
+        return list(tile_keys)
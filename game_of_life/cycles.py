@@ -0,0 +1,165 @@
+"""Detects boards that have settled into a still life or an oscillator.
+
+Once a board repeats an earlier generation it will cycle through the same
+generations forever, so any later generation is less than a period's worth of
+steps away instead of being stepped to.
+
+Generations are told apart by fingerprints rather than by their cells, so
+remembering one takes about `FINGERPRINT_BYTES` whatever the size of the
+board, and the fingerprints of recent generations are remembered until they
+take more than `max_bytes`. Fingerprints can collide, so a repeated
+fingerprint only makes a candidate cycle: the board is snapshotted and stepped
+through one more period, and the cycle is only found if the board comes back
+to the snapshot.
+"""
+import collections
+
+# Estimated size of the fingerprints remembered by default. Cycles with a
+# longer period than the number of fingerprints that fit in it are not
+# detected.
+DEFAULT_MAX_BYTES = 1 << 20
+
+# Rough number of bytes taken by a remembered fingerprint, counting the
+# fingerprint and generation integers and their slot in an ordered dict.
+FINGERPRINT_BYTES = 128
+
+
+class CycleTracker(object):
+    """Finds the first generation a board repeats from the fingerprints of its
+    generations, see the top of this module.
+
+    Once a cycle is found `period` is its length and `cycle_start` the first
+    generation that is part of it.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """Creates a `CycleTracker` object.
+
+        Keyword Args:
+            max_bytes - estimated size above which the fingerprints of the
+                oldest generations are forgotten. The latest one is always
+                kept.
+        """
+        self._max_fingerprints = max(max_bytes // FINGERPRINT_BYTES, 1)
+        self._generation_by_fingerprint = collections.OrderedDict()
+        # `(first_generation, generation, state)` of a repeated fingerprint
+        # waiting to be confirmed.
+        self._candidate = None
+        self.cycle_start = None
+        self.period = None
+
+    def has_found_cycle(self):
+        return self.period is not None
+
+    def remember(self, generation, fingerprint, get_state):
+        """Accounts for a generation of the board. Generations have to be
+        remembered one after the other.
+
+        Args:
+            generation - generation of the board
+            fingerprint - hashable fingerprint of the board in `generation`
+            get_state - function returning a snapshot of the board in
+                `generation`, which compares equal to the snapshots of the
+                same state. It's only called to confirm cycles.
+        """
+        if self.has_found_cycle():
+            return
+
+        if self._candidate is not None:
+            first_generation, candidate_generation, state = self._candidate
+            period = candidate_generation - first_generation
+            if generation < candidate_generation + period:
+                return
+            self._candidate = None
+            if get_state() == state:
+                self.cycle_start = first_generation
+                self.period = period
+            return
+
+        first_generation = self._generation_by_fingerprint.get(fingerprint)
+        if first_generation is not None:
+            self._candidate = (first_generation, generation, get_state())
+            return
+
+        self._generation_by_fingerprint[fingerprint] = generation
+        if len(self._generation_by_fingerprint) > self._max_fingerprints:
+            self._generation_by_fingerprint.popitem(last=False)
+
+
+class CycleDetector(object):
+    """Steps a board until it repeats one of its recent generations, see the
+    top of this module.
+
+    Generations are counted from 0, the state of the board the
+    `CycleDetector` was created with. After a cycle is found `period` is its
+    length and `cycle_start` the first generation that is part of it, and the
+    board is only stepped along the cycle to the generation asked for.
+    """
+
+    def __init__(self, board, max_bytes=DEFAULT_MAX_BYTES):
+        """Creates a `CycleDetector` object.
+
+        Args:
+            board - board object to step
+
+        Keyword Args:
+            max_bytes - estimated size of the fingerprints remembered, see
+                `CycleTracker`
+        """
+        self._board = board
+        self._board_generation = 0
+        self._cycle_tracker = CycleTracker(max_bytes)
+        self.generation = 0
+        self._remember()
+
+    @property
+    def cycle_start(self):
+        return self._cycle_tracker.cycle_start
+
+    @property
+    def period(self):
+        return self._cycle_tracker.period
+
+    def _remember(self):
+        self._cycle_tracker.remember(
+            self._board_generation,
+            self._board.get_fingerprint(),
+            self._board.snapshot
+        )
+
+    def has_found_cycle(self):
+        return self._cycle_tracker.has_found_cycle()
+
+    def step(self):
+        """Advances one generation."""
+        self.advance(1)
+
+    def advance(self, generations):
+        """Advances `generations` generations, stepping the board only until
+        a cycle is found.
+        """
+        target_generation = self.generation + generations
+        while not self.has_found_cycle() and \
+                self._board_generation < target_generation:
+            self._board.step()
+            self._board_generation += 1
+            self._remember()
+        self.generation = target_generation
+
+    def get_live_cells(self):
+        """Returns a `frozenset` of the cells that are alive in the current
+        generation.
+        """
+        return self.get_board().get_live_cells()
+
+    def get_board(self):
+        """Returns the stepped board in the current generation. Once a cycle
+        is found, it's stepped along the cycle to the matching generation,
+        which takes less than `period` steps.
+        """
+        if self.has_found_cycle():
+            steps = (self.generation - self._board_generation) % self.period
+            for _ in xrange(steps):
+                self._board.step()
+            self._board_generation += steps
+        return self._board
@@ -0,0 +1,312 @@
+"""Dense, NumPy backed Game of Life engine.
+
+`DenseBoard` keeps the whole grid in a `uint8` array and advances it with a
+handful of whole-array operations, which is far faster than the set based
+`Board` once a meaningful fraction of the board is alive. NumPy is an optional
+dependency; `numpy` is `None` when it is not installed.
+"""
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from game_of_life import errors
+from game_of_life.board import BOUNDED
+from game_of_life.board import TORUS
+from game_of_life.board import BaseBoard
+from game_of_life.rules import CONWAY
+from game_of_life.rules import parse_rule
+
+# Number of live cells converted to an array at a time when creating boards,
+# which bounds the memory used on top of the board itself.
+LIVE_CELLS_CHUNK_SIZE = 1 << 16
+
+
+def iterate_coordinate_chunks(live_cells, x_size, y_size):
+    """Yields (xs, ys) pairs of integer arrays holding the coordinates of
+    `live_cells`, at most `LIVE_CELLS_CHUNK_SIZE` cells at a time.
+
+    Args:
+        live_cells - iterable of (x, y) integer pairs, which may be a
+            generator
+        x_size - integer describing the size of the x dimension
+        y_size - integer describing the size of the y dimension
+
+    Raises:
+        `errors.InvalidBoardError` if any cell is out of bounds
+    """
+    live_cells = iter(live_cells)
+    while True:
+        chunk = list(itertools.islice(live_cells, LIVE_CELLS_CHUNK_SIZE))
+        if not chunk:
+            return
+
+        coordinates = numpy.array(chunk, dtype=numpy.intp)
+        xs, ys = coordinates[:, 0], coordinates[:, 1]
+        x_is_in_bounds = (0 <= xs) & (xs < x_size)
+        y_is_in_bounds = (0 <= ys) & (ys < y_size)
+        if not (x_is_in_bounds & y_is_in_bounds).all():
+            raise errors.InvalidBoardError
+        yield xs, ys
+
+
+def count_neighbours(cells, wrap=False):
+    """Returns an array with the number of live neighbours of every cell.
+
+    Cells beyond the edges of the grid count as dead. Only the last two axes
+    are treated as (y, x), so a stack of equally sized grids can be counted in
+    one call.
+
+    Args:
+        cells - `uint8` array of 0's and 1's
+
+    Keyword Args:
+        wrap - if `True`, the edges of the grid wrap around to the opposite
+            side as on a torus instead
+    """
+    padded_shape = cells.shape[:-2] + (cells.shape[-2] + 2, cells.shape[-1] + 2)
+    padded = numpy.zeros(padded_shape, dtype=numpy.uint8)
+    padded[..., 1:-1, 1:-1] = cells
+    if wrap:
+        padded[..., 0, 1:-1] = cells[..., -1, :]
+        padded[..., -1, 1:-1] = cells[..., 0, :]
+        padded[..., :, 0] = padded[..., :, -2]
+        padded[..., :, -1] = padded[..., :, 1]
+
+    counts = padded[..., :-2, :-2].copy()
+    counts += padded[..., :-2, 1:-1]
+    counts += padded[..., :-2, 2:]
+    counts += padded[..., 1:-1, :-2]
+    counts += padded[..., 1:-1, 2:]
+    counts += padded[..., 2:, :-2]
+    counts += padded[..., 2:, 1:-1]
+    counts += padded[..., 2:, 2:]
+    return counts
+
+
+def next_generation(cells, wrap=False, rule=CONWAY):
+    """Returns a new `uint8` array holding the generation after `cells`.
+
+    Indexing the transition table of `rule` with a whole array of counts
+    makes NumPy convert them to `intp` indexes first, which costs more than
+    the rest of the step. Instead, the cells matching every live entry of the
+    table are selected with a comparison, so Conway's rule takes the same
+    three comparisons as it would written out by hand.
+
+    Args:
+        cells - `uint8` array of 0's and 1's, see `count_neighbours()`
+
+    Keyword Args:
+        wrap - see `count_neighbours()`
+        rule - `rules.Rule` the cells are stepped with
+    """
+    counts = count_neighbours(cells, wrap=wrap)
+    was_alive = cells == 1
+    is_alive = None
+    for live_neighbours in xrange(9):
+        is_born = rule.table[live_neighbours]
+        survives = rule.table[9 + live_neighbours]
+        if not (is_born or survives):
+            continue
+
+        has_count = counts == live_neighbours
+        if not survives:
+            has_count &= ~was_alive
+        elif not is_born:
+            has_count &= was_alive
+
+        if is_alive is None:
+            is_alive = has_count
+        else:
+            is_alive |= has_count
+
+    if is_alive is None:
+        return numpy.zeros_like(cells)
+    return is_alive.view(numpy.uint8)
+
+
+def sum_blocks(cells, block_shape):
+    """Returns an array with the sum of every block of `cells`, the blocks on
+    the right and bottom edges being cut short by the edges of `cells`.
+
+    Args:
+        cells - two dimensional array
+        block_shape - (y_size, x_size) of every block
+    """
+    y_block_size, x_block_size = block_shape
+    shape = (
+        -(-cells.shape[0] // y_block_size),
+        -(-cells.shape[1] // x_block_size)
+    )
+    if not cells.size:
+        return numpy.zeros(shape, dtype=numpy.intp)
+
+    rows = numpy.add.reduceat(
+        cells,
+        numpy.arange(0, cells.shape[0], y_block_size),
+        axis=0,
+        dtype=numpy.intp
+    )
+    return numpy.add.reduceat(
+        rows,
+        numpy.arange(0, cells.shape[1], x_block_size),
+        axis=1
+    )
+
+
+def _get_cells_from_mask(mask):
+    ys, xs = numpy.nonzero(mask)
+    return frozenset(zip(xs.tolist(), ys.tolist()))
+
+
+class DenseBoard(BaseBoard):
+    """Game of Life board that stores every cell in a NumPy `uint8` array.
+
+    It has the same interface as `Board` so it can be used anywhere a `Board`
+    is expected.
+    """
+
+    TOPOLOGIES = [BOUNDED, TORUS]
+
+    def __init__(
+        self,
+        x_size,
+        y_size,
+        live_cells=(),
+        topology=BOUNDED,
+        rule=CONWAY
+    ):
+        """Creates a new `DenseBoard` object.
+
+        Args:
+            x_size - integer describing the size of the x dimension
+            y_size - integer describing the size of the y dimension
+
+        Keyword Args:
+            live_cells - iterable of (x, y) integer pairs representing live
+                cells on the `DenseBoard` object.
+            topology - one of `TOPOLOGIES`, see `board.TOPOLOGIES`
+            rule - rule the board is stepped with, see `Board`
+
+        Raises:
+            `ValueError` if `topology` isn't one of `TOPOLOGIES`
+            `errors.InvalidRuleError` if `rule` isn't a valid rule
+        """
+        if topology not in self.TOPOLOGIES:
+            raise ValueError('Unsupported topology %r' % (topology,))
+        self.topology = topology
+        self.rule = parse_rule(rule)
+        self.x_size = x_size
+        self.y_size = y_size
+        self._cells = numpy.zeros((y_size, x_size), dtype=numpy.uint8)
+        self._set_live_cells(live_cells)
+        self._previous_cells = self._cells
+
+    @classmethod
+    def from_array(cls, cells, topology=BOUNDED, rule=CONWAY):
+        """Creates a `DenseBoard` holding a copy of `cells`, a
+        (y_size, x_size) array of 0's and 1's, on `topology` and stepped with
+        `rule`.
+        """
+        y_size, x_size = cells.shape
+        # Subclasses that only support bounded boards take no topology.
+        board_kwargs = {'rule': rule}
+        if topology != BOUNDED:
+            board_kwargs['topology'] = topology
+        board = cls(x_size, y_size, **board_kwargs)
+        board._cells[...] = cells
+        return board
+
+    def _set_live_cells(self, live_cells):
+        for xs, ys in iterate_coordinate_chunks(
+            live_cells,
+            self.x_size,
+            self.y_size
+        ):
+            self._cells[ys, xs] = 1
+
+    def __getitem__(self, (x, y)):
+        """Gets the current status of a particular cell, returning `True` if
+        the cell is alive and `False` if it is not.
+
+        Args:
+            cell - (x, y) integer tuple representing the position to check
+        """
+        if not (0 <= x < self.x_size and 0 <= y < self.y_size):
+            return False
+        return bool(self._cells[y, x])
+
+    def to_array(self):
+        """Returns the board as a (y_size, x_size) `uint8` array."""
+        return self._cells
+
+    def snapshot(self):
+        """See `BaseBoard.snapshot()`. `step()` never changes the array of
+        cells in place, so the snapshot shares it.
+        """
+        board = DenseBoard(
+            self.x_size,
+            0,
+            topology=self.topology,
+            rule=self.rule
+        )
+        board.y_size = self.y_size
+        board._cells = self._cells
+        board._previous_cells = self._cells
+        return board
+
+    def get_region_array(self, x_start, y_start, x_stop, y_stop):
+        """Returns a view of the cells in a region of the board, see
+        `BaseBoard.get_region_array()`.
+        """
+        return self._cells[y_start:y_stop, x_start:x_stop]
+
+    def get_block_populations(
+        self,
+        x_start,
+        y_start,
+        x_stop,
+        y_stop,
+        block_size
+    ):
+        """See `BaseBoard.get_block_populations()`."""
+        return sum_blocks(
+            self.get_region_array(x_start, y_start, x_stop, y_stop),
+            (block_size, block_size)
+        )
+
+    def get_live_cells(self):
+        """Returns a `frozenset` of the (x, y) integer pairs that are alive."""
+        return _get_cells_from_mask(self._cells)
+
+    def get_step_diff(self):
+        """Returns a `(born_cells, died_cells)` pair of `frozenset`s holding
+        the cells that came alive and the cells that died in the last
+        `step()`. Both are empty before the board is first stepped.
+        """
+        changed = self._cells != self._previous_cells
+        return (
+            _get_cells_from_mask(changed & (self._cells == 1)),
+            _get_cells_from_mask(changed & (self._previous_cells == 1))
+        )
+
+    def get_population(self):
+        """Returns the number of live cells on the board."""
+        return int(self._cells.sum(dtype=numpy.int64))
+
+    def get_fingerprint(self):
+        """See `BaseBoard.get_fingerprint()`. Hashes the bytes of the array
+        instead of building the set of live cells.
+        """
+        return hash(self._cells.tobytes())
+
+    def step(self):
+        """Steps the game board using the same rules as `Board.step()`."""
+        self._previous_cells = self._cells
+        self._cells = next_generation(
+            self._cells,
+            wrap=self.topology == TORUS,
+            rule=self.rule
+        )
@@ -1,10 +1,44 @@
 # -*- coding: utf-8 -*-
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Characters used for blocks of cells when zoomed out, from empty to full.
+DENSITY_GLYPHS = ' .:-=+*#%@'
+
+
 class Drawer(object):
     """Responsible for drawing the board"""
 
-    def __init__(self, live_cell_character='1', dead_cell_character='0'):
+    def __init__(
+        self,
+        live_cell_character='1',
+        dead_cell_character='0',
+        density_glyphs=DENSITY_GLYPHS
+    ):
         self._live_cell_character = live_cell_character
         self._dead_cell_character = dead_cell_character
+        self._density_glyphs = density_glyphs
+        self._cell_lookup_table = self._create_cell_lookup_table()
+        self._buffer = None
+
+    def _create_cell_lookup_table(self):
+        """Returns a (2, cell width + 1) `uint8` array with the bytes of a dead
+        and a live cell followed by the separating space, or `None` if cells
+        can't be drawn in bulk.
+        """
+        characters = [self._dead_cell_character, self._live_cell_character]
+        can_draw_in_bulk = numpy is not None and \
+            all(isinstance(character, str) for character in characters) and \
+            self.can_draw_cells_in_place()
+        if not can_draw_in_bulk:
+            return None
+
+        return numpy.array(
+            [bytearray(character + ' ') for character in characters],
+            dtype=numpy.uint8
+        )
 
     def draw(self, board):
         """Draws and prints a `board`
@@ -17,17 +51,116 @@ class Drawer(object):
         following:
             '0 0\n0 1'
         """
+        can_draw_in_bulk = self._cell_lookup_table is not None and \
+            board.x_size and board.y_size and hasattr(board, 'to_array')
+        if can_draw_in_bulk:
+            return self._draw_in_bulk(board.to_array())
+
+        return self._draw_region(board, 0, 0, board.x_size, board.y_size)
+
+    def draw_viewport(self, board, viewport):
+        """Draws the part of `board` shown by `viewport`. At zoom level 1
+        cells are drawn as by `draw()`, otherwise every block of cells is
+        drawn as a single glyph from `density_glyphs` picked by the fraction
+        of the block that is alive.
+
+        Args:
+            board - board object to draw
+            viewport - `Viewport` object describing the part of the board to
+                draw
+        """
+        x_start, y_start, x_stop, y_stop = viewport.get_region()
+        if viewport.zoom != 1:
+            return self._draw_blocks(
+                board.get_block_populations(
+                    x_start,
+                    y_start,
+                    x_stop,
+                    y_stop,
+                    viewport.zoom
+                ),
+                viewport.zoom
+            )
+
+        can_draw_in_bulk = self._cell_lookup_table is not None and \
+            x_stop > x_start and y_stop > y_start
+        if can_draw_in_bulk:
+            return self._draw_in_bulk(
+                board.get_region_array(x_start, y_start, x_stop, y_stop)
+            )
+        return self._draw_region(board, x_start, y_start, x_stop, y_stop)
+
+    def _draw_region(self, board, x_start, y_start, x_stop, y_stop):
         rows = []
-        for y in xrange(board.y_size):
+        for y in xrange(y_start, y_stop):
             row = ' '.join(
-                self._draw_cell(board[x, y]) for x in xrange(board.x_size)
+                self.draw_cell(board[x, y]) for x in xrange(x_start, x_stop)
             )
             rows.append(row)
 
         return '\n'.join(rows)
 
-    def _draw_cell(self, is_live_cell):
+    def _draw_in_bulk(self, cells):
+        """Draws a (y_size, x_size) array of cells at once, by looking up the
+        bytes of every cell in `_cell_lookup_table` straight into a buffer
+        that is reused between calls.
+        """
+        cell_width = self._cell_lookup_table.shape[1]
+        shape = cells.shape + (cell_width,)
+        if self._buffer is None or self._buffer.shape != shape:
+            self._buffer = numpy.empty(shape, dtype=numpy.uint8)
+
+        numpy.take(self._cell_lookup_table, cells, axis=0, out=self._buffer)
+        # The space after the last cell of every row becomes its newline.
+        self._buffer[:, -1, -1] = ord('\n')
+        return self._buffer.tobytes()[:-1]
+
+    def _draw_blocks(self, populations, block_size):
+        glyph_count = len(self._density_glyphs)
+        block_area = block_size * block_size
+        # Rounding up shows any block with a live cell in it.
+        glyph_indexes = \
+            (populations * (glyph_count - 1) + block_area - 1) // block_area
+
+        glyphs = numpy.frombuffer(self._density_glyphs, dtype=numpy.uint8)
+        rows = numpy.empty(
+            (populations.shape[0], populations.shape[1] + 1),
+            dtype=numpy.uint8
+        )
+        rows[:, :-1] = glyphs[numpy.minimum(glyph_indexes, glyph_count - 1)]
+        rows[:, -1] = ord('\n')
+        return rows.tobytes()[:-1]
+
+    def draw_cell(self, is_live_cell):
+        """Returns the characters that represent a single cell"""
         if is_live_cell:
             return self._live_cell_character
         else:
             return self._dead_cell_character
+
+    def can_draw_cells_in_place(self):
+        """Returns `True` if live and dead cells are drawn with the same width,
+        so a single cell can be redrawn at `get_cell_position()` without
+        redrawing the rest of its row.
+        """
+        return len(self._live_cell_character) == \
+            len(self._dead_cell_character)
+
+    def get_cell_position(self, (x, y)):
+        """Returns the (row, column) where `draw()` puts the cell at (x, y).
+        Only meaningful if `can_draw_cells_in_place()`.
+        """
+        return y, x * self.get_cell_width()
+
+    def get_cell_width(self):
+        """Returns the number of columns every cell takes in `draw()`,
+        including the space that separates it from the next cell. Only
+        meaningful if `can_draw_cells_in_place()`.
+        """
+        return len(self._live_cell_character) + 1
+
+    def can_draw_blocks(self):
+        """Returns `True` if `draw_viewport()` can draw zoomed out viewports,
+        which requires NumPy.
+        """
+        return numpy is not None
@@ -1,2 +1,10 @@
 class InvalidBoardError(Exception):
     pass
+
+
+class CheckpointError(Exception):
+    pass
+
+
+class InvalidRuleError(InvalidBoardError):
+    pass
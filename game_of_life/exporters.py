@@ -0,0 +1,445 @@
+"""Exporters that turn the frames of a run into animated images and video.
+
+An exporter is an encoder for `animators.RecordingAnimator`, see
+`game_of_life.recording`, that writes one of `EXPORT_FORMATS`:
+
+    GIF - animated GIF that loops forever
+    APNG - animated PNG that loops forever. The number of frames goes in its
+        header, so it has to be known up front. Exports that end early have
+        it corrected once they end, if they are written to a file that can
+        seek.
+    Y4M - raw YUV4MPEG2 video, which video tools such as ffmpeg read
+
+Every cell is drawn as a `scale` x `scale` square of pixels. The pixels come
+straight from the cell arrays of `get_region_array()`, so only the window of
+boards on the infinite plane is exported. Each frame is encoded and written
+as soon as it's stepped to, keeping only the frame before it, so exports take
+constant memory however many frames they hold.
+
+GIF and APNG frames only hold the smallest rectangle of pixels that changed
+since the frame before. GIF frames are written without LZW compression, as a
+clear code after every two pixels, which any decoder reads but which takes
+4.5 bits a pixel. Real LZW compression is a per-pixel loop that would be far
+slower than the simulation in pure Python.
+"""
+import fractions
+import struct
+import zlib
+
+from game_of_life.dense_board import numpy
+
+GIF = 'gif'
+APNG = 'apng'
+Y4M = 'y4m'
+EXPORT_FORMATS = [GIF, APNG, Y4M]
+
+DEFAULT_SCALE = 1
+DEFAULT_FRAMES_PER_SECOND = 10.0
+# (red, green, blue) colors of the cells, dark cells on a light background.
+DEFAULT_LIVE_COLOR = (0, 0, 0)
+DEFAULT_DEAD_COLOR = (255, 255, 255)
+
+# GIF and PNG sizes are stored in 16 and 31 bit fields.
+_MAX_GIF_SIZE = 0xffff
+_MAX_PNG_SIZE = 0x7fffffff
+
+_GIF_MIN_CODE_SIZE = 2
+_GIF_CLEAR_CODE = 1 << _GIF_MIN_CODE_SIZE
+_GIF_END_CODE = _GIF_CLEAR_CODE + 1
+# Width of every code, which never grows since the code table is cleared
+# before the decoder adds its second entry.
+_GIF_CODE_WIDTH = _GIF_MIN_CODE_SIZE + 1
+_GIF_SUB_BLOCK_SIZE = 255
+# Graphics control extension disposal method leaving the frame in place for
+# the next one to be drawn over.
+_GIF_DO_NOT_DISPOSE = 1
+
+_PNG_SIGNATURE = '\x89PNG\r\n\x1a\n'
+_PNG_PALETTE_COLOR_TYPE = 3
+
+# Luma of live and dead cells in Y4M video, within the video range of 16 to
+# 235, and the luma weights of the red, green and blue of a color.
+_Y4M_MIN_LUMA = 16
+_Y4M_LUMA_RANGE = 219
+_Y4M_LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+_Y4M_NEUTRAL_CHROMA = 128
+
+
+def _scale_cells(cells, scale):
+    if scale == 1:
+        return cells
+    return cells.repeat(scale, axis=0).repeat(scale, axis=1)
+
+
+def _get_changed_region(cells, previous_cells):
+    """Returns the `(x_start, y_start, x_stop, y_stop)` of the smallest
+    rectangle holding the cells that differ between two frames, or `None` if
+    none do.
+    """
+    changed = cells != previous_cells
+    rows = numpy.flatnonzero(changed.any(axis=1))
+    if not len(rows):
+        return None
+    columns = numpy.flatnonzero(changed.any(axis=0))
+    return columns[0], rows[0], columns[-1] + 1, rows[-1] + 1
+
+
+class _ImageExporter(object):
+    """Base class of the exporters. Subclasses write the header, the frames
+    and the trailer of their format.
+    """
+
+    # Whether `encode()` uses the cells born and died of frames.
+    uses_step_diffs = False
+
+    _max_size = None
+
+    def __init__(
+        self,
+        scale=DEFAULT_SCALE,
+        frames_per_second=DEFAULT_FRAMES_PER_SECOND,
+        live_color=DEFAULT_LIVE_COLOR,
+        dead_color=DEFAULT_DEAD_COLOR
+    ):
+        """Creates an exporter.
+
+        Keyword Args:
+            scale - width and height in pixels of every cell
+            frames_per_second - number of frames shown every second when the
+                export is played
+            live_color - (red, green, blue) color of live cells
+            dead_color - (red, green, blue) color of dead cells
+        """
+        self._scale = scale
+        self._frames_per_second = frames_per_second
+        self._live_color = live_color
+        self._dead_color = dead_color
+        self._previous_cells = None
+
+    def get_header(self, board):
+        """Returns the bytes an export of `board` starts with.
+
+        Raises:
+            `ValueError` if the board is too large for the format at `scale`
+        """
+        self._width = board.x_size * self._scale
+        self._height = board.y_size * self._scale
+        too_large = self._max_size is not None and \
+            max(self._width, self._height) > self._max_size
+        if too_large:
+            raise ValueError(
+                'Frames of %ix%i pixels are too large' %
+                (self._width, self._height)
+            )
+        return self._get_header()
+
+    def encode(self, frame):
+        """Returns the bytes of `frame`, a `generations.Frame`."""
+        board = frame.board
+        cells = board.get_region_array(0, 0, board.x_size, board.y_size)
+        previous_cells = self._previous_cells
+        self._previous_cells = cells
+        return self._encode_cells(cells, previous_cells)
+
+    def get_trailer(self):
+        """Returns the bytes an export ends with."""
+        return ''
+
+    def get_header_updates(self):
+        """Returns a list of `(offset, data)` pairs of bytes of the header to
+        overwrite once the export ends, holding what is only known then.
+        """
+        return []
+
+    def _get_header(self):
+        raise NotImplementedError
+
+    def _encode_cells(self, cells, previous_cells):
+        raise NotImplementedError
+
+    def _get_frame_region(self, cells, previous_cells):
+        """Returns the `(x_start, y_start, x_stop, y_stop)` region of cells
+        to draw over the frame before. The first frame is drawn in full, and
+        frames without changes draw a single cell so that they still take
+        their time on screen.
+        """
+        if previous_cells is None:
+            return 0, 0, cells.shape[1], cells.shape[0]
+        region = _get_changed_region(cells, previous_cells)
+        if region is None:
+            return 0, 0, min(cells.shape[1], 1), min(cells.shape[0], 1)
+        return region
+
+
+class GifExporter(_ImageExporter):
+    """Exports animated GIFs, see the top of this module."""
+
+    _max_size = _MAX_GIF_SIZE
+
+    def _get_header(self):
+        # Flags a global color table of 2 colors.
+        screen_descriptor = struct.pack(
+            '<HHBBB',
+            self._width,
+            self._height,
+            0x80,
+            0,
+            0
+        )
+        color_table = struct.pack('6B', *self._dead_color + self._live_color)
+        loop_extension = '\x21\xff\x0bNETSCAPE2.0\x03\x01' + \
+            struct.pack('<H', 0) + '\x00'
+        return 'GIF89a' + screen_descriptor + color_table + loop_extension
+
+    def _encode_cells(self, cells, previous_cells):
+        x_start, y_start, x_stop, y_stop = self._get_frame_region(
+            cells,
+            previous_cells
+        )
+        pixels = _scale_cells(
+            cells[y_start:y_stop, x_start:x_stop],
+            self._scale
+        )
+        delay = max(int(round(100.0 / self._frames_per_second)), 1)
+        graphic_control_extension = struct.pack(
+            '<BBBBHBB',
+            0x21,
+            0xf9,
+            4,
+            _GIF_DO_NOT_DISPOSE << 2,
+            min(delay, 0xffff),
+            0,
+            0
+        )
+        image_descriptor = struct.pack(
+            '<BHHHHB',
+            0x2c,
+            x_start * self._scale,
+            y_start * self._scale,
+            pixels.shape[1],
+            pixels.shape[0],
+            0
+        )
+        return graphic_control_extension + image_descriptor + \
+            chr(_GIF_MIN_CODE_SIZE) + _encode_gif_pixels(pixels)
+
+    def get_trailer(self):
+        """Returns the bytes an export ends with."""
+        return ';'
+
+
+def _encode_gif_pixels(pixels):
+    """Returns the image data of an array of 0 and 1 pixels as GIF data sub
+    blocks, coded without compression, see the top of this module.
+    """
+    pixels = pixels.ravel()
+    pair_count, odd_pixel_count = divmod(len(pixels), 2)
+    # Every pair of pixels follows a clear code, and the end code comes last.
+    codes = numpy.empty(3 * pair_count + 2 * odd_pixel_count + 1, numpy.uint32)
+    pairs = codes[:3 * pair_count].reshape((-1, 3))
+    pairs[:, 0] = _GIF_CLEAR_CODE
+    pairs[:, 1:] = pixels[:2 * pair_count].reshape((-1, 2))
+    if odd_pixel_count:
+        codes[-3:-1] = _GIF_CLEAR_CODE, pixels[-1]
+    codes[-1] = _GIF_END_CODE
+
+    # Codes are packed starting from the least significant bit, eight codes
+    # filling three bytes.
+    padded_codes = numpy.zeros(-(-len(codes) // 8) * 8, dtype=numpy.uint32)
+    padded_codes[:len(codes)] = codes
+    shifts = _GIF_CODE_WIDTH * numpy.arange(8, dtype=numpy.uint32)
+    words = padded_codes.reshape((-1, 8)).dot(numpy.uint32(1) << shifts)
+    data_size = -(-len(codes) * _GIF_CODE_WIDTH // 8)
+    data = words.astype('<u4').view(numpy.uint8).reshape((-1, 4))[:, :3] \
+        .tobytes()[:data_size]
+
+    sub_blocks = [
+        chr(len(data[start:start + _GIF_SUB_BLOCK_SIZE])) +
+        data[start:start + _GIF_SUB_BLOCK_SIZE]
+        for start in xrange(0, len(data), _GIF_SUB_BLOCK_SIZE)
+    ]
+    sub_blocks.append('\x00')
+    return ''.join(sub_blocks)
+
+
+def _get_png_chunk(chunk_type, data):
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack(
+        '>I',
+        zlib.crc32(chunk_type + data) & 0xffffffff
+    )
+
+
+class ApngExporter(_ImageExporter):
+    """Exports animated PNGs, see the top of this module."""
+
+    _max_size = _MAX_PNG_SIZE
+
+    def __init__(self, frame_count, **kwargs):
+        """Creates an `ApngExporter` object.
+
+        Args:
+            frame_count - number of frames the export will hold. Exports
+                that end with another number of frames are corrected by
+                `get_header_updates()`.
+
+        Keyword Args:
+            see `GifExporter`
+        """
+        super(ApngExporter, self).__init__(**kwargs)
+        self._frame_count = frame_count
+        self._encoded_frame_count = 0
+        self._animation_control_offset = None
+        self._sequence_number = 0
+
+    def _get_header(self):
+        header = struct.pack(
+            '>IIBBBBB',
+            self._width,
+            self._height,
+            1,
+            _PNG_PALETTE_COLOR_TYPE,
+            0,
+            0,
+            0
+        )
+        palette = struct.pack('6B', *self._dead_color + self._live_color)
+        header = _PNG_SIGNATURE + _get_png_chunk('IHDR', header) + \
+            _get_png_chunk('PLTE', palette)
+        self._animation_control_offset = len(header)
+        return header + self._get_animation_control(self._frame_count)
+
+    def _get_animation_control(self, frame_count):
+        # The animation loops forever.
+        return _get_png_chunk('acTL', struct.pack('>II', frame_count, 0))
+
+    def _encode_cells(self, cells, previous_cells):
+        x_start, y_start, x_stop, y_stop = self._get_frame_region(
+            cells,
+            previous_cells
+        )
+        pixels = _scale_cells(
+            cells[y_start:y_stop, x_start:x_stop],
+            self._scale
+        )
+        # Every row starts with the byte of the "None" filter.
+        rows = numpy.zeros(
+            (pixels.shape[0], 1 + -(-pixels.shape[1] // 8)),
+            dtype=numpy.uint8
+        )
+        rows[:, 1:] = numpy.packbits(pixels, axis=1)
+        image_data = zlib.compress(rows.tobytes())
+
+        delay_denominator = 1000
+        delay_numerator = int(round(
+            delay_denominator / self._frames_per_second
+        ))
+        frame_control = struct.pack(
+            '>IIIIIHHBB',
+            self._get_sequence_number(),
+            pixels.shape[1],
+            pixels.shape[0],
+            x_start * self._scale,
+            y_start * self._scale,
+            min(delay_numerator, 0xffff),
+            delay_denominator,
+            0,
+            0
+        )
+        encoded_frame = _get_png_chunk('fcTL', frame_control)
+        self._encoded_frame_count += 1
+        # The first frame is also the image shown by decoders that don't
+        # support animation.
+        if previous_cells is None:
+            return encoded_frame + _get_png_chunk('IDAT', image_data)
+        return encoded_frame + _get_png_chunk(
+            'fdAT',
+            struct.pack('>I', self._get_sequence_number()) + image_data
+        )
+
+    def _get_sequence_number(self):
+        self._sequence_number += 1
+        return self._sequence_number - 1
+
+    def get_trailer(self):
+        """Returns the bytes an export ends with."""
+        return _get_png_chunk('IEND', '')
+
+    def get_header_updates(self):
+        """See `_ImageExporter.get_header_updates()`. Corrects the number of
+        frames of exports that were interrupted or ended early.
+        """
+        if self._encoded_frame_count == self._frame_count:
+            return []
+        return [(
+            self._animation_control_offset,
+            self._get_animation_control(self._encoded_frame_count)
+        )]
+
+
+class Y4mExporter(_ImageExporter):
+    """Exports raw YUV4MPEG2 video with 4:2:0 chroma subsampling, see the top
+    of this module.
+    """
+
+    def _get_header(self):
+        luma_levels = numpy.array(
+            [
+                _Y4M_MIN_LUMA + int(round(
+                    _Y4M_LUMA_RANGE *
+                    numpy.dot(_Y4M_LUMA_WEIGHTS, color) / 255.0
+                ))
+                for color in [self._dead_color, self._live_color]
+            ],
+            dtype=numpy.uint8
+        )
+        self._luma_levels = luma_levels
+        # The colors are shades of gray, so every frame has the same chroma.
+        chroma_size = -(-self._width // 2) * -(-self._height // 2)
+        self._chroma = chr(_Y4M_NEUTRAL_CHROMA) * (2 * chroma_size)
+
+        frame_rate = fractions.Fraction(self._frames_per_second) \
+            .limit_denominator(1001)
+        return 'YUV4MPEG2 W%i H%i F%i:%i Ip A1:1 C420jpeg\n' % (
+            self._width,
+            self._height,
+            frame_rate.numerator,
+            frame_rate.denominator
+        )
+
+    def _encode_cells(self, cells, previous_cells):
+        luma = _scale_cells(self._luma_levels[cells], self._scale)
+        return 'FRAME\n' + luma.tobytes() + self._chroma
+
+
+def create_exporter(
+    export_format,
+    frame_count=None,
+    scale=DEFAULT_SCALE,
+    frames_per_second=DEFAULT_FRAMES_PER_SECOND
+):
+    """Returns the exporter of `export_format`.
+
+    Args:
+        export_format - one of `EXPORT_FORMATS`
+
+    Keyword Args:
+        frame_count - number of frames the export will hold, needed by
+            `APNG`
+        scale - width and height in pixels of every cell
+        frames_per_second - number of frames shown every second when the
+            export is played
+
+    Raises:
+        `ValueError` if `export_format` isn't one of `EXPORT_FORMATS`, or
+            if it's `APNG` and `frame_count` is `None`
+    """
+    kwargs = dict(scale=scale, frames_per_second=frames_per_second)
+    if export_format == GIF:
+        return GifExporter(**kwargs)
+    elif export_format == APNG:
+        if frame_count is None:
+            raise ValueError('APNG exports need a frame count')
+        return ApngExporter(frame_count, **kwargs)
+    elif export_format == Y4M:
+        return Y4mExporter(**kwargs)
+    raise ValueError('Unsupported export format %r' % (export_format,))
@@ -0,0 +1,41 @@
+"""Picks the loader for a board file from its contents."""
+from game_of_life.binary_format import BinaryLoader
+from game_of_life.binary_format import is_binary_board_file
+from game_of_life.loader import StreamingLoader
+from game_of_life.loader import create_input_function_from_filename
+from game_of_life.pattern_formats import get_pattern_loader_cls
+
+
+def create_file_loader(
+    input_filename,
+    board_factory=None,
+    progress_function=None
+):
+    """Returns a loader for `input_filename`: a `BinaryLoader` for files in
+    the binary format, an `RleLoader` or a `Life106Loader` for patterns and a
+    `StreamingLoader` for boards of 0's and 1's.
+
+    Args:
+        input_filename - filename of the board file
+
+    Keyword Args:
+        board_factory - callable taking `(x_size, y_size, live_cells=...)`
+            that creates the board. Defaults to the default of every loader.
+        progress_function - callable that `StreamingLoader` reports its
+            progress to, see `StreamingLoader`
+    """
+    if is_binary_board_file(input_filename):
+        return BinaryLoader(input_filename, board_factory=board_factory)
+
+    pattern_loader_cls = get_pattern_loader_cls(input_filename)
+    if pattern_loader_cls:
+        return pattern_loader_cls(
+            create_input_function_from_filename(input_filename),
+            board_factory=board_factory
+        )
+
+    return StreamingLoader(
+        input_filename,
+        board_factory=board_factory,
+        progress_function=progress_function
+    )
@@ -0,0 +1,238 @@
+"""Lazy iteration over the generations of a board.
+
+`iterate_generations()` is the loop boards are driven with. It steps a board
+and yields a `Frame` every `stride` generations, from `start` until `stop`,
+snapshotting the board only for the frames it yields. The generations before
+`start` are skipped without snapshots or diffs, and boards that can jump
+several generations at once, such as `HashLifeBoard`, jump straight from one
+frame to the next. The board is only stepped as frames are asked for, so the
+frames compose with `itertools`, such as `itertools.islice()` or
+`itertools.takewhile()`, and nothing is stepped past the last frame taken.
+
+`prefetch_frames()` runs an iterator of frames on a worker thread instead,
+keeping the next few frames ready while the last one is being used.
+`simulation.Simulation` drives every animator this way.
+"""
+import collections
+import Queue
+import threading
+import time
+
+# Seconds between checks for the consumer going away while the prefetched
+# frames queue is full, and for `KeyboardInterrupt` while it's empty.
+_POLL_INTERVAL = 0.1
+
+# State of the board at `generation`. `board` is a snapshot that later steps
+# don't change, and `born_cells` and `died_cells` hold the cells that changed
+# since the previous frame.
+Frame = collections.namedtuple(
+    'Frame',
+    ['generation', 'board', 'born_cells', 'died_cells']
+)
+
+# Put in the prefetched frames queue once the frames run out.
+_END = object()
+
+
+def merge_step_diffs((born_cells, died_cells), (next_born, next_died)):
+    """Returns the `(born_cells, died_cells)` pair of `frozenset`s between the
+    start of a first diff and the end of the diff that follows it.
+    """
+    return (
+        (born_cells - next_died) | (next_born - died_cells),
+        (died_cells - next_born) | (next_died - born_cells)
+    )
+
+
+def advance_board(
+    board,
+    generation,
+    generation_count,
+    track_step_diffs=False,
+    hooks=None
+):
+    """Advances `board` from `generation` by `generation_count` generations.
+
+    Returns the `(born_cells, died_cells)` diff of the whole advance, or empty
+    `frozenset`s if diffs aren't tracked.
+
+    Args:
+        board - board object to advance
+        generation - generation the board is at
+        generation_count - number of generations to advance it by
+
+    Keyword Args:
+        track_step_diffs - if `True`, works out the diff of every step.
+            Building diffs often takes far longer than the step itself on
+            boards with a lot of activity.
+        hooks - `instrumentation.Hooks` object told about every step
+    """
+    step_diff = (frozenset(), frozenset())
+    # Boards that can jump several generations at once report the diff of the
+    # whole jump.
+    if hasattr(board, 'advance'):
+        start_time = time.time()
+        board.advance(generation_count)
+        if hooks is not None:
+            hooks.on_step(
+                board,
+                generation + generation_count,
+                time.time() - start_time
+            )
+        if track_step_diffs:
+            step_diff = board.get_step_diff()
+        return step_diff
+
+    for step in xrange(1, generation_count + 1):
+        if hooks is None:
+            board.step()
+        else:
+            start_time = time.time()
+            board.step()
+            hooks.on_step(board, generation + step, time.time() - start_time)
+        if track_step_diffs:
+            step_diff = merge_step_diffs(step_diff, board.get_step_diff())
+    return step_diff
+
+
+def iterate_generations(
+    board,
+    start=None,
+    stop=None,
+    stride=1,
+    first_generation=0,
+    track_step_diffs=False,
+    hooks=None
+):
+    """Returns an iterator over a `Frame` for generations `start`,
+    `start + stride` and so on up to but not including `stop`, see the top of
+    this module.
+
+    Args:
+        board - board object to step. It should not be used by anything else
+            while frames are taken.
+
+    Keyword Args:
+        start - generation of the first frame. Defaults to
+            `first_generation`.
+        stop - generation the frames stop before, or `None` to never stop
+        stride - number of generations between two frames
+        first_generation - generation the board is at
+        track_step_diffs - if `True`, the frames hold the cells born and died
+            since the previous frame. The first frame never does.
+        hooks - `instrumentation.Hooks` object told about every step
+
+    Raises:
+        `ValueError` if `stride` is less than 1 or `start` is before
+            `first_generation`
+    """
+    if stride < 1:
+        raise ValueError('The stride must be at least 1, not %s' % stride)
+    if start is None:
+        start = first_generation
+    elif start < first_generation:
+        raise ValueError(
+            'Generation %s is before the generation of the board, %s' %
+            (start, first_generation)
+        )
+    return _iterate_generations(
+        board,
+        start,
+        stop,
+        stride,
+        first_generation,
+        track_step_diffs,
+        hooks
+    )
+
+
+def _iterate_generations(
+    board,
+    start,
+    stop,
+    stride,
+    first_generation,
+    track_step_diffs,
+    hooks
+):
+    generation = first_generation
+    if start > generation:
+        advance_board(board, generation, start - generation, hooks=hooks)
+        generation = start
+
+    step_diff = (frozenset(), frozenset())
+    while stop is None or generation < stop:
+        yield Frame(generation, board.snapshot(), *step_diff)
+        if stop is not None and generation + stride >= stop:
+            return
+
+        step_diff = advance_board(
+            board,
+            generation,
+            stride,
+            track_step_diffs=track_step_diffs,
+            hooks=hooks
+        )
+        generation += stride
+
+
+def prefetch_frames(frames, count, hooks=None):
+    """Yields the items of `frames`, taking them on a worker thread that keeps
+    up to `count` of them ready ahead of the consumer.
+
+    The worker starts when the first frame is asked for and stops once the
+    returned iterator is exhausted or closed. Errors raised while taking the
+    frames are raised by the returned iterator.
+
+    Args:
+        frames - iterable of frames, such as `iterate_generations()`
+        count - number of frames taken ahead of the consumer
+
+    Keyword Args:
+        hooks - `instrumentation.Hooks` object the worker runs through, see
+            `Hooks.run()`
+    """
+    queue = Queue.Queue(count)
+    is_stopped = threading.Event()
+    errors = []
+
+    def put(item):
+        while not is_stopped.is_set():
+            try:
+                queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except Queue.Full:
+                continue
+        return False
+
+    def run():
+        try:
+            for frame in frames:
+                if not put(frame):
+                    return
+        except Exception as error:
+            errors.append(error)
+        put(_END)
+
+    if hooks is None:
+        thread = threading.Thread(target=run)
+    else:
+        thread = threading.Thread(target=hooks.run, args=(run,))
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            # Waiting with a timeout lets KeyboardInterrupt through.
+            try:
+                frame = queue.get(timeout=_POLL_INTERVAL)
+            except Queue.Empty:
+                continue
+            if frame is _END:
+                break
+            yield frame
+    finally:
+        is_stopped.set()
+        thread.join()
+
+    if errors:
+        raise errors[0]
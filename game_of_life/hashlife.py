@@ -0,0 +1,557 @@
+"""HashLife engine for jumping a board far into the future.
+
+The board is stored as a quadtree of canonical, immutable nodes: two nodes with
+the same contents are always the same object, so the result of advancing a
+node is computed once and memoized on it. A node of level `k` covers a
+2^k x 2^k square and can be advanced 2^(k-2) generations at once, which makes
+jumping 10^9 generations on periodic boards a matter of milliseconds.
+
+To keep the finite bounds that `Board` enforces, every cell outside of the
+board is a wall. Walls never come alive and count as dead neighbours, so the
+result is exactly what repeatedly calling `Board.step()` would give.
+"""
+import itertools
+
+from game_of_life import errors
+from game_of_life.board import BaseBoard
+from game_of_life.board import Board
+from game_of_life.board import numpy
+from game_of_life.rules import CONWAY
+from game_of_life.rules import parse_rule
+
+DEAD = 0
+ALIVE = 1
+WALL = 2
+
+# Number of canonical nodes above which the cache is garbage collected.
+DEFAULT_MAX_NODES = 1000000
+
+
+class _Node(object):
+    """Quadtree node. Leaves (level 0) hold a cell `state` instead of
+    children.
+    """
+
+    __slots__ = (
+        'level', 'nw', 'ne', 'sw', 'se', 'state', 'population', 'results'
+    )
+
+    def __init__(self, level, nw=None, ne=None, sw=None, se=None, state=DEAD):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.state = state
+        if level:
+            self.population = \
+                nw.population + ne.population + sw.population + se.population
+        else:
+            self.population = int(state == ALIVE)
+        self.results = None
+
+
+class NodeCache(object):
+    """Canonicalizes and memoizes quadtree nodes.
+
+    Once more than `max_nodes` nodes exist, `collect_garbage()` evicts every
+    node that isn't reachable from the nodes still in use, along with the
+    memoized results that point to evicted nodes. If more than half of the
+    nodes are still in use, the cache is only collected again once it has
+    doubled in size, so that it isn't collected over and over. The results
+    are only valid for `rule`, so boards can only share a cache if they're
+    stepped with the same rule.
+    """
+
+    def __init__(self, max_nodes=DEFAULT_MAX_NODES, rule=CONWAY):
+        self.max_nodes = max_nodes
+        self.rule = parse_rule(rule)
+        self._leaves = dict(
+            (state, _Node(0, state=state)) for state in (DEAD, ALIVE, WALL)
+        )
+        self._nodes = {}
+        self._uniform_nodes = {}
+        self._node_limit = max_nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def leaf(self, state):
+        return self._leaves[state]
+
+    def join(self, nw, ne, sw, se):
+        """Returns the canonical node with the four given children."""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = _Node(nw.level + 1, nw, ne, sw, se)
+            self._nodes[key] = node
+        return node
+
+    def uniform(self, state, level):
+        """Returns the node of `level` whose cells are all `state`."""
+        key = (state, level)
+        node = self._uniform_nodes.get(key)
+        if node is None:
+            if level:
+                child = self.uniform(state, level - 1)
+                node = self.join(child, child, child, child)
+            else:
+                node = self.leaf(state)
+            self._uniform_nodes[key] = node
+        return node
+
+    def is_full(self):
+        return len(self._nodes) > self._node_limit
+
+    def _is_kept(self, node, nodes):
+        return not node.level or \
+            nodes.get((node.nw, node.ne, node.sw, node.se)) is node
+
+    def collect_garbage(self, roots):
+        """Evicts every node that is not reachable from `roots`. Memoized
+        results are kept unless they are evicted nodes.
+        """
+        nodes = {}
+        to_visit = [root for root in roots if root.level]
+        while to_visit:
+            node = to_visit.pop()
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in nodes:
+                continue
+            nodes[key] = node
+            if node.level > 1:
+                to_visit.extend(key)
+
+        for node in nodes.itervalues():
+            if node.results:
+                node.results = dict(
+                    (power, result)
+                    for power, result in node.results.iteritems()
+                    if self._is_kept(result, nodes)
+                )
+        self._uniform_nodes = dict(
+            (key, node) for key, node in self._uniform_nodes.iteritems()
+            if self._is_kept(node, nodes)
+        )
+        self._nodes = nodes
+        self._node_limit = max(self.max_nodes, 2 * len(nodes))
+
+
+class HashLifeBoard(BaseBoard):
+    """Game of Life board backed by HashLife.
+
+    It has the same interface as `Board`, plus `advance()` to jump many
+    generations at once.
+    """
+
+    def __init__(
+        self,
+        x_size,
+        y_size,
+        live_cells=(),
+        node_cache=None,
+        rule=CONWAY
+    ):
+        """Creates a new `HashLifeBoard` object.
+
+        Args:
+            x_size - integer describing the size of the x dimension
+            y_size - integer describing the size of the y dimension
+
+        Keyword Args:
+            live_cells - iterable of (x, y) integer pairs representing live
+                cells on the `HashLifeBoard` object.
+            node_cache - `NodeCache` to share between boards. Defaults to a
+                new cache holding at most `DEFAULT_MAX_NODES` nodes.
+            rule - rule the board is stepped with, see `Board`
+
+        Raises:
+            `ValueError` if `node_cache` memoizes another rule
+        """
+        self.x_size = x_size
+        self.y_size = y_size
+        self.rule = parse_rule(rule)
+        # An empty cache is falsy, so it's compared to `None`.
+        self._cache = NodeCache(rule=self.rule) if node_cache is None \
+            else node_cache
+        if self._cache.rule != self.rule:
+            raise ValueError(
+                'Node cache for %s used with %s' %
+                (self._cache.rule, self.rule)
+            )
+        self._transitions = self.rule.table
+
+        live_cells = list(live_cells)
+        for (x, y) in live_cells:
+            if not (0 <= x < x_size and 0 <= y < y_size):
+                raise errors.InvalidBoardError
+
+        # The root is centred on the origin and the board has to fit in the
+        # centre half of the root, which is what advancing it returns.
+        level = 2
+        while 1 << (level - 2) < max(x_size, y_size):
+            level += 1
+        half_size = 1 << (level - 1)
+        self._root = self._build(level, -half_size, -half_size, live_cells)
+        self._previous_root = self._root
+        # Nodes in use by every `_advance_recursively()` call under way, which
+        # outlive garbage collections deeper in the recursion.
+        self._frames = []
+
+    @classmethod
+    def from_board(cls, board, node_cache=None):
+        """Creates a `HashLifeBoard` holding the same state as `board`."""
+        return cls(
+            board.x_size,
+            board.y_size,
+            board.get_live_cells(),
+            node_cache=node_cache,
+            rule=board.rule
+        )
+
+    def to_board(self):
+        """Returns a set based `Board` holding the same state as `self`."""
+        return Board(
+            self.x_size,
+            self.y_size,
+            self.get_live_cells(),
+            rule=self.rule
+        )
+
+    def snapshot(self):
+        """See `BaseBoard.snapshot()`. Nodes are immutable, so the snapshot
+        shares the quadtree and the node cache.
+        """
+        board = HashLifeBoard(
+            self.x_size,
+            0,
+            node_cache=self._cache,
+            rule=self.rule
+        )
+        board.y_size = self.y_size
+        board._root = board._previous_root = self._root
+        return board
+
+    def _build(self, level, x, y, live_cells):
+        size = 1 << level
+        is_outside = x >= self.x_size or y >= self.y_size or \
+            x + size <= 0 or y + size <= 0
+        if is_outside:
+            return self._cache.uniform(WALL, level)
+
+        is_inside = x >= 0 and y >= 0 and \
+            x + size <= self.x_size and y + size <= self.y_size
+        if is_inside and not live_cells:
+            return self._cache.uniform(DEAD, level)
+
+        if not level:
+            return self._cache.leaf(ALIVE if live_cells else DEAD)
+
+        half = size // 2
+        quadrants = [[], [], [], []]
+        for (cell_x, cell_y) in live_cells:
+            index = (cell_x >= x + half) + 2 * (cell_y >= y + half)
+            quadrants[index].append((cell_x, cell_y))
+        nw, ne, sw, se = quadrants
+
+        return self._cache.join(
+            self._build(level - 1, x, y, nw),
+            self._build(level - 1, x + half, y, ne),
+            self._build(level - 1, x, y + half, sw),
+            self._build(level - 1, x + half, y + half, se)
+        )
+
+    def __getitem__(self, (x, y)):
+        """Gets the current status of a particular cell, returning `True` if
+        the cell is alive and `False` if it is not.
+
+        Args:
+            cell - (x, y) integer tuple representing the position to check
+        """
+        if not (0 <= x < self.x_size and 0 <= y < self.y_size):
+            return False
+
+        node = self._root
+        half = 1 << (node.level - 1)
+        x += half
+        y += half
+        while node.level:
+            if not node.population:
+                return False
+            half = 1 << (node.level - 1)
+            is_east = x >= half
+            is_south = y >= half
+            node = (
+                (node.nw, node.ne),
+                (node.sw, node.se)
+            )[is_south][is_east]
+            x -= half * is_east
+            y -= half * is_south
+        return node.state == ALIVE
+
+    def get_population(self):
+        """Returns the number of live cells on the board."""
+        return self._root.population
+
+    def get_live_cells(self):
+        """Returns a `frozenset` of the (x, y) integer pairs that are alive."""
+        return self._get_live_cells(self._root)
+
+    def get_step_diff(self):
+        """Returns a `(born_cells, died_cells)` pair of `frozenset`s holding
+        the cells that came alive and the cells that died in the last
+        `step()` or `advance()`. Both are empty before the board is first
+        stepped.
+        """
+        if self._root is self._previous_root:
+            return frozenset(), frozenset()
+
+        live_cells = self._get_live_cells(self._root)
+        previous_live_cells = self._get_live_cells(self._previous_root)
+        return (
+            live_cells - previous_live_cells,
+            previous_live_cells - live_cells
+        )
+
+    def get_block_populations(
+        self,
+        x_start,
+        y_start,
+        x_stop,
+        y_stop,
+        block_size
+    ):
+        """See `BaseBoard.get_block_populations()`.
+
+        Blocks whose size is a power of two and that are aligned to it are
+        read straight off the populations of the nodes, so the cost depends on
+        the number of blocks rather than on the number of cells.
+        """
+        level = block_size.bit_length() - 1
+        is_aligned = block_size == 1 << level and \
+            level <= self._root.level and \
+            not x_start % block_size and not y_start % block_size and \
+            (not x_stop % block_size or x_stop >= self.x_size) and \
+            (not y_stop % block_size or y_stop >= self.y_size)
+        if not is_aligned:
+            return super(HashLifeBoard, self).get_block_populations(
+                x_start,
+                y_start,
+                x_stop,
+                y_stop,
+                block_size
+            )
+
+        populations = numpy.zeros(
+            (
+                -(-(y_stop - y_start) // block_size),
+                -(-(x_stop - x_start) // block_size)
+            ),
+            dtype=numpy.intp
+        )
+        half = 1 << (self._root.level - 1)
+        to_visit = [(self._root, -half, -half)]
+        while to_visit:
+            node, x, y = to_visit.pop()
+            size = 1 << node.level
+            is_outside = x >= x_stop or y >= y_stop or \
+                x + size <= x_start or y + size <= y_start
+            if is_outside or not node.population:
+                continue
+            if node.level == level:
+                populations[
+                    (y - y_start) // block_size,
+                    (x - x_start) // block_size
+                ] = node.population
+                continue
+            half = size // 2
+            to_visit.extend([
+                (node.nw, x, y),
+                (node.ne, x + half, y),
+                (node.sw, x, y + half),
+                (node.se, x + half, y + half),
+            ])
+        return populations
+
+    def _get_live_cells_in_region(self, x_start, y_start, x_stop, y_stop):
+        return self._get_live_cells(
+            self._root,
+            region=(x_start, y_start, x_stop, y_stop)
+        )
+
+    def _get_live_cells(self, root, region=None):
+        """Returns the live cells of `root`, skipping the nodes outside of
+        `region`, a (x_start, y_start, x_stop, y_stop) tuple, if given.
+        """
+        live_cells = []
+        half = 1 << (root.level - 1)
+        to_visit = [(root, -half, -half)]
+        while to_visit:
+            node, x, y = to_visit.pop()
+            if not node.population:
+                continue
+            if region is not None:
+                x_start, y_start, x_stop, y_stop = region
+                size = 1 << node.level
+                if x >= x_stop or y >= y_stop or \
+                        x + size <= x_start or y + size <= y_start:
+                    continue
+            if not node.level:
+                live_cells.append((x, y))
+                continue
+            half = 1 << (node.level - 1)
+            to_visit.extend([
+                (node.nw, x, y),
+                (node.ne, x + half, y),
+                (node.sw, x, y + half),
+                (node.se, x + half, y + half),
+            ])
+        return frozenset(live_cells)
+
+    def step(self):
+        """Steps the game board using the same rules as `Board.step()`."""
+        self.advance(1)
+
+    def advance(self, generations):
+        """Advances the board `generations` steps, jumping by the largest
+        power of two that is left at every iteration.
+
+        Args:
+            generations - non negative number of generations to advance
+        """
+        self._previous_root = self._root
+        self._frames = []
+        while generations > 0:
+            power = generations.bit_length() - 1
+            while self._root.level < power + 2:
+                self._root = self._expand(self._root)
+            self._root = self._expand(self._advance(self._root, power))
+            generations -= 1 << power
+
+            if self._cache.is_full():
+                self._collect_garbage()
+
+    def _collect_garbage(self):
+        self._cache.collect_garbage(itertools.chain(
+            [self._root, self._previous_root],
+            *self._frames
+        ))
+
+    def _expand(self, node):
+        """Surrounds `node` with walls, returning a node twice as big that has
+        `node` in its centre.
+        """
+        wall = self._cache.uniform(WALL, node.level - 1)
+        join = self._cache.join
+        return join(
+            join(wall, wall, wall, node.nw),
+            join(wall, wall, node.ne, wall),
+            join(wall, node.sw, wall, wall),
+            join(node.se, wall, wall, wall)
+        )
+
+    def _centre(self, node):
+        return self._cache.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _advance(self, node, power):
+        """Returns the centre half of `node` advanced 2^`power` generations,
+        where `power` is at most `node.level - 2`.
+        """
+        # Without live cells nothing can change, walls included.
+        if not node.population:
+            return self._centre(node)
+
+        if node.results is not None:
+            result = node.results.get(power)
+            if result is not None:
+                return result
+
+        if node.level == 2:
+            result = self._advance_level_2(node)
+        else:
+            result = self._advance_recursively(node, power)
+
+        # Garbage collections in the recursion can replace the results.
+        if node.results is None:
+            node.results = {}
+        node.results[power] = result
+        return result
+
+    def _advance_recursively(self, node, power):
+        """Same as `_advance()` for nodes above level 2. The cache is
+        collected as soon as it's full, keeping every node that this call and
+        the ones above it still need.
+        """
+        frame = [node]
+        self._frames.append(frame)
+        if self._cache.is_full():
+            self._collect_garbage()
+
+        join = self._cache.join
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        sub_nodes = [
+            nw,
+            join(nw.ne, ne.nw, nw.se, ne.sw),
+            ne,
+            join(nw.sw, nw.se, sw.nw, sw.ne),
+            join(nw.se, ne.sw, sw.ne, se.nw),
+            join(ne.sw, ne.se, se.nw, se.ne),
+            sw,
+            join(sw.ne, se.nw, sw.se, se.sw),
+            se,
+        ]
+        frame.extend(sub_nodes)
+
+        # At full speed both halves of the jump advance 2^(power - 1)
+        # generations, otherwise only the second half advances at all.
+        is_full_speed = power == node.level - 2
+        inner_power = power - 1 if is_full_speed else power
+        c = []
+        for sub_node in sub_nodes:
+            if is_full_speed:
+                c.append(self._advance(sub_node, inner_power))
+            else:
+                c.append(self._centre(sub_node))
+            frame.append(c[-1])
+
+        quadrants = []
+        for i in [0, 1, 3, 4]:
+            quadrant = join(c[i], c[i + 1], c[i + 3], c[i + 4])
+            frame.append(quadrant)
+            quadrants.append(self._advance(quadrant, inner_power))
+            frame.append(quadrants[-1])
+
+        self._frames.pop()
+        return join(*quadrants)
+
+    def _advance_level_2(self, node):
+        states = [[DEAD] * 4 for _ in xrange(4)]
+        for child, x, y in [
+            (node.nw, 0, 0), (node.ne, 2, 0), (node.sw, 0, 2), (node.se, 2, 2)
+        ]:
+            states[y][x] = child.nw.state
+            states[y][x + 1] = child.ne.state
+            states[y + 1][x] = child.sw.state
+            states[y + 1][x + 1] = child.se.state
+
+        leaves = []
+        for y in (1, 2):
+            for x in (1, 2):
+                leaves.append(self._cache.leaf(self._next_state(states, x, y)))
+        return self._cache.join(*leaves)
+
+    def _next_state(self, states, x, y):
+        state = states[y][x]
+        if state == WALL:
+            return WALL
+
+        live_neighbours = sum(
+            states[y + y_offset][x + x_offset] == ALIVE
+            for x_offset in (-1, 0, 1)
+            for y_offset in (-1, 0, 1)
+            if x_offset or y_offset
+        )
+        if self._transitions[(state == ALIVE) * 9 + live_neighbours]:
+            return ALIVE
+        return DEAD
@@ -0,0 +1,234 @@
+"""Bounded store of the past generations of a run.
+
+A `History` is fed the frames of a run in order. It keeps a full keyframe
+every `keyframe_interval` generations and, for the frames in between, only the
+cells that were born and died since the frame before, which take a fraction of
+the memory of whole boards on all but the most chaotic runs. A keyframe and
+the deltas that follow it make up a segment.
+
+Any stored generation is rebuilt by replaying the deltas of its segment on top
+of its keyframe. Once the estimated size of the store grows past `max_bytes`,
+whole segments are evicted, least recently used first, leaving holes in the
+history rather than cutting it at the start.
+"""
+import bisect
+import collections
+
+from game_of_life.board import INFINITE
+from game_of_life.board import Board
+from game_of_life.dense_board import DenseBoard
+from game_of_life.dense_board import numpy
+
+DEFAULT_KEYFRAME_INTERVAL = 64
+DEFAULT_MAX_BYTES = 64 << 20
+
+# Rough number of bytes taken by a cell held in a set, counting the (x, y)
+# tuple and its slot in the set.
+_CELL_BYTES = 100
+
+
+class _Segment(object):
+    """A keyframe and the `(generation, born_cells, died_cells)` deltas of
+    the generations that follow it.
+    """
+
+    def __init__(self, generation, keyframe):
+        self.generation = generation
+        self.keyframe = keyframe
+        self.deltas = []
+        self.size = _get_board_bytes(keyframe)
+
+    def get_generations(self):
+        return [self.generation] + [delta[0] for delta in self.deltas]
+
+
+def _get_board_bytes(board):
+    """Returns an estimate of the memory taken by a board."""
+    if hasattr(board, 'get_words'):
+        return board.get_words().nbytes
+    elif isinstance(board, DenseBoard):
+        return board.to_array().nbytes
+    return board.get_population() * _CELL_BYTES
+
+
+class History(object):
+    """Keyframes and deltas of the generations of a run, see the top of this
+    module.
+    """
+
+    def __init__(
+        self,
+        keyframe_interval=DEFAULT_KEYFRAME_INTERVAL,
+        max_bytes=DEFAULT_MAX_BYTES
+    ):
+        """Creates an empty `History` object.
+
+        Keyword Args:
+            keyframe_interval - number of generations between two keyframes.
+                Larger intervals save memory but make rebuilding generations
+                slower.
+            max_bytes - estimated size above which the least recently used
+                segments are evicted. The segment being recorded is never
+                evicted.
+        """
+        self._keyframe_interval = keyframe_interval
+        self._max_bytes = max_bytes
+        self._segments_by_generation = {}
+        self._segment_generations = []
+        # Segments from the least to the most recently used.
+        self._recently_used = collections.OrderedDict()
+        self._last_segment = None
+        self._last_generation = None
+        self.size = 0
+
+    def record(self, generation, board, born_cells, died_cells):
+        """Stores the generation after the last recorded one.
+
+        Args:
+            generation - generation of `board`, later than the last recorded
+                generation
+            board - board object that isn't changed any more, such as a
+                snapshot
+            born_cells - cells born since the last recorded generation
+            died_cells - cells that died since the last recorded generation
+
+        Raises:
+            `ValueError` if `generation` isn't later than the last recorded
+                generation
+        """
+        if self._last_generation is not None and \
+                generation <= self._last_generation:
+            raise ValueError(
+                'Generation %s recorded after generation %s' %
+                (generation, self._last_generation)
+            )
+
+        segment = self._last_segment
+        needs_keyframe = segment is None or \
+            generation - segment.generation >= self._keyframe_interval
+        if needs_keyframe:
+            segment = _Segment(generation, board)
+            self._segments_by_generation[generation] = segment
+            self._segment_generations.append(generation)
+            self._last_segment = segment
+            self.size += segment.size
+        else:
+            born_cells = frozenset(born_cells)
+            died_cells = frozenset(died_cells)
+            segment.deltas.append((generation, born_cells, died_cells))
+            delta_size = (len(born_cells) + len(died_cells)) * _CELL_BYTES
+            segment.size += delta_size
+            self.size += delta_size
+
+        self._last_generation = generation
+        self._touch(segment)
+        self._evict()
+
+    def get_generations(self):
+        """Returns the sorted list of the stored generations."""
+        generations = []
+        for segment_generation in self._segment_generations:
+            generations.extend(
+                self._segments_by_generation[segment_generation]
+                .get_generations()
+            )
+        return generations
+
+    def get_previous_generation(self, generation):
+        """Returns the latest stored generation before `generation`, or
+        `None` if there is none.
+        """
+        generations = self.get_generations()
+        index = bisect.bisect_left(generations, generation)
+        return generations[index - 1] if index else None
+
+    def get_next_generation(self, generation):
+        """Returns the earliest stored generation after `generation`, or
+        `None` if there is none.
+        """
+        generations = self.get_generations()
+        index = bisect.bisect_right(generations, generation)
+        return generations[index] if index < len(generations) else None
+
+    def __contains__(self, generation):
+        segment = self._find_segment(generation)
+        return segment is not None and \
+            generation in segment.get_generations()
+
+    def get_board(self, generation):
+        """Returns a board holding a stored generation, rebuilt from the
+        keyframe before it.
+
+        Raises:
+            `KeyError` if `generation` isn't stored
+        """
+        segment = self._find_segment(generation)
+        if segment is None or generation not in segment.get_generations():
+            raise KeyError(generation)
+
+        self._touch(segment)
+        if generation == segment.generation:
+            return segment.keyframe
+
+        deltas = [
+            (born_cells, died_cells)
+            for delta_generation, born_cells, died_cells in segment.deltas
+            if delta_generation <= generation
+        ]
+        keyframe = segment.keyframe
+        # Arrays only hold the window of boards on the infinite plane.
+        if numpy is None or isinstance(keyframe, Board) or \
+                keyframe.topology == INFINITE:
+            return _replay_on_live_cells(keyframe, deltas)
+        return _replay_on_array(keyframe, deltas)
+
+    def _find_segment(self, generation):
+        index = bisect.bisect_right(self._segment_generations, generation)
+        if not index:
+            return None
+        return self._segments_by_generation[
+            self._segment_generations[index - 1]
+        ]
+
+    def _touch(self, segment):
+        self._recently_used.pop(segment.generation, None)
+        self._recently_used[segment.generation] = segment
+
+    def _evict(self):
+        while self.size > self._max_bytes and len(self._recently_used) > 1:
+            generation, segment = self._recently_used.popitem(last=False)
+            if segment is self._last_segment:
+                self._touch(segment)
+                continue
+
+            del self._segments_by_generation[generation]
+            self._segment_generations.remove(generation)
+            self.size -= segment.size
+
+
+def _replay_on_live_cells(keyframe, deltas):
+    live_cells = set(keyframe.get_live_cells())
+    for born_cells, died_cells in deltas:
+        live_cells -= died_cells
+        live_cells |= born_cells
+    return Board(
+        keyframe.x_size,
+        keyframe.y_size,
+        live_cells=live_cells,
+        topology=keyframe.topology,
+        rule=keyframe.rule
+    )
+
+
+def _replay_on_array(keyframe, deltas):
+    cells = numpy.array(keyframe.to_array(), dtype=numpy.uint8)
+    for born_cells, died_cells in deltas:
+        for changed_cells, value in [(died_cells, 0), (born_cells, 1)]:
+            if changed_cells:
+                xs, ys = zip(*changed_cells)
+                cells[list(ys), list(xs)] = value
+    return DenseBoard.from_array(
+        cells,
+        topology=keyframe.topology,
+        rule=keyframe.rule
+    )
@@ -0,0 +1,102 @@
+from game_of_life.board import BOUNDED
+from game_of_life.board import Board
+from game_of_life.rules import CONWAY
+
+
+class IncrementalBoard(Board):
+    """`Board` that only re-evaluates the cells next to the cells that changed
+    in the previous step.
+
+    The number of live neighbours of every cell is kept up to date with +1/-1
+    updates as cells are born and die, so the cost of a step scales with the
+    activity on the board instead of with its population. Boards that have
+    mostly settled into still lifes step almost for free.
+    """
+
+    def __init__(
+        self,
+        x_size,
+        y_size,
+        live_cells=(),
+        topology=BOUNDED,
+        rule=CONWAY
+    ):
+        """Creates a new `IncrementalBoard` object.
+
+        Args:
+            x_size - integer describing the size of the x dimension
+            y_size - integer describing the size of the y dimension
+
+        Keyword Args:
+            live_cells - iterable of (x, y) integer pairs representing live
+                cells on the `IncrementalBoard` object.
+            topology - one of `board.TOPOLOGIES`, see `Board`
+            rule - rule the board is stepped with, see `Board`
+        """
+        super(IncrementalBoard, self).__init__(
+            x_size,
+            y_size,
+            live_cells=live_cells,
+            topology=topology,
+            rule=rule
+        )
+        self._neighbour_counts = {}
+        for cell in self._live_cells:
+            self._update_neighbour_counts(cell, 1)
+
+        # Compared to an empty board every live cell has just changed.
+        self._changed_cells = set(self._live_cells)
+
+    def step(self):
+        """Steps the game board using the same rules as `Board.step()`, and
+        updates `statistics` if they are tracked.
+
+        A cell can only change if it or one of its neighbours changed in the
+        previous step, so only those cells are evaluated.
+        """
+        born_cells = []
+        died_cells = []
+        cells_with_potential_updates = self._get_cells_with_potential_updates()
+        self.candidate_count = len(cells_with_potential_updates)
+        for cell in cells_with_potential_updates:
+            is_alive = cell in self._live_cells
+            if self._should_cell_be_alive_in_next_step(cell) != is_alive:
+                if is_alive:
+                    died_cells.append(cell)
+                else:
+                    born_cells.append(cell)
+
+        for cell in born_cells:
+            self._live_cells.add(cell)
+            self._update_neighbour_counts(cell, 1)
+        for cell in died_cells:
+            self._live_cells.remove(cell)
+            self._update_neighbour_counts(cell, -1)
+
+        self._changed_cells = set(born_cells)
+        self._changed_cells.update(died_cells)
+        self._step_diff = (frozenset(born_cells), frozenset(died_cells))
+        if self.statistics is not None:
+            self.statistics.update(born_cells, died_cells)
+
+    def _get_cells_with_potential_updates(self):
+        cells_with_potential_updates = set([])
+        for changed_cell in self._changed_cells:
+            cells_with_potential_updates.update(
+                self._get_cells_in_proximity(changed_cell)
+            )
+        return cells_with_potential_updates
+
+    def _should_cell_be_alive_in_next_step(self, cell):
+        is_alive = cell in self._live_cells
+        live_neighbours = self._neighbour_counts.get(cell, 0)
+        return self._transitions[is_alive * 9 + live_neighbours]
+
+    def _update_neighbour_counts(self, cell, delta):
+        neighbour_counts = self._neighbour_counts
+        for neighbour in self._get_neighbours(cell):
+            count = neighbour_counts.get(neighbour, 0) + delta
+            if count:
+                neighbour_counts[neighbour] = count
+            else:
+                del neighbour_counts[neighbour]
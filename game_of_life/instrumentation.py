@@ -0,0 +1,213 @@
+"""Hooks that let the runner, the simulation and the animators report where
+the time of a run goes.
+
+`GameOfLifeRunner`, `Simulation` and the animators take an optional `hooks`
+object, a `Hooks` subclass, and call it after every phase of a run: loading
+the board, stepping it and rendering a frame. When no hooks are passed in,
+nothing is timed at all, so instrumentation costs nothing unless it's used.
+
+`Profiler` is the hooks used by `game_of_life_runner.py --profile`,
+`--profile-cpu` and `--heatmap`. It writes a time series with a row per phase,
+including the statistics of boards that can track them, and can run every
+thread of the run under `cProfile`.
+"""
+import cProfile
+import csv
+import pstats
+import resource
+import threading
+import time
+
+LOAD = 'load'
+STEP = 'step'
+RENDER = 'render'
+
+PROFILE_FIELDS = [
+    'time', 'phase', 'generation', 'seconds', 'population', 'candidates',
+    'births', 'deaths', 'x_start', 'y_start', 'x_stop', 'y_stop',
+    'output_bytes', 'peak_rss_kb'
+]
+
+HEATMAP_FIELDS = ['x', 'y', 'changes']
+
+
+class Hooks(object):
+    """Hooks that do nothing. Subclasses override the phases they care
+    about.
+    """
+
+    def run(self, function, *args):
+        """Runs `function(*args)` and returns its result. Every thread of a
+        run does all of its work through `run()`, so subclasses can wrap it.
+        """
+        return function(*args)
+
+    def on_load(self, board, seconds):
+        """Called once the board has been loaded.
+
+        Args:
+            board - the loaded board object
+            seconds - time it took to load it
+        """
+
+    def on_step(self, board, generation, seconds):
+        """Called after the board was stepped.
+
+        Args:
+            board - the stepped board object
+            generation - generation the board is at. Boards that jump several
+                generations at once only report the last one.
+            seconds - time it took to get there from the generation reported
+                before
+        """
+
+    def on_render(self, generation, seconds, output_bytes):
+        """Called after a frame was drawn and written to the terminal.
+
+        Args:
+            generation - generation of the frame
+            seconds - time it took to draw and write it
+            output_bytes - number of characters written
+        """
+
+    def on_finish(self):
+        """Called once the run is over, however it ended."""
+
+
+class Profiler(Hooks):
+    """`Hooks` that write a row with the fields in `PROFILE_FIELDS` for every
+    phase to a CSV time series, and optionally profile the run with
+    `cProfile`.
+
+    `candidates` is the number of cells the board considered in its last
+    step, for boards that keep a `candidate_count`, and `peak_rss_kb` the
+    peak resident set size of the process so far. For boards that support
+    `track_statistics()`, `births` and `deaths` are counted in the last step
+    and `x_start` to `y_stop` is the bounding box of the live cells, see
+    `analytics.Statistics`.
+    """
+
+    def __init__(
+        self,
+        output_file=None,
+        cpu_stats_filename=None,
+        heatmap_file=None
+    ):
+        """Creates a `Profiler` object.
+
+        Keyword Args:
+            output_file - file object the time series is written to. If
+                `None`, no time series is written.
+            cpu_stats_filename - if given, every thread of the run is
+                profiled with `cProfile` and the merged statistics are written
+                to this file when the run finishes, in the format read by
+                `pstats.Stats`
+            heatmap_file - file object a CSV with the `HEATMAP_FIELDS` of
+                every cell that was born or died is written to when the run
+                finishes, for boards that support `track_statistics()`
+        """
+        self._writer = None
+        if output_file is not None:
+            self._writer = csv.DictWriter(output_file, PROFILE_FIELDS)
+            self._writer.writeheader()
+        self._cpu_stats_filename = cpu_stats_filename
+        self._cpu_profiles = []
+        self._heatmap_file = heatmap_file
+        self._statistics = None
+        self._lock = threading.Lock()
+        self._start_time = time.time()
+
+    def run(self, function, *args):
+        """See `Hooks.run()`."""
+        if self._cpu_stats_filename is None:
+            return function(*args)
+
+        # `cProfile` only profiles the thread it was enabled on.
+        cpu_profile = cProfile.Profile()
+        self._cpu_profiles.append(cpu_profile)
+        return cpu_profile.runcall(function, *args)
+
+    def on_finish(self):
+        """See `Hooks.on_finish()`."""
+        if self._cpu_profiles:
+            pstats.Stats(*self._cpu_profiles).dump_stats(
+                self._cpu_stats_filename
+            )
+        if self._heatmap_file is not None and self._statistics is not None:
+            writer = csv.writer(self._heatmap_file)
+            writer.writerow(HEATMAP_FIELDS)
+            heatmap = self._statistics.get_heatmap()
+            for x, y in sorted(heatmap, key=lambda (x, y): (y, x)):
+                writer.writerow([x, y, heatmap[x, y]])
+
+    def on_load(self, board, seconds):
+        """See `Hooks.on_load()`. Starts tracking the statistics of the board
+        if they're written anywhere.
+        """
+        if self._writer is not None or self._heatmap_file is not None:
+            try:
+                self._statistics = board.track_statistics()
+            except NotImplementedError:
+                pass
+        if self._writer is None:
+            return
+
+        self._write_row(
+            LOAD,
+            seconds,
+            generation=0,
+            population=board.get_population(),
+            **self._get_statistics_fields()
+        )
+
+    def on_step(self, board, generation, seconds):
+        """See `Hooks.on_step()`."""
+        if self._writer is None:
+            return
+
+        self._write_row(
+            STEP,
+            seconds,
+            generation=generation,
+            population=board.get_population(),
+            candidates=getattr(board, 'candidate_count', None),
+            **self._get_statistics_fields()
+        )
+
+    def on_render(self, generation, seconds, output_bytes):
+        """See `Hooks.on_render()`."""
+        if self._writer is None:
+            return
+
+        self._write_row(
+            RENDER,
+            seconds,
+            generation=generation,
+            output_bytes=output_bytes
+        )
+
+    def _get_statistics_fields(self):
+        if self._statistics is None:
+            return {}
+
+        fields = {
+            'births': self._statistics.births,
+            'deaths': self._statistics.deaths,
+        }
+        bounding_box = self._statistics.get_bounding_box()
+        if bounding_box is not None:
+            fields.update(zip(
+                ['x_start', 'y_start', 'x_stop', 'y_stop'],
+                bounding_box
+            ))
+        return fields
+
+    def _write_row(self, phase, seconds, **fields):
+        fields['time'] = time.time() - self._start_time
+        fields['phase'] = phase
+        fields['seconds'] = seconds
+        fields['peak_rss_kb'] = \
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Steps and renders are reported from different threads.
+        with self._lock:
+            self._writer.writerow(fields)
@@ -1,5 +1,12 @@
+import os
+import sys
+
 from game_of_life import errors
-from game_of_life.board import Board
+from game_of_life.board_factory import choose_board_cls
+from game_of_life.board_factory import create_board
+
+# Number of bytes `StreamingLoader` reads from the file at a time.
+DEFAULT_CHUNK_SIZE = 1 << 20
 
 
 class Loader(object):
@@ -14,14 +21,18 @@ class Loader(object):
     0 1 1 1 0
     """
 
-    def __init__(self, input_function=None):
+    def __init__(self, input_function=None, board_factory=None):
         """Creates the `BoardLoaderFromInput`
 
         Keyword Args:
             input_function - injected dependency to that takes in a users
                 `input_function` and returns a string
+            board_factory - callable taking `(x_size, y_size, live_cells=...)`
+                that creates the board. Defaults to picking an engine based on
+                the density of the board.
         """
         self._input_function = input_function or parse_input
+        self._board_factory = board_factory or create_board
 
     def load(self):
         """Gets the raw string board using `self.input_function` and creates a
@@ -32,8 +43,10 @@ class Loader(object):
             raise errors.InvalidBoardError
 
         x_length, y_length = self._get_board_dimension_from_lines(lines)
+        live_cells = self._iterate_live_cells(lines, x_length)
+        return self._board_factory(x_length, y_length, live_cells=live_cells)
 
-        live_cells = []
+    def _iterate_live_cells(self, lines, x_length):
         for y, line in enumerate(lines):
             values = self._get_values(line)
 
@@ -42,9 +55,7 @@ class Loader(object):
 
             for x, value in enumerate(values):
                 if self._is_live_cell(value):
-                    live_cells.append((x, y))
-
-        return Board(x_length, y_length, live_cells=live_cells)
+                    yield (x, y)
 
     def _get_lines_from_input(self):
         string_board = self._input_function()
@@ -66,6 +77,92 @@ class Loader(object):
         else:
             raise errors.InvalidBoardError
 
+
+class StreamingLoader(Loader):
+    """Loads a board from a file in the same format as `Loader`, without ever
+    holding the whole file or a list of its live cells in memory.
+
+    The file is read twice, `chunk_size` bytes at a time. The first pass counts
+    the rows and live cells, which is done by C code and decides which board
+    engine to use, and the second pass parses one row at a time and feeds the
+    live cells straight into the board's own storage.
+    """
+
+    def __init__(
+        self,
+        input_filename,
+        board_factory=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        progress_function=None
+    ):
+        """Creates the `StreamingLoader`
+
+        Args:
+            input_filename - filename of the input file to load
+
+        Keyword Args:
+            board_factory - callable taking `(x_size, y_size, live_cells=...)`
+                that creates the board. Defaults to picking an engine based on
+                the density of the board.
+            chunk_size - number of bytes to read at a time
+            progress_function - called with `(bytes_read, total_bytes)` while
+                the file is parsed
+        """
+        self._input_filename = input_filename
+        self._board_factory = board_factory
+        self._chunk_size = chunk_size
+        self._progress_function = progress_function
+
+    def load(self):
+        """Reads the file and creates a `Board`."""
+        first_line, y_length, population = self._scan()
+        if not y_length:
+            raise errors.InvalidBoardError
+
+        x_length = len(self._get_values(first_line))
+        board_factory = self._board_factory or \
+            choose_board_cls(x_length, y_length, population)
+        live_cells = self._iterate_live_cells(self._iterate_lines(), x_length)
+        return board_factory(x_length, y_length, live_cells=live_cells)
+
+    def _scan(self):
+        line_count = 0
+        population = 0
+        last_chunk = ''
+        for chunk in self._iterate_chunks():
+            line_count += chunk.count('\n')
+            population += chunk.count('1')
+            last_chunk = chunk
+
+        if last_chunk and not last_chunk.endswith('\n'):
+            line_count += 1
+
+        with open(self._input_filename) as input_file:
+            first_line = input_file.readline()
+        return first_line, line_count, population
+
+    def _iterate_chunks(self):
+        with open(self._input_filename) as input_file:
+            for chunk in iter(lambda: input_file.read(self._chunk_size), ''):
+                yield chunk
+
+    def _iterate_lines(self):
+        total_bytes = os.path.getsize(self._input_filename)
+        bytes_read = 0
+        partial_line = ''
+        for chunk in self._iterate_chunks():
+            lines = (partial_line + chunk).split('\n')
+            partial_line = lines.pop()
+            for line in lines:
+                yield line
+
+            bytes_read += len(chunk)
+            if self._progress_function:
+                self._progress_function(bytes_read, total_bytes)
+
+        if partial_line:
+            yield partial_line
+
 # Input Functions
 
 
@@ -87,3 +184,13 @@ def parse_input():
     in.
     """
     return '\n'.join(iter(raw_input, ''))
+
+
+def print_progress(bytes_read, total_bytes):
+    """Progress function for `StreamingLoader` that reports how much of the
+    file has been loaded on stderr.
+    """
+    percentage = 100 * bytes_read // max(total_bytes, 1)
+    sys.stderr.write('\rLoading board... %i%%' % percentage)
+    if bytes_read >= total_bytes:
+        sys.stderr.write('\n')
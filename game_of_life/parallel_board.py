@@ -0,0 +1,186 @@
+"""Multi-core Game of Life engine.
+
+`ParallelBoard` splits the grid into rectangular tiles and steps them on a
+`multiprocessing` pool. The current and the next generation live in two
+shared memory buffers that the workers map when they start, so the only data
+sent to the workers on every generation is the position of each tile. Every
+tile is computed from its cells plus a one cell halo around it, which is why
+the result is exactly the same as stepping the whole board at once.
+"""
+import multiprocessing
+from multiprocessing import sharedctypes
+
+from game_of_life.board import BOUNDED
+from game_of_life.dense_board import DenseBoard
+from game_of_life.dense_board import next_generation
+from game_of_life.dense_board import numpy
+from game_of_life.rules import CONWAY
+from game_of_life.rules import parse_rule
+
+# Number of tiles handed out per worker, so that workers that finish early can
+# pick up more work.
+TILES_PER_WORKER = 4
+
+_worker_arrays = None
+
+
+def _as_array(buffer, shape):
+    return numpy.frombuffer(buffer, dtype=numpy.uint8)[
+        :shape[0] * shape[1]
+    ].reshape(shape)
+
+
+def _initialize_worker(buffers, shape):
+    global _worker_arrays
+    _worker_arrays = [_as_array(buffer, shape) for buffer in buffers]
+
+
+def _step_tile_in_worker(task):
+    source_index, tile, rule = task
+    _step_tile(_worker_arrays, source_index, tile, rule)
+
+
+def _step_tile(
+    arrays,
+    source_index,
+    (x_start, x_stop, y_start, y_stop),
+    rule
+):
+    """Writes the next generation of a tile of `arrays[source_index]` into the
+    other array.
+    """
+    source = arrays[source_index]
+    target = arrays[1 - source_index]
+    y_size, x_size = source.shape
+
+    halo_x_start = max(x_start - 1, 0)
+    halo_y_start = max(y_start - 1, 0)
+    next_cells = next_generation(
+        source[
+            halo_y_start:min(y_stop + 1, y_size),
+            halo_x_start:min(x_stop + 1, x_size)
+        ],
+        rule=rule
+    )
+
+    x_offset = x_start - halo_x_start
+    y_offset = y_start - halo_y_start
+    target[y_start:y_stop, x_start:x_stop] = next_cells[
+        y_offset:y_offset + y_stop - y_start,
+        x_offset:x_offset + x_stop - x_start
+    ]
+
+
+class ParallelBoard(DenseBoard):
+    """`DenseBoard` that steps tiles of the board in parallel worker
+    processes.
+
+    The worker processes are started on the first `step()` and stopped by
+    `close()`. Only bounded boards are supported.
+    """
+
+    TOPOLOGIES = [BOUNDED]
+
+    def __init__(
+        self,
+        x_size,
+        y_size,
+        live_cells=(),
+        workers=None,
+        tile_shape=None,
+        rule=CONWAY
+    ):
+        """Creates a new `ParallelBoard` object.
+
+        Args:
+            x_size - integer describing the size of the x dimension
+            y_size - integer describing the size of the y dimension
+
+        Keyword Args:
+            live_cells - iterable of (x, y) integer pairs representing live
+                cells on the `ParallelBoard` object.
+            workers - number of worker processes. Defaults to the number of
+                CPUs.
+            tile_shape - (x_size, y_size) of every tile. Defaults to
+                horizontal bands that span the whole width of the board.
+            rule - rule the board is stepped with, see `Board`
+        """
+        self.x_size = x_size
+        self.y_size = y_size
+        self.rule = parse_rule(rule)
+        self._workers = workers or multiprocessing.cpu_count()
+
+        shape = (y_size, x_size)
+        self._buffers = [
+            sharedctypes.RawArray('B', max(x_size * y_size, 1))
+            for _ in xrange(2)
+        ]
+        self._arrays = [_as_array(buffer, shape) for buffer in self._buffers]
+        self._source_index = 0
+        self._cells = self._arrays[self._source_index]
+        self._set_live_cells(live_cells)
+        self._previous_cells = self._cells
+
+        self._tiles = self._create_tiles(tile_shape)
+        self._pool = None
+
+    def _create_tiles(self, tile_shape):
+        if tile_shape is None:
+            tile_count = self._workers * TILES_PER_WORKER
+            tile_shape = (
+                self.x_size,
+                max(-(-self.y_size // tile_count), 1)
+            )
+
+        tile_x_size, tile_y_size = tile_shape
+        return [
+            (
+                x_start,
+                min(x_start + tile_x_size, self.x_size),
+                y_start,
+                min(y_start + tile_y_size, self.y_size)
+            )
+            for y_start in xrange(0, self.y_size, tile_y_size)
+            for x_start in xrange(0, self.x_size, tile_x_size)
+        ]
+
+    def step(self):
+        """Steps the game board using the same rules as `Board.step()`."""
+        if self._workers == 1:
+            for tile in self._tiles:
+                _step_tile(self._arrays, self._source_index, tile, self.rule)
+        else:
+            self._get_pool().map(
+                _step_tile_in_worker,
+                [(self._source_index, tile, self.rule) for tile in self._tiles]
+            )
+
+        self._source_index = 1 - self._source_index
+        self._previous_cells = self._cells
+        self._cells = self._arrays[self._source_index]
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(
+                self._workers,
+                initializer=_initialize_worker,
+                initargs=(self._buffers, (self.y_size, self.x_size))
+            )
+        return self._pool
+
+    def snapshot(self):
+        """See `BaseBoard.snapshot()`. The shared buffers are overwritten by
+        later steps, so the snapshot is a `DenseBoard` holding a copy.
+        """
+        board = super(ParallelBoard, self).snapshot()
+        board._cells = board._previous_cells = self._cells.copy()
+        return board
+
+    def close(self):
+        """Stops the worker processes. Stepping the board afterwards starts
+        new ones.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
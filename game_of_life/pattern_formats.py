@@ -0,0 +1,231 @@
+"""Loaders and exporters for the pattern formats used by public pattern
+collections.
+
+RLE (http://www.conwaylife.com/wiki/Run_Length_Encoded) describes a board
+with a `x = <x_size>, y = <y_size>, rule = <rule>` header followed by runs of
+dead (`b`) and live (`o`) cells, with rows ending in `$` and the pattern in
+`!`. Life 1.06 lists the coordinates of every live cell, one `x y` pair per
+line, after a `#Life 1.06` header. Both are parsed straight into live cells,
+so loading costs are proportional to the population rather than the area.
+"""
+import os
+import re
+
+from game_of_life import errors
+from game_of_life.board_factory import create_board
+from game_of_life.loader import parse_input
+from game_of_life.rules import CONWAY
+from game_of_life.rules import parse_rule
+
+LIFE_106_HEADER = '#Life 1.06'
+
+# Longest line `dump_rle()` writes, as recommended by the RLE format.
+RLE_LINE_LENGTH = 70
+
+_RLE_HEADER_PATTERN = re.compile(
+    r'^x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)\s*(?:,\s*rule\s*=\s*(\S+))?\s*$'
+)
+_RLE_TOKEN_PATTERN = re.compile(r'(\d*)(.)')
+
+
+class RleLoader(object):
+    """Loads a board described in RLE."""
+
+    def __init__(self, input_function=None, board_factory=None):
+        """Creates the `RleLoader`
+
+        Keyword Args:
+            input_function - injected dependency that returns the RLE string
+            board_factory - callable taking `(x_size, y_size, live_cells=...)`
+                that creates the board, and `rule=...` for patterns whose
+                header has another rule than Conway's. Defaults to picking an
+                engine based on the density of the board.
+        """
+        self._input_function = input_function or parse_input
+        self._board_factory = board_factory or create_board
+
+    def load(self):
+        """Parses the RLE string from `input_function` and creates a board."""
+        lines = [
+            line.strip() for line in self._input_function().splitlines()
+            if line.strip() and not line.startswith('#')
+        ]
+        if not lines:
+            raise errors.InvalidBoardError
+
+        x_size, y_size, rule = self._parse_header(lines[0])
+        live_cells = self._parse_cells(''.join(lines[1:]))
+        board_kwargs = {}
+        if rule != CONWAY:
+            board_kwargs['rule'] = rule
+        return self._board_factory(
+            x_size,
+            y_size,
+            live_cells=live_cells,
+            **board_kwargs
+        )
+
+    def _parse_header(self, line):
+        match = _RLE_HEADER_PATTERN.match(line)
+        if not match:
+            raise errors.InvalidBoardError
+
+        x_size, y_size, rule = match.groups()
+        rule = CONWAY if rule is None else parse_rule(rule)
+        return int(x_size), int(y_size), rule
+
+    def _parse_cells(self, body):
+        live_cells = []
+        x = 0
+        y = 0
+        for run_count, tag in _RLE_TOKEN_PATTERN.findall(body):
+            run_count = int(run_count or 1)
+            if tag == 'b':
+                x += run_count
+            elif tag == 'o':
+                live_cells.extend((x + offset, y) for offset in xrange(run_count))
+                x += run_count
+            elif tag == '$':
+                x = 0
+                y += run_count
+            elif tag == '!':
+                return live_cells
+            elif not tag.isspace():
+                raise errors.InvalidBoardError
+        raise errors.InvalidBoardError
+
+
+class Life106Loader(object):
+    """Loads a board described in Life 1.06.
+
+    Life 1.06 patterns have no dimensions, so the board is the bounding box of
+    the live cells, moved so that its top left corner is at (0, 0).
+    """
+
+    def __init__(self, input_function=None, board_factory=None):
+        """Creates the `Life106Loader`
+
+        Keyword Args:
+            input_function - injected dependency that returns the Life 1.06
+                string
+            board_factory - callable taking `(x_size, y_size, live_cells=...)`
+                that creates the board. Defaults to picking an engine based on
+                the density of the board.
+        """
+        self._input_function = input_function or parse_input
+        self._board_factory = board_factory or create_board
+
+    def load(self):
+        """Parses the Life 1.06 string from `input_function` and creates a
+        board."""
+        live_cells = []
+        for line in self._input_function().splitlines():
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            values = line.split()
+            if len(values) != 2:
+                raise errors.InvalidBoardError
+            try:
+                live_cells.append((int(values[0]), int(values[1])))
+            except ValueError:
+                raise errors.InvalidBoardError
+
+        if not live_cells:
+            raise errors.InvalidBoardError
+
+        xs, ys = zip(*live_cells)
+        min_x, min_y = min(xs), min(ys)
+        return self._board_factory(
+            max(xs) - min_x + 1,
+            max(ys) - min_y + 1,
+            live_cells=[(x - min_x, y - min_y) for x, y in live_cells]
+        )
+
+
+def get_pattern_loader_cls(input_filename):
+    """Returns `RleLoader` or `Life106Loader` if the file holds a pattern in
+    one of those formats, going by its extension and first line, or `None`
+    otherwise.
+    """
+    extension = os.path.splitext(input_filename)[1].lower()
+    if extension == '.rle':
+        return RleLoader
+
+    with open(input_filename) as input_file:
+        first_line = input_file.readline().strip()
+    if first_line.startswith(LIFE_106_HEADER):
+        return Life106Loader
+    elif first_line.startswith('#') or _RLE_HEADER_PATTERN.match(first_line):
+        return RleLoader
+    return None
+
+
+def dump_rle(board):
+    """Returns the RLE description of any board object.
+
+    RLE patterns start at (0, 0), so the pattern of boards with live cells
+    outside of their window, such as infinite boards, is the window grown to
+    hold every live cell, moved so that its top left corner is at (0, 0).
+    """
+    live_cells = board.get_live_cells()
+    x_start, y_start, x_stop, y_stop = 0, 0, board.x_size, board.y_size
+    if live_cells:
+        xs, ys = zip(*live_cells)
+        x_start, y_start = min(x_start, min(xs)), min(y_start, min(ys))
+        x_stop, y_stop = max(x_stop, max(xs) + 1), max(y_stop, max(ys) + 1)
+
+    rows = {}
+    for x, y in live_cells:
+        rows.setdefault(y - y_start, []).append(x - x_start)
+
+    tokens = []
+    previous_y = 0
+    for y in sorted(rows):
+        if y != previous_y:
+            tokens.append(_format_rle_run(y - previous_y, '$'))
+            previous_y = y
+
+        x = 0
+        xs = sorted(rows[y])
+        run_start = xs[0]
+        for live_x, next_x in zip(xs, xs[1:] + [None]):
+            if next_x == live_x + 1:
+                continue
+            if run_start > x:
+                tokens.append(_format_rle_run(run_start - x, 'b'))
+            tokens.append(_format_rle_run(live_x + 1 - run_start, 'o'))
+            x = live_x + 1
+            run_start = next_x
+    tokens.append('!')
+
+    lines = ['x = %i, y = %i, rule = %s' % (
+        x_stop - x_start,
+        y_stop - y_start,
+        board.rule
+    )]
+    line = ''
+    for token in tokens:
+        if len(line) + len(token) > RLE_LINE_LENGTH:
+            lines.append(line)
+            line = ''
+        line += token
+    lines.append(line)
+    return '\n'.join(lines)
+
+
+def _format_rle_run(run_count, tag):
+    if run_count == 1:
+        return tag
+    return '%i%s' % (run_count, tag)
+
+
+def dump_life_106(board):
+    """Returns the Life 1.06 description of any board object."""
+    lines = [LIFE_106_HEADER]
+    lines.extend(
+        '%i %i' % cell
+        for cell in sorted(board.get_live_cells(), key=lambda (x, y): (y, x))
+    )
+    return '\n'.join(lines)
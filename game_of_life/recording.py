@@ -0,0 +1,488 @@
+"""Headless recordings of a run, streamed to a file or a pipe.
+
+Every frame of a recording is encoded with one of `ENCODINGS`:
+
+    TEXT - the board drawn by a `Drawer` after an "Iteration" line, as
+        printed by "--animator print_all"
+    DELTAS - the cells born and died since the frame before, the first frame
+        holding every live cell as born
+    BITMAP - the words of a `PackedBoard` holding the window of the board,
+        see `game_of_life.packed_board`
+
+`TEXT` recordings are plain text. `DELTAS` and `BITMAP` recordings start with
+a header, all integers being little-endian:
+
+    magic        4 bytes, "GOLR"
+    version      uint16
+    encoding     uint16, index of the encoding in `ENCODINGS`
+    topology     uint16, index of the topology in `board.TOPOLOGIES`
+    x_size       uint64
+    y_size       uint64
+    rule_length  uint16
+
+followed by `rule_length` bytes holding the rule in B/S notation, and by a
+record per frame made of its generation and the length of its payload, both
+uint64, and the payload. `DELTAS` payloads hold the number of born and died
+cells, both uint64, followed by the (x, y) int64 pairs of the born cells and
+then of the died cells. `read_frames()` reads the frames back.
+
+A `FrameWriter` gathers the encoded frames into chunks of `buffer_size` bytes
+and hands them to a background thread, which compresses them with one of
+`COMPRESSIONS` and writes them out, so neither compressing nor a slow file or
+pipe holds up the simulation until `max_queued_chunks` chunks are waiting.
+Compressed recordings are regular gzip, bzip2 and xz streams.
+"""
+import bz2
+import itertools
+import Queue
+import struct
+import threading
+import zlib
+
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+from game_of_life import errors
+from game_of_life.board import TOPOLOGIES
+from game_of_life.board import Board
+from game_of_life.packed_board import PackedBoard
+from game_of_life.packed_board import WORD_DTYPE
+from game_of_life.packed_board import get_word_count
+from game_of_life.dense_board import numpy
+from game_of_life.rules import parse_rule
+from game_of_life.generations import Frame
+
+TEXT = 'text'
+DELTAS = 'deltas'
+BITMAP = 'bitmap'
+ENCODINGS = [TEXT, DELTAS, BITMAP]
+
+GZIP = 'gzip'
+BZ2 = 'bz2'
+LZMA = 'lzma'
+# `LZMA` needs Python 3 or the `backports.lzma` package.
+COMPRESSIONS = [GZIP, BZ2] + ([LZMA] if lzma is not None else [])
+
+MAGIC = 'GOLR'
+VERSION = 1
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+DEFAULT_MAX_QUEUED_CHUNKS = 4
+
+_HEADER_STRUCT = struct.Struct('<4sHHHQQH')
+_RECORD_STRUCT = struct.Struct('<QQ')
+_COUNTS_STRUCT = struct.Struct('<QQ')
+
+
+def _create_compressor(compression):
+    """Returns a compressor object for `compression`, using fast settings so
+    that compressing keeps up with the simulation.
+
+    Raises:
+        `ValueError` if `compression` isn't one of `COMPRESSIONS`
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError('Unsupported compression %r' % (compression,))
+    if compression == GZIP:
+        # Adding 16 to the window size asks for a gzip header and trailer.
+        return zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    elif compression == BZ2:
+        return bz2.BZ2Compressor(1)
+    return lzma.LZMACompressor(preset=1)
+
+
+class TextEncoder(object):
+    """Encodes frames as drawn by a `Drawer`."""
+
+    # Whether `encode()` uses the cells born and died of frames.
+    uses_step_diffs = False
+
+    def __init__(self, drawer):
+        """Creates a `TextEncoder` object.
+
+        Args:
+            drawer - `Drawer` object that describes how each board is drawn
+        """
+        self._drawer = drawer
+
+    def get_header(self, board):
+        """Returns the bytes a recording of `board` starts with."""
+        return ''
+
+    def encode(self, frame):
+        """Returns the bytes of `frame`, a `generations.Frame`."""
+        return 'Iteration %s\n%s\n\n' % (
+            frame.generation + 1,
+            self._drawer.draw(frame.board)
+        )
+
+    def get_trailer(self):
+        """Returns the bytes a recording ends with."""
+        return ''
+
+    def get_header_updates(self):
+        """Returns a list of `(offset, data)` pairs of bytes of the header to
+        overwrite once the recording ends. Text recordings have none.
+        """
+        return []
+
+
+class _BinaryEncoder(object):
+    """Base class of the encoders that write the header described at the top
+    of this module.
+    """
+
+    encoding = None
+    uses_step_diffs = False
+
+    def get_header(self, board):
+        """Returns the bytes a recording of `board` starts with."""
+        rule = str(board.rule)
+        return _HEADER_STRUCT.pack(
+            MAGIC,
+            VERSION,
+            ENCODINGS.index(self.encoding),
+            TOPOLOGIES.index(board.topology),
+            board.x_size,
+            board.y_size,
+            len(rule)
+        ) + rule
+
+    def encode(self, frame):
+        """Returns the bytes of `frame`, a `generations.Frame`."""
+        payload = self._encode_payload(frame)
+        return _RECORD_STRUCT.pack(frame.generation, len(payload)) + payload
+
+    def get_trailer(self):
+        """Returns the bytes a recording ends with."""
+        return ''
+
+    def get_header_updates(self):
+        """Returns a list of `(offset, data)` pairs of bytes of the header to
+        overwrite once the recording ends. The header is complete up front.
+        """
+        return []
+
+    def _encode_payload(self, frame):
+        raise NotImplementedError
+
+
+class DeltaEncoder(_BinaryEncoder):
+    """Encodes frames as the cells born and died since the frame before."""
+
+    encoding = DELTAS
+    uses_step_diffs = True
+
+    def __init__(self):
+        self._is_first_frame = True
+
+    def _encode_payload(self, frame):
+        if self._is_first_frame:
+            self._is_first_frame = False
+            born_cells = frame.board.get_live_cells()
+            died_cells = frozenset()
+        else:
+            born_cells = frame.born_cells
+            died_cells = frame.died_cells
+
+        coordinate_count = 2 * (len(born_cells) + len(died_cells))
+        return _COUNTS_STRUCT.pack(len(born_cells), len(died_cells)) + \
+            struct.pack(
+                '<%iq' % coordinate_count,
+                *itertools.chain.from_iterable(
+                    itertools.chain(born_cells, died_cells)
+                )
+            )
+
+
+class BitmapEncoder(_BinaryEncoder):
+    """Encodes frames as the words of a `PackedBoard` holding the window of
+    the board. Needs NumPy.
+    """
+
+    encoding = BITMAP
+
+    def _encode_payload(self, frame):
+        board = frame.board
+        if not isinstance(board, PackedBoard):
+            board = PackedBoard.from_array(
+                board.get_region_array(0, 0, board.x_size, board.y_size)
+            )
+        return board.get_words().tobytes()
+
+
+def create_encoder(encoding, drawer):
+    """Returns the encoder of `encoding`.
+
+    Args:
+        encoding - one of `ENCODINGS`
+        drawer - `Drawer` object used by `TEXT` encoders
+
+    Raises:
+        `ValueError` if `encoding` isn't one of `ENCODINGS`
+    """
+    if encoding == TEXT:
+        return TextEncoder(drawer)
+    elif encoding == DELTAS:
+        return DeltaEncoder()
+    elif encoding == BITMAP:
+        return BitmapEncoder()
+    raise ValueError('Unsupported encoding %r' % (encoding,))
+
+
+class FrameWriter(object):
+    """Buffers the bytes of a recording and writes them to a file object,
+    see the top of this module.
+    """
+
+    def __init__(
+        self,
+        output_file,
+        compression=None,
+        buffer_size=DEFAULT_BUFFER_SIZE,
+        max_queued_chunks=DEFAULT_MAX_QUEUED_CHUNKS,
+        background=True,
+        hooks=None
+    ):
+        """Creates a `FrameWriter` object.
+
+        Args:
+            output_file - file object opened in binary mode. It's flushed
+                after every chunk but never closed.
+
+        Keyword Args:
+            compression - one of `COMPRESSIONS`, or `None` to write the bytes
+                as they are
+            buffer_size - number of bytes gathered before they are written
+            max_queued_chunks - number of chunks that can wait for the
+                background thread before `write()` waits for it
+            background - if `True`, chunks are compressed and written on a
+                background thread
+            hooks - `instrumentation.Hooks` object the background thread
+                runs through
+
+        Raises:
+            `ValueError` if `compression` isn't one of `COMPRESSIONS`
+        """
+        self._output_file = output_file
+        self._compressor = None
+        if compression is not None:
+            self._compressor = _create_compressor(compression)
+        self._buffer_size = buffer_size
+        self._background = background
+        self._hooks = hooks
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._chunks = Queue.Queue(max_queued_chunks)
+        self._thread = None
+        self._error = None
+        # Number of bytes written to `output_file`, after compression.
+        self.bytes_written = 0
+
+    def write(self, data):
+        """Adds `data` to the recording.
+
+        Raises:
+            the exception that stopped the background thread, if any
+        """
+        self._buffer.append(data)
+        self._buffered_bytes += len(data)
+        if self._buffered_bytes >= self._buffer_size:
+            self._write_buffer()
+
+    def close(self):
+        """Writes everything left in the buffer, ends the compressed stream
+        and waits for the background thread to finish.
+
+        Raises:
+            the exception that stopped the background thread, if any
+        """
+        self._write_buffer()
+        if not self._background:
+            self._write_chunk(None)
+            return
+
+        if self._thread is not None:
+            # `None` tells the background thread to finish.
+            self._chunks.put(None)
+            self._thread.join()
+            self._thread = None
+        elif self._error is None:
+            self._write_chunk(None)
+        if self._error is not None:
+            raise self._error
+
+    def overwrite(self, offset, data):
+        """Overwrites the bytes at `offset` of the recording with `data` once
+        it's closed, such as a header field only known when it ends.
+
+        Returns `True` if they were overwritten, or `False` if the recording
+        is compressed or its file can't seek, such as a pipe.
+        """
+        if self._compressor is not None:
+            return False
+        try:
+            end = self._output_file.tell()
+            self._output_file.seek(end - self.bytes_written + offset)
+            self._output_file.write(data)
+            self._output_file.seek(end)
+        except IOError:
+            return False
+        self._output_file.flush()
+        return True
+
+    def _write_buffer(self):
+        if self._error is not None:
+            raise self._error
+        if not self._buffer:
+            return
+
+        chunk = ''.join(self._buffer)
+        self._buffer = []
+        self._buffered_bytes = 0
+        if not self._background:
+            self._write_chunk(chunk)
+            return
+
+        if self._thread is None:
+            if self._hooks is None:
+                self._thread = threading.Thread(target=self._run)
+            else:
+                self._thread = threading.Thread(
+                    target=self._hooks.run,
+                    args=(self._run,)
+                )
+            self._thread.daemon = True
+            self._thread.start()
+        self._chunks.put(chunk)
+
+    def _run(self):
+        while True:
+            chunk = self._chunks.get()
+            if self._error is None:
+                try:
+                    self._write_chunk(chunk)
+                except Exception as error:
+                    self._error = error
+            # Chunks queued after an error are dropped, so that `write()`
+            # never waits on a full queue.
+            if chunk is None:
+                return
+
+    def _write_chunk(self, chunk):
+        """Compresses and writes `chunk`, or ends the compressed stream if
+        `chunk` is `None`.
+        """
+        if self._compressor is None:
+            data = chunk or ''
+        elif chunk is None:
+            data = self._compressor.flush()
+        else:
+            data = self._compressor.compress(chunk)
+        self._output_file.write(data)
+        self._output_file.flush()
+        self.bytes_written += len(data)
+
+
+def _read_exactly(input_file, size):
+    data = input_file.read(size)
+    if len(data) != size:
+        raise errors.InvalidBoardError('Truncated recording')
+    return data
+
+
+def read_frames(input_file):
+    """Yields the `generations.Frame`s of a `DELTAS` or `BITMAP` recording, in
+    order. The boards of `DELTAS` recordings are `Board` objects and those of
+    `BITMAP` recordings are `PackedBoard` objects, which need NumPy. Only
+    `DELTAS` recordings have the cells that were born and died.
+
+    Args:
+        input_file - file object opened in binary mode, such as the file
+            object returned by `gzip.open()` for compressed recordings
+
+    Raises:
+        `errors.InvalidBoardError` if `input_file` isn't a valid recording
+    """
+    header = _read_exactly(input_file, _HEADER_STRUCT.size)
+    (
+        magic,
+        version,
+        encoding_index,
+        topology_index,
+        x_size,
+        y_size,
+        rule_length
+    ) = _HEADER_STRUCT.unpack(header)
+    is_valid = magic == MAGIC and version == VERSION and \
+        encoding_index in (ENCODINGS.index(DELTAS), ENCODINGS.index(BITMAP)) \
+        and topology_index < len(TOPOLOGIES)
+    if not is_valid:
+        raise errors.InvalidBoardError('Not a recording')
+    encoding = ENCODINGS[encoding_index]
+    topology = TOPOLOGIES[topology_index]
+    rule = parse_rule(_read_exactly(input_file, rule_length))
+
+    live_cells = set()
+    while True:
+        record = input_file.read(_RECORD_STRUCT.size)
+        if not record:
+            return
+        if len(record) != _RECORD_STRUCT.size:
+            raise errors.InvalidBoardError('Truncated recording')
+        generation, payload_length = _RECORD_STRUCT.unpack(record)
+        payload = _read_exactly(input_file, payload_length)
+
+        if encoding == BITMAP:
+            words = numpy.frombuffer(payload, dtype=WORD_DTYPE)
+            if words.size != y_size * get_word_count(x_size):
+                raise errors.InvalidBoardError('Invalid bitmap frame')
+            yield Frame(
+                generation,
+                PackedBoard.from_words(
+                    x_size,
+                    words.reshape((y_size, -1)),
+                    rule=rule
+                ),
+                frozenset(),
+                frozenset()
+            )
+            continue
+
+        born_cells, died_cells = _decode_deltas(payload)
+        live_cells -= died_cells
+        live_cells |= born_cells
+        yield Frame(
+            generation,
+            Board(
+                x_size,
+                y_size,
+                live_cells=live_cells,
+                topology=topology,
+                rule=rule
+            ),
+            born_cells,
+            died_cells
+        )
+
+
+def _decode_deltas(payload):
+    if len(payload) < _COUNTS_STRUCT.size:
+        raise errors.InvalidBoardError('Invalid delta frame')
+    born_count, died_count = _COUNTS_STRUCT.unpack_from(payload)
+    coordinate_count = 2 * (born_count + died_count)
+    if len(payload) != _COUNTS_STRUCT.size + 8 * coordinate_count:
+        raise errors.InvalidBoardError('Invalid delta frame')
+
+    coordinates = struct.unpack_from(
+        '<%iq' % coordinate_count,
+        payload,
+        _COUNTS_STRUCT.size
+    )
+    cells = zip(coordinates[::2], coordinates[1::2])
+    return frozenset(cells[:born_count]), frozenset(cells[born_count:])
@@ -0,0 +1,113 @@
+"""Life-like rules in B/S notation.
+
+A Life-like rule lists the numbers of live neighbours that bring a dead cell
+to life (B, for birth) and that keep a live cell alive (S, for survival).
+Conway's Game of Life is B3/S23, HighLife B36/S23, Seeds B2/S and Day & Night
+B3678/S34678. `parse_rule()` compiles a rule once into a `Rule` holding an
+18 entry transition table, which engines index with the state of a cell and
+its number of live neighbours instead of branching on the rule.
+
+Rules with B0 bring the empty space around every pattern to life, so bounded
+and infinite boards alike would need the cells outside of them to flip on
+every generation. They are not supported.
+"""
+import re
+
+from game_of_life import errors
+
+# Rules that can be given by name instead of in B/S notation.
+RULE_NAMES = {
+    'conway': 'B3/S23',
+    'highlife': 'B36/S23',
+    'seeds': 'B2/S',
+    'day-and-night': 'B3678/S34678',
+}
+
+_BS_PATTERN = re.compile(r'^B([0-8]*)/?S([0-8]*)$')
+# The older S/B notation lists the survival counts first, without letters.
+_SB_PATTERN = re.compile(r'^([0-8]*)/([0-8]*)$')
+
+
+class Rule(object):
+    """A compiled Life-like rule.
+
+    `table[state * 9 + live_neighbours]` is 1 if a cell in `state`, 0 for
+    dead and 1 for alive, with `live_neighbours` live neighbours is alive in
+    the next generation and 0 otherwise.
+    """
+
+    def __init__(self, births, survivals):
+        """Creates a `Rule` object.
+
+        Args:
+            births - iterable of the numbers of live neighbours that bring a
+                dead cell to life
+            survivals - iterable of the numbers of live neighbours that keep a
+                live cell alive
+
+        Raises:
+            `errors.InvalidRuleError` if a count isn't between 0 and 8, or
+                if `births` holds 0
+        """
+        self.births = frozenset(births)
+        self.survivals = frozenset(survivals)
+        if not self.births | self.survivals <= frozenset(xrange(9)):
+            raise errors.InvalidRuleError(
+                'Neighbour counts must be between 0 and 8'
+            )
+        if 0 in self.births:
+            raise errors.InvalidRuleError('B0 rules are not supported')
+
+        self.table = tuple(
+            int(live_neighbours in counts)
+            for counts in (self.births, self.survivals)
+            for live_neighbours in xrange(9)
+        )
+
+    def __str__(self):
+        return 'B%s/S%s' % (
+            ''.join(str(count) for count in sorted(self.births)),
+            ''.join(str(count) for count in sorted(self.survivals))
+        )
+
+    def __repr__(self):
+        return 'Rule(%r)' % str(self)
+
+    def __eq__(self, rule):
+        return isinstance(rule, Rule) and self.table == rule.table
+
+    def __ne__(self, rule):
+        return not self == rule
+
+    def __hash__(self):
+        return hash(self.table)
+
+
+def parse_rule(rule):
+    """Returns the `Rule` described by a string in B/S notation, such as
+    "B36/S23", in the older S/B notation, such as "23/36", or by one of
+    `RULE_NAMES`. `Rule` objects are returned as they are.
+
+    Raises:
+        `errors.InvalidRuleError` if `rule` can't be parsed or isn't
+            supported
+    """
+    if isinstance(rule, Rule):
+        return rule
+
+    normalized_rule = RULE_NAMES.get(rule.lower(), rule).upper()
+    match = _BS_PATTERN.match(normalized_rule)
+    if match:
+        births, survivals = match.groups()
+    else:
+        match = _SB_PATTERN.match(normalized_rule)
+        if not match:
+            raise errors.InvalidRuleError('Invalid rule %r' % rule)
+        survivals, births = match.groups()
+    return Rule(
+        [int(count) for count in births],
+        [int(count) for count in survivals]
+    )
+
+
+CONWAY = parse_rule('conway')
@@ -0,0 +1,160 @@
+"""Steps a board on a background thread so that drawing it never holds up the
+simulation and stepping it never holds up the user interface.
+
+A `Simulation` advances its board `generations_per_frame` generations at a
+time, through `generations.iterate_generations()`, and puts every `Frame`
+holding a snapshot of the board into a bounded queue. When the queue is full
+the simulation waits, so it never runs further ahead of the screen than
+`max_queued_frames` frames. The user interface takes a frame whenever it is
+ready to draw one, and can drop the frames it was too slow to draw by taking
+the latest one.
+"""
+import Queue
+import threading
+
+from game_of_life.generations import iterate_generations
+from game_of_life.generations import merge_step_diffs
+
+DEFAULT_GENERATIONS_PER_FRAME = 1
+DEFAULT_MAX_QUEUED_FRAMES = 2
+
+# Seconds between checks for `stop()` while the frame queue is full.
+_STOP_POLL_INTERVAL = 0.1
+
+
+class Simulation(object):
+    """Steps a board on a background thread, see the top of this module."""
+
+    def __init__(
+        self,
+        board,
+        generations_per_frame=DEFAULT_GENERATIONS_PER_FRAME,
+        max_queued_frames=DEFAULT_MAX_QUEUED_FRAMES,
+        hooks=None,
+        first_generation=0,
+        checkpointer=None,
+        track_step_diffs=True
+    ):
+        """Creates a `Simulation` object. The board is only stepped after
+        `start()`.
+
+        Args:
+            board - board object to step. It should not be used by anything
+                else until `stop()`.
+
+        Keyword Args:
+            generations_per_frame - number of generations between two frames
+            max_queued_frames - number of frames that can wait in the queue
+                before the simulation waits for them to be taken
+            hooks - `instrumentation.Hooks` object told about every step
+            first_generation - generation the board is at, such as the
+                generation of the checkpoint it was resumed from
+            checkpointer - `checkpoints.Checkpointer` object passed the
+                snapshot of every frame, which it saves when a checkpoint is
+                due
+            track_step_diffs - if `False`, the cells born and died are left
+                out of the frames. Building them often takes far longer than
+                the step itself on boards with a lot of activity.
+        """
+        self._board = board
+        self._generations_per_frame = generations_per_frame
+        self._frames = Queue.Queue(max_queued_frames)
+        self._is_stopped = threading.Event()
+        self._thread = None
+        self._error = None
+        self._hooks = hooks
+        self._first_generation = first_generation
+        self._checkpointer = checkpointer
+        self._track_step_diffs = track_step_diffs
+
+    def start(self):
+        """Starts stepping the board on a background thread, which puts the
+        initial frame in the queue first.
+        """
+        if self._hooks is None:
+            self._thread = threading.Thread(target=self._run)
+        else:
+            self._thread = threading.Thread(
+                target=self._hooks.run,
+                args=(self._run,)
+            )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stops stepping the board and waits for the background thread to
+        finish.
+        """
+        self._is_stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get_frame(self, timeout=None, drop_queued_frames=False):
+        """Returns the next frame, or `None` if no frame is queued within
+        `timeout` seconds.
+
+        Keyword Args:
+            timeout - number of seconds to wait for a frame. Defaults to
+                waiting until one is queued.
+            drop_queued_frames - if `True`, returns the most recent frame
+                instead, dropping the frames queued before it and merging
+                their diffs into it
+
+        Raises:
+            the exception that stopped the background thread, if any
+        """
+        try:
+            frame = self._frames.get(timeout=timeout)
+        except Queue.Empty:
+            return None
+
+        while True:
+            if frame is None:
+                raise self._error
+            if not drop_queued_frames:
+                return frame
+            try:
+                next_frame = self._frames.get_nowait()
+            except Queue.Empty:
+                return frame
+            if next_frame is None:
+                raise self._error
+            born_cells, died_cells = merge_step_diffs(
+                (frame.born_cells, frame.died_cells),
+                (next_frame.born_cells, next_frame.died_cells)
+            )
+            frame = next_frame._replace(
+                born_cells=born_cells,
+                died_cells=died_cells
+            )
+
+    def _run(self):
+        frames = iterate_generations(
+            self._board,
+            stride=self._generations_per_frame,
+            first_generation=self._first_generation,
+            track_step_diffs=self._track_step_diffs,
+            hooks=self._hooks
+        )
+        try:
+            for frame in frames:
+                # The initial frame is where the board was loaded from.
+                is_initial_frame = frame.generation == self._first_generation
+                if self._checkpointer is not None and not is_initial_frame:
+                    self._checkpointer.update(frame.board, frame.generation)
+                self._put_frame(frame)
+                if self._is_stopped.is_set():
+                    return
+        except Exception as error:
+            # `None` tells `get_frame()` to raise the error.
+            self._error = error
+            self._put_frame(None)
+
+    def _put_frame(self, frame):
+        while not self._is_stopped.is_set():
+            try:
+                self._frames.put(frame, timeout=_STOP_POLL_INTERVAL)
+                return
+            except Queue.Full:
+                continue
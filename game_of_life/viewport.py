@@ -0,0 +1,150 @@
+"""The part of a board that is shown on a screen.
+
+Boards can be far bigger than a terminal, so only the window described by a
+`Viewport` is drawn. At zoom level 1 every cell takes `cell_width` columns,
+the way `Drawer.draw()` draws it. At higher zoom levels every character
+summarises a `zoom` x `zoom` block of cells, which lets a whole board fit on
+the screen however big it is.
+"""
+
+# Factor the zoom level is multiplied or divided by when zooming.
+ZOOM_FACTOR = 2
+
+# A pan moves the viewport by this fraction of its size.
+PAN_FRACTION = 4
+
+
+class Viewport(object):
+    """Window onto a board, described by the board cell at its top left
+    corner (`x`, `y`), the `zoom` level and the screen size in characters.
+    """
+
+    def __init__(
+        self,
+        board_x_size,
+        board_y_size,
+        columns,
+        rows,
+        cell_width=2
+    ):
+        """Creates a `Viewport` at the top left corner of the board that isn't
+        zoomed out.
+
+        Args:
+            board_x_size - integer describing the size of the board's x
+                dimension
+            board_y_size - integer describing the size of the board's y
+                dimension
+            columns - number of characters available on every row
+            rows - number of rows available
+
+        Keyword Args:
+            cell_width - number of columns a cell takes at zoom level 1,
+                including the space that separates it from the next cell
+        """
+        self.board_x_size = board_x_size
+        self.board_y_size = board_y_size
+        self.x = 0
+        self.y = 0
+        self.zoom = 1
+        self._cell_width = cell_width
+        self.resize(columns, rows)
+
+    def resize(self, columns, rows):
+        """Changes the screen size the viewport is shown in."""
+        self.columns = columns
+        self.rows = rows
+        self.zoom = min(self.zoom, self.get_max_zoom())
+        self._clamp()
+
+    def get_visible_size(self):
+        """Returns the (x_size, y_size) in cells of the part of the board
+        that fits on the screen.
+        """
+        if self.zoom == 1:
+            # The last cell of a row doesn't need its separating space.
+            return (self.columns + 1) // self._cell_width, self.rows
+        return self.columns * self.zoom, self.rows * self.zoom
+
+    def get_region(self):
+        """Returns the (x_start, y_start, x_stop, y_stop) of the visible part
+        of the board, clipped to the board.
+        """
+        x_size, y_size = self.get_visible_size()
+        return (
+            self.x,
+            self.y,
+            min(self.x + x_size, self.board_x_size),
+            min(self.y + y_size, self.board_y_size)
+        )
+
+    def contains(self, (x, y)):
+        """Returns `True` if the cell at (x, y) is visible."""
+        x_start, y_start, x_stop, y_stop = self.get_region()
+        return x_start <= x < x_stop and y_start <= y < y_stop
+
+    def get_relative_position(self, (x, y)):
+        """Returns the position of the cell at (x, y) relative to the top
+        left corner of the viewport.
+        """
+        return x - self.x, y - self.y
+
+    def get_max_zoom(self):
+        """Returns the smallest zoom level that fits the whole board on the
+        screen.
+        """
+        zoom = 1
+        if not self.columns or not self.rows:
+            return zoom
+        while self.columns * zoom < self.board_x_size or \
+                self.rows * zoom < self.board_y_size:
+            zoom *= ZOOM_FACTOR
+        return zoom
+
+    def pan(self, x_direction, y_direction):
+        """Moves the viewport by a fraction of its size.
+
+        Args:
+            x_direction - -1 to move left, 1 to move right or 0
+            y_direction - -1 to move up, 1 to move down or 0
+        """
+        x_size, y_size = self.get_visible_size()
+        self.x += x_direction * max(x_size // PAN_FRACTION, self.zoom)
+        self.y += y_direction * max(y_size // PAN_FRACTION, self.zoom)
+        self._clamp()
+
+    def zoom_in(self):
+        """Shows smaller blocks of cells, keeping the centre in place."""
+        self._set_zoom(max(self.zoom // ZOOM_FACTOR, 1))
+
+    def zoom_out(self):
+        """Shows bigger blocks of cells, keeping the centre in place, until
+        the whole board fits on the screen.
+        """
+        self._set_zoom(min(self.zoom * ZOOM_FACTOR, self.get_max_zoom()))
+
+    def _set_zoom(self, zoom):
+        x_size, y_size = self.get_visible_size()
+        centre_x = self.x + x_size // 2
+        centre_y = self.y + y_size // 2
+
+        self.zoom = zoom
+        x_size, y_size = self.get_visible_size()
+        self.x = centre_x - x_size // 2
+        self.y = centre_y - y_size // 2
+        self._clamp()
+
+    def _clamp(self):
+        """Keeps as much of the board on the screen as possible, with the
+        corner aligned to the blocks of the zoom level.
+        """
+        x_size, y_size = self.get_visible_size()
+        self.x = self._align(
+            max(min(self.x, self.board_x_size - x_size), 0)
+        )
+        self.y = self._align(
+            max(min(self.y, self.board_y_size - y_size), 0)
+        )
+
+    def _align(self, position):
+        return -(-position // self.zoom) * self.zoom
@@ -0,0 +1,137 @@
+import argparse
+import os
+import sys
+
+from game_of_life import batch
+from game_of_life.board import BOUNDED
+from game_of_life.board_factory import ENGINE_NAME_TO_BOARD_CLS
+
+
+class BatchRunnerCreatorFromArgs(object):
+    """Turns the results of `argparse.ArgumentParser.parse_args()` into the
+    arguments of `batch.run_batch()`.
+    """
+
+    def __init__(self, args):
+        """Creates a `BatchRunnerCreatorFromArgs` object
+
+        Args:
+            args - a `argparse.Namespace` object that describes the command
+                line arguments of the script
+        """
+        self._args = args
+
+    def run(self, output_file):
+        """Runs the batch, writing the records to `output_file`."""
+        if self._args.generations < 0:
+            raise argparse.ArgumentTypeError(
+                '--generations can not be negative.'
+            )
+
+        batch.run_batch(
+            batch.find_board_filenames(self._args.path),
+            self._args.generations,
+            output_file,
+            output_format=self._get_output_format(),
+            workers=self._args.workers,
+            stack_size=self._args.stack_size,
+            board_factory=self._get_board_factory()
+        )
+
+    def _get_output_format(self):
+        if self._args.format:
+            output_format = self._args.format
+        elif self._args.output:
+            output_format = os.path.splitext(self._args.output)[1][1:]
+        else:
+            output_format = batch.JSON_LINES
+
+        if output_format not in (batch.JSON_LINES, batch.CSV):
+            raise argparse.ArgumentTypeError(
+                'Invalid --format. Must be one of %s' %
+                [batch.JSON_LINES, batch.CSV]
+            )
+        return output_format
+
+    def _get_board_factory(self):
+        if not self._args.engine:
+            return None
+
+        if self._args.engine not in ENGINE_NAME_TO_BOARD_CLS:
+            raise argparse.ArgumentTypeError(
+                'Invalid --engine. Must be one of %s' %
+                ENGINE_NAME_TO_BOARD_CLS.keys()
+            )
+        board_cls = ENGINE_NAME_TO_BOARD_CLS[self._args.engine]
+        if BOUNDED not in board_cls.TOPOLOGIES:
+            raise argparse.ArgumentTypeError(
+                'Batches only run bounded boards, which the "%s" --engine '
+                'does not support.' % self._args.engine
+            )
+        return board_cls
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        usage=""" %(prog)s PATH --generations GENERATIONS [options].
+
+Advances many boards to the same generation and writes a record per board with
+its final state in RLE, its population and the period of the cycle it settled
+into, if any. PATH is either a directory of board files or a manifest file
+listing one board file per line.
+
+Sample Calls:
+python %(prog)s boards --generations=100
+python %(prog)s boards --generations=1000 --stack-size=64 --output=out.csv
+"""
+    )
+    parser.add_argument(
+        'path',
+        help="""Directory of board files, or manifest file listing one board
+        file per line relative to the manifest. Board files can be in any
+        format accepted by "game_of_life_runner.py"."""
+    )
+    parser.add_argument(
+        '--generations',
+        type=int,
+        required=True,
+        help='Number of generations to advance every board.'
+    )
+    parser.add_argument(
+        '--output',
+        help="""File to write the records to. Defaults to standard
+        output."""
+    )
+    parser.add_argument(
+        '--format',
+        help="""Format of the records, "jsonl" or "csv". Defaults to the
+        extension of "--output", or to "jsonl"."""
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help="""Number of worker processes. Defaults to the number of
+        CPUs."""
+    )
+    parser.add_argument(
+        '--stack-size',
+        type=int,
+        help="""If passed in, small boards are padded to the same shape and
+        stepped STACK_SIZE at a time in one NumPy array."""
+    )
+    parser.add_argument(
+        '--engine',
+        help="""The engine used to step the boards that are not stacked. See
+        "game_of_life_runner.py --help"."""
+    )
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    creator = BatchRunnerCreatorFromArgs(args)
+    if args.output:
+        with open(args.output, 'wb') as output_file:
+            creator.run(output_file)
+    else:
+        creator.run(sys.stdout)
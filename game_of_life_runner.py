@@ -1,29 +1,75 @@
 import argparse
+import contextlib
+import functools
+import os
+import sys
+import time
 
 from game_of_life import animators
+from game_of_life import checkpoints
+from game_of_life import errors
+from game_of_life import exporters
+from game_of_life import recording
+from game_of_life.binary_format import BinaryLoader
+from game_of_life.board import BOUNDED
+from game_of_life.board import INFINITE
+from game_of_life.board import TOPOLOGIES
+from game_of_life.board_factory import ENGINE_NAME_TO_BOARD_CLS
+from game_of_life.board_factory import create_board
+from game_of_life.board_factory import create_board_with_rule
+from game_of_life.dense_board import numpy
 from game_of_life.drawer import Drawer
+from game_of_life.file_formats import create_file_loader
+from game_of_life.history import DEFAULT_MAX_BYTES
+from game_of_life.history import History
+from game_of_life.instrumentation import Profiler
 from game_of_life.loader import Loader
-from game_of_life.loader import create_input_function_from_filename
 from game_of_life.loader import parse_input
+from game_of_life.loader import print_progress
+from game_of_life.parallel_board import ParallelBoard
+from game_of_life.rules import RULE_NAMES
+from game_of_life.rules import parse_rule
+from game_of_life.simulation import DEFAULT_GENERATIONS_PER_FRAME
+
+# Size in bytes from which the progress of loading a file is reported.
+PROGRESS_FILE_SIZE = 1 << 24
 
 
 class GameOfLifeRunner(object):
     """Responsible for loading an initial game board and animating it."""
 
-    def __init__(self, loader, animator):
+    def __init__(self, loader, animator, hooks=None):
         """Creates a `GameOfLifeRunner` object.
 
         Args:
             loader - a `Loader` object that is used to load a game board
             animator - an `Animator` object used to animate the loaded board
+
+        Keyword Args:
+            hooks - `instrumentation.Hooks` object told about loading the
+                board. It should also be passed to the animator.
         """
         self._loader = loader
         self._animator = animator
+        self._hooks = hooks
 
     def run(self):
         """Handles loading the board and animating it"""
-        board = self._loader.load()
-        self._animator.animate(board)
+        if self._hooks is None:
+            with self._loader.load() as board:
+                self._animator.animate(board)
+            return
+
+        try:
+            self._hooks.run(self._run_with_hooks)
+        finally:
+            self._hooks.on_finish()
+
+    def _run_with_hooks(self):
+        start_time = time.time()
+        with self._loader.load() as board:
+            self._hooks.on_load(board, time.time() - start_time)
+            self._animator.animate(board)
 
 
 class RunnerCreatorFromArgs(object):
@@ -42,25 +88,162 @@ class RunnerCreatorFromArgs(object):
                 line arguments of the script
         """
         self._args = args
+        self._checkpoint = None
 
-    def create(self):
+    def create(self, profile_file=None, record_file=None, heatmap_file=None):
         """Creates a `GameOfLifeRunner` object using the command line
         arguments.
+
+        Keyword Args:
+            profile_file - file object the time series of "--profile" is
+                written to
+            record_file - file object the recording of "--record" is written
+                to
+            heatmap_file - file object the heatmap of "--heatmap" is written
+                to
         """
         loader = self._create_loader()
         drawer = self._create_drawer()
-        animator = self._create_animator(drawer)
-        return GameOfLifeRunner(loader, animator)
+        hooks = self._create_hooks(profile_file, heatmap_file)
+        animator = self._create_animator(
+            drawer,
+            hooks=hooks,
+            record_file=record_file
+        )
+        return GameOfLifeRunner(loader, animator, hooks=hooks)
+
+    def _create_hooks(self, profile_file, heatmap_file):
+        if profile_file is None and heatmap_file is None and \
+                not self._args.profile_cpu:
+            return None
+        return Profiler(
+            output_file=profile_file,
+            cpu_stats_filename=self._args.profile_cpu,
+            heatmap_file=heatmap_file
+        )
 
     def _create_loader(self):
+        if self._args.resume:
+            return self._create_checkpoint_loader()
+
+        board_factory = self._get_board_factory()
+        if not self._args.filename:
+            return Loader(parse_input, board_factory=board_factory)
+
+        progress_function = None
+        if os.path.getsize(self._args.filename) >= PROGRESS_FILE_SIZE:
+            progress_function = print_progress
+        return create_file_loader(
+            self._args.filename,
+            board_factory=board_factory,
+            progress_function=progress_function
+        )
+
+    def _create_checkpoint_loader(self):
+        if not self._args.checkpoint_dir:
+            raise argparse.ArgumentTypeError(
+                '--resume needs a --checkpoint-dir to resume from.'
+            )
         if self._args.filename:
-            input_function = create_input_function_from_filename(
-                self._args.filename
+            raise argparse.ArgumentTypeError(
+                'Cant have both --resume and --filename options.'
             )
+
+        # Boards resume with the engine, topology and rule they were
+        # checkpointed with, unless others are asked for.
+        self._checkpoint = checkpoints.find_latest_checkpoint(
+            self._args.checkpoint_dir
+        )
+        return BinaryLoader(
+            self._checkpoint.filename,
+            board_factory=self._get_board_factory()
+        )
+
+    def _get_board_factory(self):
+        board_factory = self._get_engine_board_factory()
+        if self._args.rule:
+            try:
+                rule = parse_rule(self._args.rule)
+            except errors.InvalidRuleError as error:
+                raise argparse.ArgumentTypeError(
+                    'Invalid --rule. %s.' % error
+                )
+        elif self._checkpoint is not None:
+            rule = self._checkpoint.rule
         else:
-            input_function = parse_input
+            return board_factory
+
+        return functools.partial(
+            create_board_with_rule,
+            board_factory or create_board,
+            rule
+        )
+
+    def _get_engine_board_factory(self):
+        topology = self._get_topology()
+        if self._args.workers is not None:
+            if self._args.engine not in (None, 'dense'):
+                raise argparse.ArgumentTypeError(
+                    '--workers can only be used with the "dense" --engine.'
+                )
+            if topology != BOUNDED:
+                raise argparse.ArgumentTypeError(
+                    '--workers can only be used with the "bounded" '
+                    '--topology.'
+                )
+            return functools.partial(ParallelBoard, workers=self._args.workers)
+
+        engine = self._get_engine()
+        if not engine:
+            # Checkpoints are rebuilt rather than memory mapped into a
+            # `PackedBoard`, which doesn't keep statistics.
+            if topology == BOUNDED and self._checkpoint is None:
+                return None
+            return functools.partial(create_board, topology=topology)
+
+        if engine not in ENGINE_NAME_TO_BOARD_CLS:
+            raise argparse.ArgumentTypeError(
+                'Invalid --engine. Must be one of %s' %
+                ENGINE_NAME_TO_BOARD_CLS.keys()
+            )
+        board_cls = ENGINE_NAME_TO_BOARD_CLS[engine]
+        if topology not in board_cls.TOPOLOGIES:
+            raise argparse.ArgumentTypeError(
+                'The "%s" --engine only supports the %s --topology.' %
+                (engine, ' and '.join(
+                    '"%s"' % board_topology
+                    for board_topology in board_cls.TOPOLOGIES
+                ))
+            )
+        if topology == BOUNDED:
+            return board_cls
+        return functools.partial(board_cls, topology=topology)
 
-        return Loader(input_function)
+    def _get_engine(self):
+        if self._args.engine or self._checkpoint is None:
+            return self._args.engine
+        # Checkpoints of engines that no longer exist get an engine picked
+        # based on the density of the board.
+        if self._checkpoint.engine in ENGINE_NAME_TO_BOARD_CLS:
+            return self._checkpoint.engine
+        return None
+
+    def _get_topology(self):
+        if self._args.topology:
+            if self._args.topology not in TOPOLOGIES:
+                raise argparse.ArgumentTypeError(
+                    'Invalid --topology. Must be one of %s' % TOPOLOGIES
+                )
+            return self._args.topology
+        if self._checkpoint is not None:
+            return self._checkpoint.topology
+
+        # Engines that don't support bounded boards default to the first
+        # topology they support.
+        board_cls = ENGINE_NAME_TO_BOARD_CLS.get(self._args.engine)
+        if board_cls is not None:
+            return board_cls.TOPOLOGIES[0]
+        return BOUNDED
 
     def _create_drawer(self):
         drawer_params = {
@@ -69,24 +252,118 @@ class RunnerCreatorFromArgs(object):
         }
         return Drawer(**drawer_params)
 
-    def _create_animator(self, drawer):
+    def _create_animator(self, drawer, hooks=None, record_file=None):
         self._validate_animator_args()
 
         if self._args.step_to_print is not None:
             return animators.SingleFrameAnimator(
                 drawer,
-                self._args.step_to_print
+                self._args.step_to_print,
+                detect_cycles=True,
+                hooks=hooks
+            )
+
+        first_generation = 0
+        if self._checkpoint is not None:
+            first_generation = self._checkpoint.generation
+        animator_kwargs = dict(
+            generations_per_frame=self._args.generations_per_frame,
+            hooks=hooks,
+            first_generation=first_generation,
+            checkpointer=self._create_checkpointer(first_generation)
+        )
+        if self._args.record:
+            return animators.RecordingAnimator(
+                self._create_encoder(drawer),
+                recording.FrameWriter(
+                    record_file,
+                    compression=self._args.record_compression,
+                    hooks=hooks
+                ),
+                frame_count=self._args.record_frames,
+                **animator_kwargs
             )
 
         animator_cls = self._animator_name_to_animator_cls_map.get(
             self._args.animator,
             animators.CursesAnimator
         )
-        return animator_cls(drawer)
+        animator_kwargs['frames_per_second'] = self._args.fps
+        if animator_cls is animators.CursesAnimator and \
+                self._args.history_memory:
+            animator_kwargs['history'] = History(
+                max_bytes=int(self._args.history_memory * (1 << 20))
+            )
+        return animator_cls(drawer, **animator_kwargs)
+
+    def _create_encoder(self, drawer):
+        if self._args.record_encoding in exporters.EXPORT_FORMATS:
+            return exporters.create_exporter(
+                self._args.record_encoding,
+                frame_count=self._args.record_frames,
+                scale=self._args.record_scale,
+                frames_per_second=self._args.fps
+            )
+        return recording.create_encoder(self._args.record_encoding, drawer)
+
+    def _create_checkpointer(self, first_generation):
+        if not self._args.checkpoint_dir:
+            return None
+        if self._get_topology() == INFINITE:
+            raise argparse.ArgumentTypeError(
+                'Checkpoints only hold the window of the board, so '
+                '--checkpoint-dir can not be used with the "infinite" '
+                '--topology.'
+            )
+
+        interval_generations = self._args.checkpoint_every
+        interval_seconds = self._args.checkpoint_interval
+        if interval_generations is None and interval_seconds is None:
+            interval_seconds = checkpoints.DEFAULT_INTERVAL_SECONDS
+        return checkpoints.Checkpointer(
+            self._args.checkpoint_dir,
+            interval_generations=interval_generations,
+            interval_seconds=interval_seconds,
+            engine=self._get_engine(),
+            checkpoints_to_keep=self._args.checkpoints_to_keep,
+            first_generation=first_generation
+        )
 
     def _validate_animator_args(self):
+        if self._args.generations_per_frame < 1:
+            raise argparse.ArgumentTypeError(
+                '--generations-per-frame must be at least 1.'
+            )
+        if self._args.fps <= 0:
+            raise argparse.ArgumentTypeError('--fps must be positive.')
+        if self._args.history_memory < 0:
+            raise argparse.ArgumentTypeError(
+                '--history-memory can not be negative.'
+            )
+        if self._args.checkpoint_every is not None and \
+                self._args.checkpoint_every < 1:
+            raise argparse.ArgumentTypeError(
+                '--checkpoint-every must be at least 1.'
+            )
+        if self._args.checkpoint_interval is not None and \
+                self._args.checkpoint_interval <= 0:
+            raise argparse.ArgumentTypeError(
+                '--checkpoint-interval must be positive.'
+            )
+        if self._args.checkpoints_to_keep < 1:
+            raise argparse.ArgumentTypeError(
+                '--checkpoints-to-keep must be at least 1.'
+            )
+
         has_step_to_print = bool(self._args.step_to_print)
         has_animator = bool(self._args.animator)
+        if self._args.record:
+            self._validate_record_args()
+            if has_step_to_print or has_animator:
+                raise argparse.ArgumentTypeError(
+                    'Cant have --record with --step-to-print or --animator '
+                    'options.'
+                )
 
         has_no_options_set = not (has_step_to_print or has_animator)
         if has_no_options_set:
@@ -106,6 +383,41 @@ class RunnerCreatorFromArgs(object):
                 self._animator_name_to_animator_cls_map.keys()
             )
 
+    def _validate_record_args(self):
+        encoding = self._args.record_encoding
+        encodings = recording.ENCODINGS + exporters.EXPORT_FORMATS
+        if encoding not in encodings:
+            raise argparse.ArgumentTypeError(
+                'Invalid --record-encoding. Must be one of %s' % encodings
+            )
+        needs_numpy = encoding == recording.BITMAP or \
+            encoding in exporters.EXPORT_FORMATS
+        if needs_numpy and numpy is None:
+            raise argparse.ArgumentTypeError(
+                'The "%s" --record-encoding needs NumPy.' % encoding
+            )
+        if encoding == exporters.APNG and self._args.record_frames is None:
+            raise argparse.ArgumentTypeError(
+                'The "apng" --record-encoding needs --record-frames.'
+            )
+        if self._args.record_scale < 1:
+            raise argparse.ArgumentTypeError(
+                '--record-scale must be at least 1.'
+            )
+        has_invalid_compression = \
+            self._args.record_compression is not None and \
+            self._args.record_compression not in recording.COMPRESSIONS
+        if has_invalid_compression:
+            raise argparse.ArgumentTypeError(
+                'Invalid --record-compression. Must be one of %s' %
+                recording.COMPRESSIONS
+            )
+        if self._args.record_frames is not None and \
+                self._args.record_frames < 1:
+            raise argparse.ArgumentTypeError(
+                '--record-frames must be at least 1.'
+            )
+
     _animator_name_to_animator_cls_map = {
         'curses': animators.CursesAnimator,
         'print_all': animators.PrintAllAnimator
@@ -127,8 +439,11 @@ when done drawing the board.
 
 By default uses `curses` to draw the output. If using a non unix like OS,
 please use "--animator print_all" for a less pleasant but working experience.
-Important caveat: a "_curses.error" will be raised if your screen resolution is
-too small for larger boards.
+Boards larger than the screen can be panned with the arrow keys or h/j/k/l and
+zoomed out and in with "-" and "+". "b" steps back through past frames and "r"
+rewinds to the oldest one kept, pausing the animation until it catches up.
+Cells beyond the edges of the board are dead unless "--topology" makes the
+edges wrap around or lets patterns leave the window into an infinite plane.
 
 Sample Calls:
 python %(prog)s --filename=boards/gosper_glider_gun.txt
@@ -138,6 +453,12 @@ python %(prog)s --filename=boards/h.txt --output-live-cell-character=' '
 python %(prog)s
 python %(prog)s --filename=boards/blinker.txt --step-to-print=5
 python %(prog)s --filename=boards/beacon.txt --animator=print_all
+python %(prog)s --filename=boards/gosper_glider_gun.txt --topology=torus
+python %(prog)s --filename=boards/gosper_glider_gun.txt --rule=highlife
+python %(prog)s --filename=boards/gosper_glider_gun.txt --record=gun.golr.gz
+    --record-encoding=deltas --record-compression=gzip --record-frames=1000
+python %(prog)s --filename=boards/gosper_glider_gun.txt --record=gun.gif
+    --record-encoding=gif --record-scale=4 --record-frames=120 --fps=15
 """
     )
     parser.add_argument(
@@ -156,15 +477,193 @@ python %(prog)s --filename=boards/beacon.txt --animator=print_all
         help="""If passed in takes a input file that describes the initial
         grid.  Grids look like "0", "1" with spaces representing different
         columns and new lines representing different rows. Please look at
-        "boards/blinker.txt" to see an example of a valid board."""
+        "boards/blinker.txt" to see an example of a valid board. Patterns in
+        RLE (".rle" files) and Life 1.06 are also accepted, and files in the
+        binary format of `game_of_life.binary_format` are detected from their
+        header and memory mapped."""
+    )
+    parser.add_argument(
+        '--engine',
+        help="""The engine used to step the board. Acceptable ENGINES include:
+        "sparse", "incremental", "dense", "packed", "hashlife" and
+        "chunked". "sparse" keeps a set of live cells, "incremental" only
+        re-evaluates the cells next to the ones that changed in the previous
+        step and suits boards that have mostly settled, "dense" and "packed"
+        keep every cell in NumPy arrays, "hashlife" memoizes the board in a
+        quadtree and "chunked" keeps NumPy tiles of the live region of an
+        infinite plane. By default "sparse" or "dense" is picked based on how
+        many cells are alive."""
+    )
+    parser.add_argument(
+        '--rule',
+        help="""The Life-like rule the board is stepped with, in B/S notation
+        such as "B36/S23", where the digits after "B" are the numbers of live
+        neighbours that bring a dead cell to life and the digits after "S"
+        the numbers that keep a live cell alive. %s can also be given by
+        name. Rules with "B0" are not supported. Defaults to the rule in the
+        header of RLE and binary files, or to Conway's "B3/S23".""" %
+        ', '.join('"%s"' % name for name in sorted(RULE_NAMES))
+    )
+    parser.add_argument(
+        '--topology',
+        help="""What happens at the edges of the board. Acceptable TOPOLOGIES
+        include: "bounded", "torus" and "infinite". Cells beyond the edges of
+        a "bounded" board are dead, the edges of a "torus" wrap around to the
+        opposite side and an "infinite" board lets patterns leave the drawn
+        window and come back. "torus" is supported by the "sparse",
+        "incremental" and "dense" engines and "infinite" by the "sparse",
+        "incremental" and "chunked" engines, "chunked" being the default.
+        Defaults to "bounded". Pass the same TOPOLOGY again with
+        "--resume"."""
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help="""If passed in, steps the board with the "dense" engine split
+        into tiles that are stepped in parallel on WORKERS processes. Useful
+        for very large boards."""
+    )
+    parser.add_argument(
+        '--generations-per-frame',
+        type=int,
+        default=DEFAULT_GENERATIONS_PER_FRAME,
+        help="""Number of generations the board is stepped between two frames
+        of the animation. Defaults to %i.""" % DEFAULT_GENERATIONS_PER_FRAME
+    )
+    parser.add_argument(
+        '--fps',
+        type=float,
+        default=animators.DEFAULT_FRAMES_PER_SECOND,
+        help="""Number of frames of the animation drawn every second. The
+        board is stepped in the background, and frames that can't be drawn in
+        time are skipped. Defaults to %g.""" %
+        animators.DEFAULT_FRAMES_PER_SECOND
     )
     parser.add_argument(
         '--step-to-print',
         type=int,
-        help="""The step to print. The initial step is step 1. This can not be
-        used together with "--animator".
+        help="""The step to print. The initial step is step 1. Boards that
+        settle into a still life or an oscillator are only stepped until they
+        repeat themselves, and large steps are jumped to with HashLife, so
+        even steps like 1000000000 finish quickly. This can not be used
+        together with "--animator".
         """
     )
+    parser.add_argument(
+        '--history-memory',
+        type=float,
+        default=DEFAULT_MAX_BYTES >> 20,
+        help="""Megabytes of past frames the "curses" animator keeps so that
+        "b" can step back through them and "r" can rewind to the oldest one.
+        The oldest frames that haven't been looked at are forgotten first. 0
+        turns it off. Defaults to %i.""" % (DEFAULT_MAX_BYTES >> 20)
+    )
+    parser.add_argument(
+        '--checkpoint-dir',
+        help="""If passed in, the animated board is checkpointed to
+        CHECKPOINT_DIR every "--checkpoint-every" generations or
+        "--checkpoint-interval" seconds, so that it can be resumed with
+        "--resume" if the process dies. Checkpoints are written atomically on
+        a background thread. Not used with "--step-to-print"."""
+    )
+    parser.add_argument(
+        '--checkpoint-every',
+        type=int,
+        help='Number of generations between two checkpoints.'
+    )
+    parser.add_argument(
+        '--checkpoint-interval',
+        type=float,
+        help="""Number of seconds between two checkpoints. Defaults to %g
+        unless "--checkpoint-every" is passed in.""" %
+        checkpoints.DEFAULT_INTERVAL_SECONDS
+    )
+    parser.add_argument(
+        '--checkpoints-to-keep',
+        type=int,
+        default=checkpoints.DEFAULT_CHECKPOINTS_TO_KEEP,
+        help="""Number of checkpoints kept in "--checkpoint-dir", the older
+        ones being removed. Defaults to %i.""" %
+        checkpoints.DEFAULT_CHECKPOINTS_TO_KEEP
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help="""Starts from the latest checkpoint in "--checkpoint-dir",
+        with the engine it was stepped with, instead of from
+        "--filename"."""
+    )
+    parser.add_argument(
+        '--record',
+        help="""If passed in, records the board to RECORD, or to the standard
+        output if RECORD is "-", instead of animating it. The board is
+        stepped as fast as it can be, and every frame is encoded with
+        "--record-encoding" and written through a buffer, compressing it on a
+        background thread if "--record-compression" is passed in. Records
+        until interrupted unless "--record-frames" is passed in. This can not
+        be used together with "--animator" or "--step-to-print"."""
+    )
+    parser.add_argument(
+        '--record-encoding',
+        default=recording.TEXT,
+        help="""How frames are recorded. Acceptable RECORD_ENCODINGS include:
+        "text", "deltas", "bitmap", "gif", "apng" and "y4m". "text" records
+        frames as printed by "print_all", "deltas" records the cells born and
+        died since the frame before and "bitmap" records a bit per cell of
+        the board, see `game_of_life.recording`. "gif" and "apng" export an
+        animated image and "y4m" a raw video, played at "--fps" frames per
+        second, see `game_of_life.exporters`. "apng" needs
+        "--record-frames". Defaults to "text"."""
+    )
+    parser.add_argument(
+        '--record-scale',
+        type=int,
+        default=exporters.DEFAULT_SCALE,
+        help="""Width and height in pixels of every cell in "gif", "apng"
+        and "y4m" recordings. Defaults to %i. Use "--generations-per-frame" to
+        only keep every so many generations.""" % exporters.DEFAULT_SCALE
+    )
+    parser.add_argument(
+        '--record-compression',
+        help="""If passed in, compresses the recording. Acceptable
+        RECORD_COMPRESSIONS include: %s, "lzma" needing Python 3 or the
+        `backports.lzma` package.""" %
+        ', '.join('"%s"' % compression for compression in [
+            recording.GZIP,
+            recording.BZ2,
+            recording.LZMA,
+        ])
+    )
+    parser.add_argument(
+        '--record-frames',
+        type=int,
+        help="""Number of frames recorded, including the initial one, before
+        the run ends."""
+    )
+    parser.add_argument(
+        '--profile',
+        help="""If passed in, writes a CSV time series to PROFILE with a row
+        for loading the board, for every step and for every drawn frame,
+        holding the time it took, the population, the number of cells the
+        "sparse" and "incremental" engines considered, the number of
+        characters drawn and the peak memory used so far. With the "sparse"
+        and "incremental" engines, step rows also hold the number of births
+        and deaths and the bounding box of the live cells, which these
+        engines keep up to date as they step."""
+    )
+    parser.add_argument(
+        '--heatmap',
+        help="""If passed in, writes a CSV to HEATMAP when the run ends with a
+        row for every cell that was born or died, holding the number of times
+        it changed. Only supported by the "sparse" and "incremental"
+        engines."""
+    )
+    parser.add_argument(
+        '--profile-cpu',
+        help="""If passed in, runs every thread under `cProfile` and writes
+        the merged statistics to PROFILE_CPU when the run ends. Read them with
+        "python -m pstats PROFILE_CPU"."""
+    )
     parser.add_argument(
         '--output-live-cell-character',
         help="""Character to represent a living cell during animation. Defaults
@@ -182,8 +681,30 @@ python %(prog)s --filename=boards/beacon.txt --animator=print_all
     return parser.parse_args()
 
 
+@contextlib.contextmanager
+def open_output_file(filename):
+    """Opens `filename` for writing in binary mode, giving `None` if
+    `filename` is `None` and the standard output if it's "-".
+    """
+    if filename is None:
+        yield None
+    elif filename == '-':
+        yield sys.stdout
+        sys.stdout.flush()
+    else:
+        with open(filename, 'wb') as output_file:
+            yield output_file
+
+
 if __name__ == '__main__':
     args = parse_args()
     creator = RunnerCreatorFromArgs(args)
-    runner = creator.create()
-    runner.run()
+    with open_output_file(args.profile) as profile_file:
+        with open_output_file(args.record) as record_file:
+            with open_output_file(args.heatmap) as heatmap_file:
+                runner = creator.create(
+                    profile_file=profile_file,
+                    record_file=record_file,
+                    heatmap_file=heatmap_file
+                )
+                runner.run()
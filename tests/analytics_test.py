@@ -0,0 +1,94 @@
+import random
+import unittest
+
+from game_of_life.analytics import Statistics
+from game_of_life.board import INFINITE
+from game_of_life.board import Board
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+class StatisticsTest(unittest.TestCase):
+
+    def test_initial_statistics(self):
+        statistics = Statistics(GLIDER)
+        self.assertEqual(statistics.population, 5)
+        self.assertEqual(statistics.step_count, 0)
+        self.assertEqual((statistics.births, statistics.deaths), (0, 0))
+        self.assertEqual(statistics.get_bounding_box(), (0, 0, 3, 3))
+        self.assertEqual(statistics.get_heatmap(), {})
+
+    def test_empty_board_has_no_bounding_box(self):
+        self.assertIsNone(Statistics().get_bounding_box())
+
+    def test_update(self):
+        statistics = Statistics([(0, 0), (1, 0)])
+        statistics.update([(5, 2)], [(0, 0)])
+        statistics.update([(0, 0)], [])
+
+        self.assertEqual(statistics.step_count, 2)
+        self.assertEqual(statistics.population, 3)
+        self.assertEqual((statistics.births, statistics.deaths), (1, 0))
+        self.assertEqual(
+            (statistics.total_births, statistics.total_deaths),
+            (2, 1)
+        )
+        self.assertEqual(statistics.get_bounding_box(), (0, 0, 6, 3))
+        self.assertEqual(
+            statistics.get_heatmap(),
+            {(0, 0): 2, (5, 2): 1}
+        )
+
+    def test_bounding_box_shrinks_when_an_edge_empties(self):
+        statistics = Statistics([(0, 0), (2, 0), (4, 3)])
+        self.assertEqual(statistics.get_bounding_box(), (0, 0, 5, 4))
+        statistics.update([], [(4, 3)])
+        self.assertEqual(statistics.get_bounding_box(), (0, 0, 3, 1))
+        statistics.update([(-2, -1)], [])
+        self.assertEqual(statistics.get_bounding_box(), (-2, -1, 3, 1))
+        statistics.update([], [(-2, -1), (0, 0), (2, 0)])
+        self.assertIsNone(statistics.get_bounding_box())
+
+    def test_heatmap_array(self):
+        statistics = Statistics()
+        statistics.update([(0, 0), (2, 1)], [])
+        statistics.update([], [(2, 1)])
+        self.assertEqual(
+            statistics.get_heatmap_array(0, 0, 3, 2).tolist(),
+            [[1, 0, 0], [0, 0, 2]]
+        )
+        self.assertEqual(
+            statistics.get_heatmap_array(1, 1, 3, 2).tolist(),
+            [[0, 2]]
+        )
+
+    def test_matches_board_on_random_soup(self):
+        random.seed(0)
+        live_cells = [
+            (x, y) for x in xrange(20) for y in xrange(20)
+            if random.random() < 0.3
+        ]
+        board = Board(20, 20, live_cells=live_cells, topology=INFINITE)
+        statistics = Statistics(live_cells)
+        heatmap = {}
+
+        for _ in xrange(40):
+            board.step()
+            born_cells, died_cells = board.get_step_diff()
+            statistics.update(born_cells, died_cells)
+            for cell in born_cells | died_cells:
+                heatmap[cell] = heatmap.get(cell, 0) + 1
+
+            live_cells = board.get_live_cells()
+            xs = [x for x, _ in live_cells]
+            ys = [y for _, y in live_cells]
+            self.assertEqual(statistics.population, len(live_cells))
+            self.assertEqual(
+                statistics.get_bounding_box(),
+                (min(xs), min(ys), max(xs) + 1, max(ys) + 1)
+            )
+        self.assertEqual(statistics.get_heatmap(), heatmap)
+
+
+if __name__ == '__main__':
+    unittest.main()
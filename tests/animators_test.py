@@ -1,8 +1,256 @@
+import curses
+import StringIO
+import struct
 import unittest
+import zlib
 
 import mock
 
 from game_of_life import animators
+from game_of_life import exporters
+from game_of_life import recording
+from game_of_life.board import Board
+from game_of_life.drawer import Drawer
+from game_of_life.generations import Frame
+from game_of_life.history import History
+from game_of_life.instrumentation import Hooks
+from game_of_life.viewport import Viewport
+
+
+class CursesAnimatorTest(unittest.TestCase):
+
+    def test_only_changed_cells_are_redrawn(self):
+        board = Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        board.step()
+        screen = mock.Mock()
+
+        animators.CursesAnimator(Drawer())._draw_frame_on_screen(
+            screen,
+            Frame(1, board, *board.get_step_diff()),
+            Viewport(3, 3, 80, 20)
+        )
+
+        self.assertEqual(
+            sorted(screen.addstr.call_args_list),
+            sorted([
+                mock.call(5, 2, '0'),
+                mock.call(7, 2, '0'),
+                mock.call(6, 0, '1'),
+                mock.call(6, 4, '1'),
+            ])
+        )
+
+    def test_only_changed_cells_in_the_viewport_are_redrawn(self):
+        board = Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        board.step()
+        screen = mock.Mock()
+        viewport = Viewport(3, 3, 3, 2)
+        viewport.pan(1, 1)
+
+        animators.CursesAnimator(Drawer())._draw_frame_on_screen(
+            screen,
+            Frame(1, board, *board.get_step_diff()),
+            viewport
+        )
+
+        self.assertEqual(
+            sorted(screen.addstr.call_args_list),
+            sorted([mock.call(6, 0, '0'), mock.call(5, 2, '1')])
+        )
+
+    def test_whole_board_is_redrawn_if_cells_have_different_widths(self):
+        board = Board(1, 1)
+        screen = mock.Mock()
+
+        animators.CursesAnimator(
+            Drawer(live_cell_character='XX')
+        )._draw_frame_on_screen(
+            screen,
+            Frame(0, board, frozenset(), frozenset()),
+            Viewport(1, 1, 80, 20)
+        )
+
+        screen.addstr.assert_any_call(5, 0, '0')
+
+    def test_whole_viewport_is_redrawn_when_zoomed_out(self):
+        board = Board(4, 4, live_cells=[(0, 0), (1, 1), (3, 3)])
+        screen = mock.Mock()
+        viewport = Viewport(4, 4, 2, 2)
+        viewport.zoom_out()
+
+        animators.CursesAnimator(Drawer())._draw_frame_on_screen(
+            screen,
+            Frame(1, board, *board.get_step_diff()),
+            viewport
+        )
+
+        screen.addstr.assert_called_once_with(5, 0, '+ \n -')
+
+    def test_keys_pan_and_zoom_the_viewport(self):
+        screen = mock.Mock()
+        screen.getmaxyx.return_value = (25, 81)
+        animator = animators.CursesAnimator(Drawer())
+        viewport = Viewport(1000, 1000, 80, 20)
+
+        self.assertTrue(animator._move_viewport(screen, viewport, ord('l')))
+        self.assertEqual((viewport.x, viewport.y), (10, 0))
+        self.assertTrue(
+            animator._move_viewport(screen, viewport, curses.KEY_DOWN)
+        )
+        self.assertEqual((viewport.x, viewport.y), (10, 5))
+        self.assertTrue(animator._move_viewport(screen, viewport, ord('-')))
+        self.assertEqual(viewport.zoom, 2)
+        self.assertFalse(animator._move_viewport(screen, viewport, ord(' ')))
+
+    def test_frames_are_drawn_until_q_is_hit(self):
+        screen = mock.Mock()
+        screen.getmaxyx.return_value = (25, 81)
+        screen.getch.side_effect = [ord(' '), ord(' '), ord(' '), ord('q')]
+        board = Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        stepped_board = Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        stepped_board.step()
+        simulation = mock.Mock()
+        simulation.get_frame.side_effect = [
+            Frame(0, board, frozenset(), frozenset()),
+            Frame(1, stepped_board, *stepped_board.get_step_diff()),
+            # The simulation hasn't caught up with the frame rate.
+            None,
+            Frame(2, board, *stepped_board.get_step_diff()[::-1]),
+        ]
+
+        with mock.patch.object(curses, 'doupdate'):
+            animators.CursesAnimator(Drawer())._animate_frames(
+                screen,
+                Viewport(3, 3, 80, 20),
+                simulation
+            )
+
+        self.assertEqual(
+            [
+                call for call in screen.addnstr.call_args_list
+                if call[0][0] == 4
+            ],
+            [
+                mock.call(4, 0, 'Iteration 0', 80),
+                mock.call(4, 0, 'Iteration 1', 80),
+                mock.call(4, 0, 'Iteration 1', 80),
+                mock.call(4, 0, 'Iteration 2', 80),
+            ]
+        )
+        screen.addstr.assert_any_call(5, 0, '0 1 0\n0 1 0\n0 1 0')
+        screen.addstr.assert_any_call(6, 0, '1')
+
+    def test_past_frames_are_stepped_through_while_paused(self):
+        screen = mock.Mock()
+        screen.getmaxyx.return_value = (25, 81)
+        screen.getch.side_effect = [
+            ord(' '), ord(' '), ord('b'), ord('b'), ord('b'), ord(' '),
+            ord('r'), ord(' '), ord(' '), ord(' '), ord('q'),
+        ]
+        board = Board(
+            6,
+            6,
+            live_cells=[(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+        )
+        frames = [Frame(0, board.snapshot(), frozenset(), frozenset())]
+        for generation in [1, 2, 3]:
+            board.step()
+            frames.append(
+                Frame(generation, board.snapshot(), *board.get_step_diff())
+            )
+        simulation = mock.Mock()
+        simulation.get_frame.side_effect = frames
+
+        with mock.patch.object(curses, 'doupdate'):
+            animators.CursesAnimator(
+                Drawer(),
+                history=History()
+            )._animate_frames(screen, Viewport(6, 6, 80, 20), simulation)
+
+        self.assertEqual(
+            [
+                call[0][2] for call in screen.addnstr.call_args_list
+                if call[0][0] == 4
+            ],
+            [
+                'Iteration 0',
+                'Iteration 1',
+                'Iteration 2',
+                'Iteration 1 (paused, b steps back, any other key steps '
+                'forward)',
+                'Iteration 0 (paused, b steps back, any other key steps '
+                'forward)',
+                'Iteration 0 (paused, b steps back, any other key steps '
+                'forward)',
+                'Iteration 1 (paused, b steps back, any other key steps '
+                'forward)',
+                'Iteration 0 (paused, b steps back, any other key steps '
+                'forward)',
+                'Iteration 1 (paused, b steps back, any other key steps '
+                'forward)',
+                'Iteration 2',
+                'Iteration 3',
+            ]
+        )
+        screen.addstr.assert_any_call(5, 0, Drawer().draw(frames[1].board))
+
+    def test_header_is_cut_to_the_screen_width(self):
+        screen = mock.Mock()
+        screen.getmaxyx.return_value = (3, 11)
+
+        animators.CursesAnimator(Drawer())._draw_header_on_screen(screen)
+
+        self.assertEqual(screen.addnstr.call_count, 3)
+        screen.addnstr.assert_any_call(0, 0, 'Game Of Life', 10)
+
+
+class RecordingAnimatorTest(unittest.TestCase):
+
+    def test_frames_are_recorded(self):
+        encoder = recording.create_encoder(recording.TEXT, Drawer())
+        writer = mock.Mock()
+        hooks = mock.Mock(wraps=Hooks())
+
+        animators.RecordingAnimator(
+            encoder,
+            writer,
+            generations_per_frame=2,
+            frame_count=3,
+            hooks=hooks
+        ).animate(Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)]))
+
+        self.assertEqual(
+            writer.write.call_args_list,
+            [
+                mock.call(''),
+                mock.call('Iteration 1\n0 1 0\n0 1 0\n0 1 0\n\n'),
+                mock.call('Iteration 3\n0 1 0\n0 1 0\n0 1 0\n\n'),
+                mock.call('Iteration 5\n0 1 0\n0 1 0\n0 1 0\n\n'),
+                # The trailer of the encoding.
+                mock.call(''),
+            ]
+        )
+        writer.close.assert_called_once_with()
+        self.assertEqual(
+            [call[0][0] for call in hooks.on_render.call_args_list],
+            [0, 2, 4]
+        )
+
+    def test_frame_count_of_short_apng_recordings_is_corrected(self):
+        output_file = StringIO.StringIO()
+
+        animators.RecordingAnimator(
+            exporters.create_exporter(exporters.APNG, frame_count=10),
+            recording.FrameWriter(output_file),
+            frame_count=3
+        ).animate(Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)]))
+
+        data = output_file.getvalue()
+        offset = data.index('acTL')
+        self.assertEqual(
+            struct.unpack('>III', data[offset + 4:offset + 16]),
+            (3, 0, zlib.crc32(data[offset:offset + 12]) & 0xffffffff)
+        )
 
 
 class SingleFrameAnimatorTest(unittest.TestCase):
@@ -24,6 +272,43 @@ class SingleFrameAnimatorTest(unittest.TestCase):
         drawer.draw.assert_called_once_with(board)
         print_function.assert_called_once_with(drawer.draw.return_value)
 
+    def test_large_steps_are_jumped_to_with_hashlife(self):
+        live_cells = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+        print_function = mock.Mock()
+        animator = animators.SingleFrameAnimator(
+            Drawer(),
+            21,
+            print_function=print_function,
+            hashlife_step_threshold=10
+        )
+
+        board = Board(6, 6, live_cells=live_cells)
+        with mock.patch.object(board, 'step') as step:
+            animator.animate(board)
+        self.assertFalse(step.called)
+
+        expected_board = Board(6, 6, live_cells=live_cells)
+        for _ in xrange(20):
+            expected_board.step()
+        print_function.assert_called_once_with(Drawer().draw(expected_board))
+
+    def test_settled_boards_are_only_stepped_until_they_repeat(self):
+        print_function = mock.Mock()
+        animator = animators.SingleFrameAnimator(
+            Drawer(),
+            100,
+            print_function=print_function,
+            detect_cycles=True
+        )
+
+        board = Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        with mock.patch.object(board, 'step', wraps=board.step) as step:
+            animator.animate(board)
+
+        # Two periods to find the cycle and one step along it.
+        self.assertEqual(step.call_count, 5)
+        print_function.assert_called_once_with('0 0 0\n1 1 1\n0 0 0')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,193 @@
+import StringIO
+import csv
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from game_of_life import batch
+from game_of_life import cycles
+from game_of_life.board import Board
+from game_of_life.pattern_formats import dump_rle
+
+BOARDS_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'boards')
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+class FindBoardFilenamesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_directory(self):
+        for filename in ['b.txt', 'a.rle', '.hidden']:
+            open(os.path.join(self.directory, filename), 'w').close()
+        os.mkdir(os.path.join(self.directory, 'subdirectory'))
+
+        self.assertEqual(
+            batch.find_board_filenames(self.directory),
+            [
+                os.path.join(self.directory, 'a.rle'),
+                os.path.join(self.directory, 'b.txt'),
+            ]
+        )
+
+    def test_manifest(self):
+        manifest_filename = os.path.join(self.directory, 'manifest')
+        with open(manifest_filename, 'w') as manifest_file:
+            manifest_file.write('# Seeds\nb.txt\n\n  boards/a.rle\n')
+
+        self.assertEqual(
+            batch.find_board_filenames(manifest_filename),
+            [
+                os.path.join(self.directory, 'b.txt'),
+                os.path.join(self.directory, 'boards/a.rle'),
+            ]
+        )
+
+
+class SimulateBoardTest(unittest.TestCase):
+
+    def test_oscillator_period_is_detected(self):
+        board, period, cycle_start = batch.simulate_board(
+            Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)]),
+            5
+        )
+        self.assertEqual(
+            board,
+            Board(3, 3, live_cells=[(0, 1), (1, 1), (2, 1)])
+        )
+        self.assertEqual((period, cycle_start), (2, 0))
+
+    def test_stacked_boards_match_boards_stepped_on_their_own(self):
+        random.seed(0)
+        boards = [
+            Board(6, 6, live_cells=GLIDER),
+            Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)]),
+            Board(17, 9, live_cells=[
+                (x, y) for x in xrange(17) for y in xrange(9)
+                if random.random() < 0.4
+            ]),
+            Board(2, 5),
+        ]
+        for generations in [0, 1, 7, 100]:
+            for max_cycle_bytes in [
+                3 * cycles.FINGERPRINT_BYTES,
+                cycles.DEFAULT_MAX_BYTES
+            ]:
+                expected_results = [
+                    batch.simulate_board(
+                        board.snapshot(),
+                        generations,
+                        max_cycle_bytes
+                    )
+                    for board in boards
+                ]
+                self.assertEqual(
+                    batch.simulate_stacked_boards(
+                        boards,
+                        generations,
+                        max_cycle_bytes
+                    ),
+                    expected_results
+                )
+
+
+class RunBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.filenames = [
+            os.path.join(BOARDS_DIRECTORY, filename)
+            for filename in ['blinker.txt', 'beacon.txt', 'missing.txt']
+        ]
+
+    def _run_batch(self, **kwargs):
+        output_file = StringIO.StringIO()
+        batch.run_batch(self.filenames, 10, output_file, **kwargs)
+        return output_file.getvalue()
+
+    def test_json_lines(self):
+        records = [
+            json.loads(line)
+            for line in self._run_batch(workers=1).splitlines()
+        ]
+
+        self.assertEqual(
+            [record['filename'] for record in records],
+            self.filenames
+        )
+        blinker_record = records[0]
+        self.assertEqual(blinker_record['population'], 3)
+        self.assertEqual(blinker_record['period'], 2)
+        self.assertEqual(blinker_record['cycle_start'], 0)
+        self.assertEqual(
+            blinker_record['rle'],
+            dump_rle(Board(5, 5, live_cells=[(2, 1), (2, 2), (2, 3)]))
+        )
+        self.assertIsNone(blinker_record['error'])
+        self.assertIsNone(records[2]['population'])
+        self.assertIsNotNone(records[2]['error'])
+
+    def test_csv_from_worker_processes_matches_json_lines(self):
+        json_records = [
+            json.loads(line)
+            for line in self._run_batch(workers=1).splitlines()
+        ]
+        csv_records = list(csv.DictReader(StringIO.StringIO(
+            self._run_batch(output_format=batch.CSV, workers=2)
+        )))
+
+        self.assertEqual(
+            [
+                (record['filename'], record['population'], record['period'])
+                for record in csv_records
+            ],
+            [
+                (
+                    record['filename'],
+                    str(record['population'] or ''),
+                    str(record['period'] or '')
+                )
+                for record in json_records
+            ]
+        )
+
+    def test_stacking_gives_the_same_records(self):
+        self.assertEqual(
+            self._run_batch(workers=1, stack_size=2),
+            self._run_batch(workers=1)
+        )
+
+    def test_rule_of_boards_that_reach_a_cycle_is_kept(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        filename = os.path.join(directory, 'highlife.rle')
+        with open(filename, 'w') as board_file:
+            board_file.write('x = 3, y = 1, rule = B36/S23\n3o!\n')
+
+        for stack_size in [None, 2]:
+            output_file = StringIO.StringIO()
+            batch.run_batch(
+                [filename],
+                5,
+                output_file,
+                workers=1,
+                stack_size=stack_size
+            )
+            record = json.loads(output_file.getvalue())
+
+            self.assertEqual(record['period'], 1)
+            self.assertEqual(record['rle'], 'x = 3, y = 1, rule = B36/S23\n!')
+
+    def test_invalid_output_format(self):
+        with self.assertRaises(ValueError):
+            self._run_batch(workers=1, output_format='xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import StringIO
+import unittest
+
+from game_of_life import benchmarks
+from game_of_life.dense_board import DenseBoard
+from game_of_life.file_formats import create_file_loader
+
+
+class WorkloadTest(unittest.TestCase):
+
+    def test_parse_workload(self):
+        self.assertEqual(benchmarks.parse_workload('soup-1k'), ('soup', 1024))
+        self.assertEqual(benchmarks.parse_workload('gun-300'), ('gun', 300))
+        for workload in ['soup', 'soup-1m', 'glider-1k', 'gun--1']:
+            self.assertRaises(
+                ValueError,
+                benchmarks.parse_workload,
+                workload
+            )
+
+    def test_soup(self):
+        cells = benchmarks.create_workload('soup-64')
+
+        self.assertEqual(cells.shape, (64, 64))
+        self.assertEqual(set(cells.ravel().tolist()), set([0, 1]))
+        self.assertTrue(0.4 < cells.mean() < 0.6)
+        self.assertTrue(
+            (cells == benchmarks.create_workload('soup-64')).all()
+        )
+
+    def test_gun_grid(self):
+        gun = create_file_loader(benchmarks.GUN_FILENAME).load().to_array()
+        cells = benchmarks.create_workload('gun-128')
+
+        self.assertEqual(cells.shape, (128, 128))
+        self.assertEqual(cells.sum(), 4 * gun.sum())
+        gun_y_size, gun_x_size = gun.shape
+        self.assertTrue((cells[64:64 + gun_y_size, :gun_x_size] == gun).all())
+
+    def test_create_board(self):
+        cells = benchmarks.create_workload('soup-16')
+        for engine in ['sparse', 'incremental', 'dense', 'packed', 'hashlife']:
+            board = benchmarks.create_board(engine, cells)
+            self.assertEqual(board, DenseBoard.from_array(cells))
+
+
+class CaseNameTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        for case in benchmarks.DEFAULT_CASES:
+            self.assertEqual(
+                benchmarks.parse_case_name(benchmarks.get_case_name(case)),
+                case
+            )
+
+    def test_invalid(self):
+        for name in [
+            'step/soup-1k',
+            'walk/soup-1k/dense',
+            'step/soup-1k/rle',
+            'load/soup-1k/dense',
+            'draw/moon-1k/dense',
+        ]:
+            self.assertRaises(ValueError, benchmarks.parse_case_name, name)
+
+
+class RunCaseTest(unittest.TestCase):
+
+    def test_every_benchmark(self):
+        for name in [
+            'step/gun-64/dense',
+            'load/soup-32/text',
+            'load/soup-32/rle',
+            'load/soup-32/binary',
+            'draw/soup-32/sparse',
+        ]:
+            result = benchmarks.run_case(
+                benchmarks.parse_case_name(name),
+                min_time=0
+            )
+
+            self.assertEqual(result['name'], name)
+            self.assertEqual(result['operations'], 1)
+            self.assertTrue(result['operations_per_second'] > 0)
+            self.assertEqual(
+                result['cells_per_second'],
+                result['operations_per_second'] * result['cells']
+            )
+            self.assertTrue(result['peak_rss_kb'] > 0)
+
+    def test_run_cases_in_child_processes(self):
+        reported = []
+        results = benchmarks.run_cases(
+            [benchmarks.Case('step', 'soup-16', 'packed')],
+            min_time=0,
+            report=reported.append
+        )
+
+        self.assertEqual(reported, results)
+        self.assertEqual(results[0]['name'], 'step/soup-16/packed')
+        self.assertEqual(results[0]['unit'], 'generations')
+
+
+class CompareResultsTest(unittest.TestCase):
+
+    def create_result(self, name, cells_per_second, peak_rss_kb):
+        return {
+            'name': name,
+            'cells_per_second': cells_per_second,
+            'peak_rss_kb': peak_rss_kb,
+        }
+
+    def test_regressions(self):
+        baseline = [
+            self.create_result('fast', 100.0, 1000),
+            self.create_result('slow', 100.0, 1000),
+            self.create_result('big', 100.0, 1000),
+        ]
+        results = [
+            self.create_result('fast', 85.0, 1150),
+            self.create_result('slow', 75.0, 1000),
+            self.create_result('big', 100.0, 1300),
+            self.create_result('new', 1.0, 1),
+        ]
+
+        regressions = benchmarks.compare_results(results, baseline)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('slow: '))
+        self.assertTrue(regressions[1].startswith('big: '))
+        self.assertEqual(
+            benchmarks.compare_results(results, baseline, tolerance=0.5),
+            []
+        )
+
+    def test_save_and_load(self):
+        results = [self.create_result('step/soup-1k/dense', 1.5, 10)]
+        output_file = StringIO.StringIO()
+
+        benchmarks.save_results(results, output_file)
+        output_file.seek(0)
+
+        self.assertEqual(benchmarks.load_results(output_file), results)
@@ -0,0 +1,131 @@
+import os
+import random
+import StringIO
+import tempfile
+import unittest
+
+import mock
+
+from game_of_life import binary_format
+from game_of_life import errors
+from game_of_life.board import Board
+from game_of_life.dense_board import DenseBoard
+from game_of_life.packed_board import PackedBoard
+
+
+def create_random_board(x_size, y_size, density):
+    random.seed(0)
+    return Board(x_size, y_size, live_cells=[
+        (x, y) for x in xrange(x_size) for y in xrange(y_size)
+        if random.random() < density
+    ])
+
+
+class BinaryFormatTest(unittest.TestCase):
+
+    def setUp(self):
+        file_descriptor, self.filename = tempfile.mkstemp()
+        os.close(file_descriptor)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def _write_and_load(self, board, **kwargs):
+        with open(self.filename, 'wb') as output_file:
+            binary_format.write_board(board, output_file, **kwargs)
+        board_loader = binary_format.BinaryLoader(self.filename)
+        return board_loader.load(), board_loader.header
+
+    def test_bitmap_round_trip_is_memory_mapped(self):
+        board = create_random_board(70, 9, 0.5)
+        loaded_board, header = self._write_and_load(
+            board,
+            generation=12,
+            encoding=binary_format.BITMAP
+        )
+
+        self.assertEqual(loaded_board, board)
+        self.assertIsInstance(loaded_board, PackedBoard)
+        self.assertFalse(loaded_board.get_words().flags.owndata)
+        self.assertEqual(header.generation, 12)
+        self.assertEqual(header.population, board.get_population())
+        self.assertEqual(header.payload_offset % 8, 0)
+
+    def test_memory_mapped_board_can_step(self):
+        board = create_random_board(20, 20, 0.5)
+        loaded_board, _ = self._write_and_load(
+            DenseBoard(20, 20, board.get_live_cells()),
+            encoding=binary_format.BITMAP
+        )
+        board.step()
+        loaded_board.step()
+        self.assertEqual(loaded_board, board)
+
+    def test_run_length_round_trip(self):
+        for density in [0, 0.01, 0.5, 1]:
+            board = create_random_board(50, 40, density)
+            loaded_board, header = self._write_and_load(
+                board,
+                encoding=binary_format.RUN_LENGTH
+            )
+            self.assertEqual(loaded_board, board)
+            self.assertEqual(header.encoding, binary_format.RUN_LENGTH)
+
+    def test_rule_round_trip(self):
+        board = create_random_board(30, 20, 0.5)
+        for encoding in [binary_format.BITMAP, binary_format.RUN_LENGTH]:
+            loaded_board, header = self._write_and_load(
+                Board(30, 20, board.get_live_cells(), rule='highlife'),
+                encoding=encoding
+            )
+            self.assertEqual(header.rule, 'B36/S23')
+            self.assertEqual(str(loaded_board.rule), 'B36/S23')
+
+    def test_picks_run_length_for_sparse_boards(self):
+        _, header = self._write_and_load(Board(100, 100, [(3, 3)]))
+        self.assertEqual(header.encoding, binary_format.RUN_LENGTH)
+
+    def test_picks_run_length_without_numpy(self):
+        with mock.patch.object(binary_format, 'numpy', None):
+            loaded_board, header = self._write_and_load(
+                create_random_board(70, 9, 0.5)
+            )
+        self.assertEqual(header.encoding, binary_format.RUN_LENGTH)
+        self.assertEqual(
+            loaded_board.get_live_cells(),
+            create_random_board(70, 9, 0.5).get_live_cells()
+        )
+
+    def test_bitmap_needs_numpy(self):
+        board = create_random_board(70, 9, 0.5)
+        with open(self.filename, 'wb') as output_file:
+            binary_format.write_board(
+                board,
+                output_file,
+                encoding=binary_format.BITMAP
+            )
+        with mock.patch.object(binary_format, 'numpy', None):
+            with self.assertRaises(errors.InvalidBoardError):
+                binary_format.BinaryLoader(self.filename).load()
+            with self.assertRaises(ValueError):
+                binary_format.write_board(
+                    board,
+                    StringIO.StringIO(),
+                    encoding=binary_format.BITMAP
+                )
+
+    def test_detects_binary_files(self):
+        self._write_and_load(Board(1, 1))
+        self.assertTrue(binary_format.is_binary_board_file(self.filename))
+        self.assertFalse(
+            binary_format.is_binary_board_file('boards/blinker.txt')
+        )
+
+    def test_invalid_files_raise_invalid_board(self):
+        for contents in ['', 'GOLB', '0 1\n1 0']:
+            with self.assertRaises(errors.InvalidBoardError):
+                binary_format.read_header(StringIO.StringIO(contents))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from game_of_life import board_factory
+from game_of_life.board import INFINITE
+from game_of_life.board import TORUS
+from game_of_life.board import Board
+from game_of_life.chunked_board import ChunkedBoard
+from game_of_life.dense_board import DenseBoard
+
+
+class ChooseBoardClsTest(unittest.TestCase):
+
+    def test_sparse_board_for_low_density(self):
+        self.assertEqual(board_factory.choose_board_cls(1000, 1000, 10), Board)
+
+    def test_dense_board_for_high_density(self):
+        self.assertEqual(
+            board_factory.choose_board_cls(100, 100, 5000),
+            DenseBoard
+        )
+
+    def test_chunked_board_for_infinite_plane(self):
+        self.assertEqual(
+            board_factory.choose_board_cls(100, 100, 5000, topology=INFINITE),
+            ChunkedBoard
+        )
+
+
+class CreateBoardTest(unittest.TestCase):
+
+    def test_creates_board_with_live_cells(self):
+        board = board_factory.create_board(2, 2, live_cells=[(0, 1)])
+        self.assertEqual(board, Board(2, 2, live_cells=[(0, 1)]))
+
+    def test_creates_board_with_topology(self):
+        board = board_factory.create_board(
+            2,
+            2,
+            live_cells=[(0, 1)],
+            topology=TORUS
+        )
+        self.assertEqual(board.topology, TORUS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,49 @@
+import random
 import unittest
 
+from game_of_life.board import BOUNDED
 from game_of_life.board import Board
+from game_of_life.board import INFINITE
+from game_of_life.board import TORUS
 from game_of_life import errors
 
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+def _get_proximity(x_size, y_size, topology, (x, y)):
+    """Returns the distinct cells of the 3 x 3 square around (x, y) on a
+    board, including (x, y).
+    """
+    proximity = set()
+    for x_offset in (-1, 0, 1):
+        for y_offset in (-1, 0, 1):
+            cell_x = x + x_offset
+            cell_y = y + y_offset
+            if topology == TORUS:
+                proximity.add((cell_x % x_size, cell_y % y_size))
+            elif topology == INFINITE or \
+                    0 <= cell_x < x_size and 0 <= cell_y < y_size:
+                proximity.add((cell_x, cell_y))
+    return proximity
+
+
+def _step_cells(x_size, y_size, topology, rule, live_cells):
+    """Returns the live cells of the next generation and the number of cells
+    considered, worked out cell by cell.
+    """
+    candidates = set()
+    for cell in live_cells:
+        candidates |= _get_proximity(x_size, y_size, topology, cell)
+    next_live_cells = set()
+    for cell in candidates:
+        is_alive = cell in live_cells
+        live_neighbours = len(
+            _get_proximity(x_size, y_size, topology, cell) & live_cells
+        ) - is_alive
+        if rule.table[is_alive * 9 + live_neighbours]:
+            next_live_cells.add(cell)
+    return next_live_cells, len(candidates)
+
 
 class BoardCreationTest(unittest.TestCase):
 
@@ -63,6 +104,31 @@ class BoardStepTest(unittest.TestCase):
         self.assertEqual(board[1, 1], False)
 
 
+class BoardStepDiffTest(unittest.TestCase):
+
+    def test_no_diff_before_first_step(self):
+        board = Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        self.assertEqual(board.get_step_diff(), (frozenset(), frozenset()))
+
+    def test_diff_of_blinker(self):
+        board = Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        board.step()
+        self.assertEqual(
+            board.get_step_diff(),
+            (frozenset([(0, 1), (2, 1)]), frozenset([(1, 0), (1, 2)]))
+        )
+
+    def test_diff_of_isolated_cells(self):
+        board = Board(5, 5, live_cells=[(0, 0), (4, 4)])
+        board.step()
+        self.assertEqual(
+            board.get_step_diff(),
+            (frozenset(), frozenset([(0, 0), (4, 4)]))
+        )
+        board.step()
+        self.assertEqual(board.get_step_diff(), (frozenset(), frozenset()))
+
+
 class BoardEqualTest(unittest.TestCase):
 
     def test_equal(self):
@@ -72,6 +138,185 @@ class BoardEqualTest(unittest.TestCase):
         self.assertNotEqual(board_1, board_2)
         self.assertEqual(board_1, board_3)
 
+class BoardTopologyTest(unittest.TestCase):
+
+    def test_unknown_topology(self):
+        with self.assertRaises(ValueError):
+            Board(1, 1, topology='sphere')
+
+    def test_blinker_wraps_around_torus(self):
+        board = Board(
+            5,
+            5,
+            live_cells=[(0, 1), (0, 2), (0, 3)],
+            topology=TORUS
+        )
+        board.step()
+        self.assertEqual(
+            board.get_live_cells(),
+            frozenset([(4, 2), (0, 2), (1, 2)])
+        )
+
+    def test_glider_comes_back_around_torus(self):
+        board = Board(6, 6, live_cells=GLIDER, topology=TORUS)
+        for _ in xrange(24):
+            board.step()
+        self.assertEqual(board.get_live_cells(), frozenset(GLIDER))
+        self.assertEqual(board.snapshot().topology, TORUS)
+
+    def test_glider_leaves_infinite_window(self):
+        board = Board(3, 3, live_cells=GLIDER, topology=INFINITE)
+        for _ in xrange(40):
+            board.step()
+        self.assertEqual(
+            board.get_live_cells(),
+            frozenset((x + 10, y + 10) for x, y in GLIDER)
+        )
+        self.assertEqual(board.get_region_array(0, 0, 3, 3).sum(), 0)
+
+    def test_infinite_board_takes_cells_outside_window(self):
+        board = Board(1, 1, live_cells=[(-5, 7)], topology=INFINITE)
+        self.assertEqual(board[-5, 7], True)
+
+    def test_matches_cell_by_cell_step_on_every_topology(self):
+        random.seed(0)
+        for topology in [BOUNDED, TORUS, INFINITE]:
+            for x_size, y_size, rule in [
+                (1, 1, 'B3/S23'),
+                (2, 3, 'B1/S012345678'),
+                (3, 2, 'B2/S'),
+                (12, 9, 'B3/S23'),
+                (12, 9, 'B36/S0238'),
+            ]:
+                live_cells = set(
+                    (x, y) for x in xrange(x_size) for y in xrange(y_size)
+                    if random.random() < 0.4
+                )
+                board = Board(
+                    x_size,
+                    y_size,
+                    live_cells=live_cells,
+                    topology=topology,
+                    rule=rule
+                )
+                for _ in xrange(8):
+                    live_cells, candidate_count = _step_cells(
+                        x_size,
+                        y_size,
+                        topology,
+                        board.rule,
+                        live_cells
+                    )
+                    board.step()
+                    self.assertEqual(board.get_live_cells(), live_cells)
+                    self.assertEqual(board.candidate_count, candidate_count)
+
+
+class BoardRuleTest(unittest.TestCase):
+
+    def test_defaults_to_conway(self):
+        self.assertEqual(str(Board(1, 1).rule), 'B3/S23')
+
+    def test_six_neighbours_bring_cell_to_life_in_highlife(self):
+        live_cells = [(0, 0), (1, 0), (2, 0), (0, 2), (1, 2), (2, 2)]
+        board = Board(3, 3, live_cells=live_cells, rule='highlife')
+        board.step()
+        self.assertEqual(board[1, 1], True)
+        self.assertEqual(str(board.snapshot().rule), 'B36/S23')
+
+    def test_no_cell_survives_in_seeds(self):
+        board = Board(4, 4, live_cells=[(1, 1), (1, 2)], rule='B2/S')
+        board.step()
+        self.assertEqual(
+            board.get_live_cells(),
+            frozenset([(0, 1), (0, 2), (2, 1), (2, 2)])
+        )
+
+    def test_invalid_rule(self):
+        with self.assertRaises(errors.InvalidRuleError):
+            Board(1, 1, rule='B0/S8')
+
+
+class BoardRegionTest(unittest.TestCase):
+
+    def test_region_array(self):
+        board = Board(4, 3, live_cells=[(0, 0), (2, 1), (3, 2)])
+        self.assertEqual(
+            board.get_region_array(1, 1, 4, 3).tolist(),
+            [[0, 1, 0], [0, 0, 1]]
+        )
+
+    def test_region_smaller_than_population(self):
+        board = Board(4, 3, live_cells=[
+            (x, y) for x in xrange(4) for y in xrange(3) if x != y
+        ])
+        self.assertEqual(
+            board.get_region_array(1, 1, 3, 2).tolist(),
+            [[0, 1]]
+        )
+
+    def test_region_of_infinite_board(self):
+        board = Board(2, 2, live_cells=[(-3, 5), (1, 1)], topology=INFINITE)
+        self.assertEqual(
+            board.get_region_array(-4, 4, -2, 6).tolist(),
+            [[0, 0], [0, 1]]
+        )
+
+    def test_block_populations(self):
+        board = Board(5, 3, live_cells=[(0, 0), (1, 1), (2, 1), (4, 2)])
+        self.assertEqual(
+            board.get_block_populations(0, 0, 5, 3, 2).tolist(),
+            [[2, 1, 0], [0, 0, 1]]
+        )
+
+
+class BoardStatisticsTest(unittest.TestCase):
+
+    def test_statistics_are_not_tracked_by_default(self):
+        board = Board(3, 3, live_cells=GLIDER)
+        board.step()
+        self.assertIsNone(board.statistics)
+
+    def test_step_updates_statistics(self):
+        board = Board(4, 4, live_cells=GLIDER)
+        statistics = board.track_statistics()
+        self.assertIs(board.track_statistics(), statistics)
+
+        board.step()
+
+        born_cells, died_cells = board.get_step_diff()
+        self.assertEqual(statistics.step_count, 1)
+        self.assertEqual(statistics.population, 5)
+        self.assertEqual(
+            (statistics.births, statistics.deaths),
+            (len(born_cells), len(died_cells))
+        )
+        self.assertEqual(statistics.get_bounding_box(), (0, 1, 3, 4))
+        self.assertEqual(
+            set(statistics.get_heatmap()),
+            born_cells | died_cells
+        )
+
+    def test_statistics_count_isolated_cells(self):
+        for rule, expected_deaths in [('B3/S23', 2), ('B3/S0', 0)]:
+            board = Board(5, 5, live_cells=[(0, 0), (4, 4)], rule=rule)
+            statistics = board.track_statistics()
+            board.step()
+
+            born_cells, died_cells = board.get_step_diff()
+            self.assertEqual(statistics.deaths, expected_deaths)
+            self.assertEqual(statistics.deaths, len(died_cells))
+            self.assertEqual(statistics.population, board.get_population())
+            self.assertEqual(
+                set(statistics.get_heatmap()),
+                born_cells | died_cells
+            )
+
+    def test_snapshot_does_not_track_statistics(self):
+        board = Board(3, 3, live_cells=GLIDER)
+        board.track_statistics()
+        self.assertIsNone(board.snapshot().statistics)
+
 
 if __name__ == '__main__':
     unittest.main()
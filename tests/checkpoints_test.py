@@ -0,0 +1,258 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+import game_of_life_runner
+from game_of_life import checkpoints
+from game_of_life import errors
+from game_of_life.binary_format import BinaryLoader
+from game_of_life.board import BOUNDED
+from game_of_life.board import TORUS
+from game_of_life.board import Board
+from game_of_life.packed_board import PackedBoard
+from game_of_life.rules import CONWAY
+from game_of_life.rules import parse_rule
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+class CheckpointerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _list_boards(self):
+        return sorted(
+            filename for filename in os.listdir(self.directory)
+            if filename.endswith('.golb')
+        )
+
+    def test_latest_checkpoint_can_be_loaded(self):
+        board = Board(8, 8, live_cells=GLIDER, topology=TORUS, rule='highlife')
+        checkpointer = checkpoints.Checkpointer(
+            self.directory,
+            engine='packed',
+            background=False
+        )
+        checkpointer.save(board, 12)
+
+        checkpoint = checkpoints.find_latest_checkpoint(self.directory)
+
+        self.assertEqual(checkpoint.generation, 12)
+        self.assertEqual(checkpoint.engine, 'packed')
+        self.assertEqual(checkpoint.topology, TORUS)
+        self.assertEqual(checkpoint.rule, parse_rule('highlife'))
+        loader = BinaryLoader(checkpoint.filename)
+        self.assertEqual(loader.load(), board)
+        self.assertEqual(loader.header.generation, 12)
+
+    def test_checkpoints_are_due_every_interval_generations(self):
+        checkpointer = checkpoints.Checkpointer(
+            self.directory,
+            interval_generations=10,
+            interval_seconds=None,
+            background=False,
+            checkpoints_to_keep=2,
+            first_generation=5
+        )
+        board = Board(8, 8, live_cells=GLIDER)
+        for generation in xrange(6, 40, 3):
+            checkpointer.update(board, generation)
+
+        self.assertEqual(
+            self._list_boards(),
+            ['checkpoint-000000000027.golb', 'checkpoint-000000000039.golb']
+        )
+        self.assertEqual(
+            checkpoints.find_latest_checkpoint(self.directory).generation,
+            39
+        )
+
+    def test_only_the_latest_checkpoint_can_be_kept(self):
+        checkpointer = checkpoints.Checkpointer(
+            self.directory,
+            background=False,
+            checkpoints_to_keep=1
+        )
+        board = Board(8, 8, live_cells=GLIDER)
+        for generation in [10, 20]:
+            checkpointer.save(board, generation)
+
+        self.assertEqual(self._list_boards(), ['checkpoint-000000000020.golb'])
+
+    def test_at_least_one_checkpoint_is_kept(self):
+        with self.assertRaises(ValueError):
+            checkpoints.Checkpointer(self.directory, checkpoints_to_keep=0)
+
+    def test_directory_is_synced_after_rename(self):
+        checkpointer = checkpoints.Checkpointer(
+            self.directory,
+            background=False
+        )
+        with mock.patch.object(
+            checkpoints.os,
+            'open',
+            wraps=os.open
+        ) as open_mock:
+            checkpointer.save(Board(8, 8, live_cells=GLIDER), 10)
+
+        open_mock.assert_called_with(self.directory, os.O_RDONLY)
+
+    def test_background_checkpoints_are_written_by_close(self):
+        checkpointer = checkpoints.Checkpointer(self.directory)
+        checkpointer.save(PackedBoard(70, 3, live_cells=[(69, 2)]), 1)
+        checkpointer.save(PackedBoard(70, 3, live_cells=[(0, 0)]), 2)
+        checkpointer.close()
+
+        checkpoint = checkpoints.find_latest_checkpoint(self.directory)
+        self.assertEqual(checkpoint.generation, 2)
+        self.assertEqual(
+            BinaryLoader(checkpoint.filename).load().get_live_cells(),
+            frozenset([(0, 0)])
+        )
+        self.assertEqual(
+            [
+                filename for filename in os.listdir(self.directory)
+                if filename.startswith('.')
+            ],
+            []
+        )
+
+    def test_background_errors_are_raised(self):
+        checkpointer = checkpoints.Checkpointer(self.directory)
+        board = mock.Mock(spec=['x_size', 'y_size', 'get_population'])
+        board.get_population.side_effect = ValueError
+
+        checkpointer.save(board, 1)
+        with self.assertRaises(ValueError):
+            checkpointer.close()
+
+    def test_manifest_without_topology_and_rule(self):
+        checkpoints.Checkpointer(self.directory, background=False).save(
+            Board(8, 8, live_cells=GLIDER),
+            3
+        )
+        manifest_filename = os.path.join(
+            self.directory,
+            checkpoints.MANIFEST_FILENAME
+        )
+        with open(manifest_filename) as manifest_file:
+            manifest = json.load(manifest_file)
+        del manifest['topology'], manifest['rule']
+        with open(manifest_filename, 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        checkpoint = checkpoints.find_latest_checkpoint(self.directory)
+
+        self.assertEqual(checkpoint.topology, BOUNDED)
+        self.assertEqual(checkpoint.rule, CONWAY)
+
+    def test_missing_checkpoint(self):
+        with self.assertRaises(errors.CheckpointError):
+            checkpoints.find_latest_checkpoint(self.directory)
+
+
+class ResumeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _create_args(self, **kwargs):
+        args = dict(
+            filename=None,
+            engine=None,
+            topology=None,
+            rule=None,
+            workers=None,
+            animator='print_all',
+            step_to_print=None,
+            generations_per_frame=1,
+            fps=1.0,
+            checkpoint_dir=self.directory,
+            checkpoint_every=None,
+            checkpoint_interval=None,
+            checkpoints_to_keep=checkpoints.DEFAULT_CHECKPOINTS_TO_KEEP,
+            history_memory=0,
+            record=None,
+            resume=True
+        )
+        args.update(kwargs)
+        return argparse.Namespace(**args)
+
+    def test_resume_from_latest_checkpoint(self):
+        board = Board(8, 8, live_cells=GLIDER)
+        checkpoints.Checkpointer(
+            self.directory,
+            engine='sparse',
+            background=False
+        ).save(board, 40)
+        creator = game_of_life_runner.RunnerCreatorFromArgs(
+            self._create_args()
+        )
+
+        loaded_board = creator._create_loader().load()
+        animator = creator._create_animator(mock.Mock())
+
+        self.assertIsInstance(loaded_board, Board)
+        self.assertEqual(loaded_board, board)
+        self.assertEqual(animator._first_generation, 40)
+        self.assertIsInstance(
+            animator._checkpointer,
+            checkpoints.Checkpointer
+        )
+
+    def test_resume_with_the_topology_and_rule_of_the_checkpoint(self):
+        board = Board(100, 100, GLIDER, topology=TORUS, rule='highlife')
+        checkpoints.Checkpointer(self.directory, background=False).save(
+            board,
+            40
+        )
+        creator = game_of_life_runner.RunnerCreatorFromArgs(
+            self._create_args()
+        )
+
+        loaded_board = creator._create_loader().load()
+
+        self.assertIsInstance(loaded_board, Board)
+        self.assertEqual(loaded_board.track_statistics().population, 5)
+        self.assertEqual(loaded_board.topology, TORUS)
+        self.assertEqual(loaded_board.rule, parse_rule('highlife'))
+        self.assertEqual(loaded_board, board)
+
+    def test_resume_rebuilds_bitmap_checkpoints(self):
+        live_cells = [(x, y) for x in xrange(70) for y in xrange(3) if x > y]
+        checkpoints.Checkpointer(self.directory, background=False).save(
+            PackedBoard(70, 3, live_cells),
+            2
+        )
+        creator = game_of_life_runner.RunnerCreatorFromArgs(
+            self._create_args()
+        )
+
+        loaded_board = creator._create_loader().load()
+
+        self.assertNotIsInstance(loaded_board, PackedBoard)
+        self.assertEqual(loaded_board.get_live_cells(), frozenset(live_cells))
+
+    def test_resume_needs_a_checkpoint_directory(self):
+        for kwargs in [{'checkpoint_dir': None}, {'filename': 'board.txt'}]:
+            creator = game_of_life_runner.RunnerCreatorFromArgs(
+                self._create_args(**kwargs)
+            )
+            with self.assertRaises(argparse.ArgumentTypeError):
+                creator._create_loader()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import random
+import unittest
+
+from game_of_life.board import BOUNDED
+from game_of_life.board import INFINITE
+from game_of_life.board import Board
+from game_of_life.chunked_board import TILE_SIZE
+from game_of_life.chunked_board import ChunkedBoard
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+class ChunkedBoardCreationTest(unittest.TestCase):
+
+    def test_cells_anywhere_on_the_plane(self):
+        live_cells = [(0, 0), (-1, -1), (TILE_SIZE, 3), (-1000, 5000)]
+        board = ChunkedBoard(1, 1, live_cells=live_cells)
+
+        self.assertEqual(board.get_live_cells(), frozenset(live_cells))
+        self.assertEqual(board.get_population(), 4)
+        self.assertEqual(board.get_tile_count(), 4)
+        self.assertEqual(board[-1, -1], True)
+        self.assertEqual(board[-1, 0], False)
+        self.assertEqual(board[7, 7000], False)
+
+    def test_only_the_infinite_topology_is_supported(self):
+        with self.assertRaises(ValueError):
+            ChunkedBoard(1, 1, topology=BOUNDED)
+
+
+class ChunkedBoardStepTest(unittest.TestCase):
+
+    def test_matches_sparse_board_on_random_soup(self):
+        random.seed(0)
+        live_cells = [
+            (x, y)
+            for x in xrange(-TILE_SIZE - 10, TILE_SIZE + 10)
+            for y in xrange(-20, 20)
+            if random.random() < 0.4
+        ]
+        board = Board(10, 10, live_cells=live_cells, topology=INFINITE)
+        chunked_board = ChunkedBoard(10, 10, live_cells=live_cells)
+
+        for _ in xrange(30):
+            board.step()
+            chunked_board.step()
+            self.assertEqual(chunked_board, board)
+            self.assertEqual(
+                chunked_board.get_step_diff(),
+                board.get_step_diff()
+            )
+
+    def test_matches_sparse_board_with_other_rule(self):
+        random.seed(1)
+        live_cells = [
+            (x, y) for x in xrange(-20, 20) for y in xrange(-20, 20)
+            if random.random() < 0.5
+        ]
+        board = Board(
+            10,
+            10,
+            live_cells=live_cells,
+            topology=INFINITE,
+            rule='day-and-night'
+        )
+        chunked_board = ChunkedBoard(
+            10,
+            10,
+            live_cells=live_cells,
+            rule='day-and-night'
+        )
+
+        for _ in xrange(20):
+            board.step()
+            chunked_board.step()
+            self.assertEqual(chunked_board, board)
+
+    def test_tiles_follow_glider(self):
+        board = ChunkedBoard(3, 3, live_cells=GLIDER)
+        for _ in xrange(4 * 2 * TILE_SIZE):
+            board.step()
+
+        offset = 2 * TILE_SIZE
+        self.assertEqual(
+            board.get_live_cells(),
+            frozenset((x + offset, y + offset) for x, y in GLIDER)
+        )
+        self.assertEqual(board.get_tile_count(), 1)
+
+    def test_empty_tiles_are_freed(self):
+        board = ChunkedBoard(1, 1, live_cells=[(0, 0), (TILE_SIZE, 0)])
+        board.step()
+        self.assertEqual(board.get_tile_count(), 0)
+        self.assertEqual(
+            board.get_step_diff(),
+            (frozenset(), frozenset([(0, 0), (TILE_SIZE, 0)]))
+        )
+
+    def test_snapshot_is_not_changed_by_steps(self):
+        board = ChunkedBoard(3, 3, live_cells=GLIDER)
+        snapshot = board.snapshot()
+        board.step()
+        self.assertEqual(snapshot.get_live_cells(), frozenset(GLIDER))
+
+
+class ChunkedBoardRegionTest(unittest.TestCase):
+
+    def test_matches_sparse_board(self):
+        random.seed(0)
+        live_cells = [
+            (x, y) for x in xrange(-70, 70) for y in xrange(-5, 70)
+            if random.random() < 0.3
+        ]
+        board = Board(70, 70, live_cells=live_cells, topology=INFINITE)
+        chunked_board = ChunkedBoard(70, 70, live_cells=live_cells)
+
+        for region in [
+            (0, 0, 70, 70),
+            (-70, -5, 0, 0),
+            (60, 3, 69, 68),
+            (-1000, -1000, 1000, 1000),
+        ]:
+            self.assertEqual(
+                chunked_board.get_region_array(*region).tolist(),
+                board.get_region_array(*region).tolist()
+            )
+            self.assertEqual(
+                sorted(chunked_board._get_live_cells_in_region(*region)),
+                sorted(board._get_live_cells_in_region(*region))
+            )
+            self.assertEqual(
+                chunked_board.get_block_populations(*region + (8,)).tolist(),
+                board.get_block_populations(*region + (8,)).tolist()
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
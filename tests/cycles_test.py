@@ -0,0 +1,104 @@
+import unittest
+
+import mock
+
+from game_of_life.board import INFINITE
+from game_of_life.board import Board
+from game_of_life.cycles import FINGERPRINT_BYTES
+from game_of_life.cycles import CycleDetector
+from game_of_life.dense_board import DenseBoard
+
+BLINKER = [(1, 0), (1, 1), (1, 2)]
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+class CycleDetectorTest(unittest.TestCase):
+
+    def test_detects_oscillator(self):
+        cycle_detector = CycleDetector(Board(3, 3, live_cells=BLINKER))
+        cycle_detector.advance(5)
+        self.assertEqual(cycle_detector.period, 2)
+        self.assertEqual(cycle_detector.cycle_start, 0)
+
+    def test_detects_still_life_after_transient(self):
+        cycle_detector = CycleDetector(Board(6, 6, live_cells=GLIDER))
+        cycle_detector.advance(100)
+        self.assertEqual(cycle_detector.period, 1)
+        self.assertGreater(cycle_detector.cycle_start, 0)
+
+    def test_stops_stepping_board_once_cycle_is_found(self):
+        board = Board(3, 3, live_cells=BLINKER)
+        cycle_detector = CycleDetector(board)
+        with mock.patch.object(board, 'step', wraps=board.step) as step:
+            cycle_detector.advance(10 ** 9)
+        # The cycle is confirmed by stepping through it a second time.
+        self.assertEqual(step.call_count, 4)
+        self.assertEqual(cycle_detector.generation, 10 ** 9)
+
+    def test_generations_are_told_apart_by_fingerprints(self):
+        with mock.patch.object(
+            DenseBoard,
+            'get_live_cells',
+            autospec=True,
+            side_effect=DenseBoard.get_live_cells
+        ) as get_live_cells:
+            cycle_detector = CycleDetector(
+                DenseBoard(3, 3, live_cells=BLINKER)
+            )
+            cycle_detector.advance(1000)
+        self.assertEqual(cycle_detector.period, 2)
+        # Only to compare the board to the snapshot of the candidate cycle.
+        self.assertEqual(get_live_cells.call_count, 2)
+
+    def test_colliding_fingerprints_are_not_cycles(self):
+        board = Board(6, 6, live_cells=GLIDER)
+        with mock.patch.object(board, 'get_fingerprint', return_value=0):
+            cycle_detector = CycleDetector(board)
+            cycle_detector.advance(10)
+        self.assertFalse(cycle_detector.has_found_cycle())
+
+    def test_looks_up_generations_in_cycle(self):
+        board = Board(3, 3, live_cells=BLINKER)
+        cycle_detector = CycleDetector(Board(3, 3, live_cells=BLINKER))
+        for generations in [1, 2, 7, 1000]:
+            cycle_detector.advance(generations)
+            for _ in xrange(generations):
+                board.step()
+            self.assertEqual(cycle_detector.get_board(), board)
+
+    def test_oscillator_crossing_the_edge_of_the_infinite_window(self):
+        live_cells = [(0, 0), (1, 0), (2, 0)]
+        board = Board(3, 1, live_cells=live_cells, topology=INFINITE)
+        cycle_detector = CycleDetector(
+            Board(3, 1, live_cells=live_cells, topology=INFINITE)
+        )
+        cycle_detector.advance(5)
+        for _ in xrange(5):
+            board.step()
+
+        cycle_board = cycle_detector.get_board()
+        self.assertTrue(cycle_detector.has_found_cycle())
+        self.assertEqual(cycle_board.topology, INFINITE)
+        self.assertEqual(cycle_board, board)
+
+    def test_rebuilt_board_keeps_the_rule(self):
+        cycle_detector = CycleDetector(
+            Board(3, 3, live_cells=BLINKER, rule='highlife')
+        )
+        cycle_detector.advance(5)
+
+        self.assertTrue(cycle_detector.has_found_cycle())
+        self.assertEqual(str(cycle_detector.get_board().rule), 'B36/S23')
+
+    def test_forgets_old_generations(self):
+        cycle_detector = CycleDetector(
+            Board(3, 3, live_cells=BLINKER),
+            max_bytes=FINGERPRINT_BYTES
+        )
+        cycle_detector.advance(10)
+        self.assertFalse(cycle_detector.has_found_cycle())
+        self.assertEqual(cycle_detector.generation, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import random
+import unittest
+
+from game_of_life import errors
+from game_of_life.board import INFINITE
+from game_of_life.board import TORUS
+from game_of_life.board import Board
+from game_of_life.dense_board import DenseBoard
+
+
+class DenseBoardCreationTest(unittest.TestCase):
+
+    def test_create_empty_board_and_check_location(self):
+        board = DenseBoard(1, 1)
+        self.assertEqual(board[0, 0], False)
+
+    def test_board_with_valid_cell(self):
+        board = DenseBoard(1, 2, live_cells=[(0, 1)])
+        self.assertEqual(board[0, 1], True)
+
+    def test_out_of_bounds_lookup_is_dead(self):
+        board = DenseBoard(1, 1, live_cells=[(0, 0)])
+        for cell in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
+            self.assertEqual(board[cell], False)
+
+    def test_cant_create_live_cells_out_of_bounds(self):
+        for invalid_cell in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
+            with self.assertRaises(errors.InvalidBoardError):
+                DenseBoard(1, 1, live_cells=[invalid_cell])
+
+    def test_from_array_copies_cells(self):
+        board = DenseBoard(3, 2, live_cells=[(0, 0), (2, 1)])
+        cells = board.to_array().copy()
+
+        from_array = DenseBoard.from_array(cells)
+        cells[0, 1] = 1
+
+        self.assertEqual(from_array, board)
+
+
+class DenseBoardStepTest(unittest.TestCase):
+
+    def test_blinker_oscillates(self):
+        board = DenseBoard(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        board.step()
+        self.assertEqual(
+            board.get_live_cells(),
+            frozenset([(0, 1), (1, 1), (2, 1)])
+        )
+
+    def test_matches_sparse_board_on_random_soup(self):
+        random.seed(0)
+        live_cells = [
+            (x, y) for x in xrange(30) for y in xrange(20)
+            if random.random() < 0.4
+        ]
+        sparse_board = Board(30, 20, live_cells=live_cells)
+        dense_board = DenseBoard(30, 20, live_cells=live_cells)
+
+        for _ in xrange(10):
+            sparse_board.step()
+            dense_board.step()
+            self.assertEqual(dense_board, sparse_board)
+
+    def test_matches_sparse_board_on_torus(self):
+        random.seed(1)
+        live_cells = [
+            (x, y) for x in xrange(30) for y in xrange(20)
+            if random.random() < 0.4
+        ]
+        sparse_board = Board(30, 20, live_cells=live_cells, topology=TORUS)
+        dense_board = DenseBoard(30, 20, live_cells=live_cells, topology=TORUS)
+
+        for _ in xrange(30):
+            sparse_board.step()
+            dense_board.step()
+            self.assertEqual(dense_board, sparse_board)
+        self.assertEqual(dense_board.snapshot().topology, TORUS)
+
+    def test_matches_sparse_board_with_other_rules(self):
+        random.seed(2)
+        live_cells = [
+            (x, y) for x in xrange(30) for y in xrange(20)
+            if random.random() < 0.4
+        ]
+        for rule in ['highlife', 'day-and-night', 'seeds', 'B1/S012345678']:
+            sparse_board = Board(30, 20, live_cells=live_cells, rule=rule)
+            dense_board = DenseBoard(30, 20, live_cells=live_cells, rule=rule)
+
+            for _ in xrange(10):
+                sparse_board.step()
+                dense_board.step()
+                self.assertEqual(dense_board, sparse_board)
+            self.assertEqual(dense_board.snapshot().rule, sparse_board.rule)
+
+    def test_infinite_topology_is_not_supported(self):
+        with self.assertRaises(ValueError):
+            DenseBoard(1, 1, topology=INFINITE)
+
+
+class DenseBoardEqualTest(unittest.TestCase):
+
+    def test_equal_to_sparse_board(self):
+        self.assertEqual(DenseBoard(2, 1, [(1, 0)]), Board(2, 1, [(1, 0)]))
+        self.assertNotEqual(DenseBoard(2, 1, [(1, 0)]), Board(2, 1))
+        self.assertNotEqual(DenseBoard(2, 1), Board(1, 2))
+
+
+class DenseBoardStepDiffTest(unittest.TestCase):
+
+    def test_diff_of_blinker(self):
+        board = DenseBoard(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        self.assertEqual(board.get_step_diff(), (frozenset(), frozenset()))
+        board.step()
+        self.assertEqual(
+            board.get_step_diff(),
+            (frozenset([(0, 1), (2, 1)]), frozenset([(1, 0), (1, 2)]))
+        )
+
+
+
+class DenseBoardRegionTest(unittest.TestCase):
+
+    def test_matches_sparse_board(self):
+        random.seed(0)
+        live_cells = [
+            (x, y) for x in xrange(30) for y in xrange(20)
+            if random.random() < 0.3
+        ]
+        board = Board(30, 20, live_cells=live_cells)
+        dense_board = DenseBoard(30, 20, live_cells=live_cells)
+
+        for region in [(0, 0, 30, 20), (3, 5, 17, 19), (29, 0, 30, 1)]:
+            self.assertEqual(
+                dense_board.get_region_array(*region).tolist(),
+                board.get_region_array(*region).tolist()
+            )
+            for block_size in [1, 2, 3, 8]:
+                self.assertEqual(
+                    dense_board.get_block_populations(
+                        *region + (block_size,)
+                    ).tolist(),
+                    board.get_block_populations(
+                        *region + (block_size,)
+                    ).tolist()
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
+import random
 import unittest
 
 from game_of_life import drawer
 from game_of_life.board import Board
+from game_of_life.dense_board import DenseBoard
+from game_of_life.hashlife import HashLifeBoard
+from game_of_life.packed_board import PackedBoard
+from game_of_life.viewport import Viewport
 
 
 class DrawerTest(unittest.TestCase):
@@ -16,6 +21,72 @@ class DrawerTest(unittest.TestCase):
         ).draw(board)
         self.assertEqual(results, 'O O\nX O')
 
+    def test_bulk_drawing_matches_drawing_cell_by_cell(self):
+        random.seed(0)
+        live_cells = [
+            (x, y) for x in xrange(17) for y in xrange(9)
+            if random.random() < 0.3
+        ]
+        for board_cls in [Board, DenseBoard, PackedBoard, HashLifeBoard]:
+            for characters in [('1', '0'), (' ', 'X'), ('\xe2\x96\x88', '  .')]:
+                board_drawer = drawer.Drawer(*characters)
+                self.assertIsNotNone(board_drawer._cell_lookup_table)
+
+                board = board_cls(17, 9, live_cells=live_cells)
+                results = board_drawer.draw(board)
+                board_drawer._cell_lookup_table = None
+                self.assertEqual(results, board_drawer.draw(board))
+
+    def test_empty_boards(self):
+        self.assertEqual(drawer.Drawer().draw(Board(0, 3)), '\n\n')
+        self.assertEqual(drawer.Drawer().draw(Board(3, 0)), '')
+
+    def test_cell_position_matches_draw(self):
+        board = Board(3, 2, live_cells=[(2, 1)])
+        drawn_rows = drawer.Drawer().draw(board).splitlines()
+        row, column = drawer.Drawer().get_cell_position((2, 1))
+        self.assertEqual(drawn_rows[row][column], '1')
+
+    def test_can_draw_cells_in_place_with_same_width_characters(self):
+        self.assertTrue(drawer.Drawer().can_draw_cells_in_place())
+        self.assertFalse(
+            drawer.Drawer(live_cell_character='XX').can_draw_cells_in_place()
+        )
+
+
+    def test_viewport_at_zoom_level_1_draws_its_cells(self):
+        board = Board(6, 4, live_cells=[(1, 1), (3, 2), (4, 2)])
+        viewport = Viewport(6, 4, 5, 2)
+        viewport.pan(1, 1)
+        self.assertEqual(viewport.get_region(), (1, 1, 4, 3))
+
+        for characters in [('1', '0'), (u'\u2588', u' ')]:
+            board_drawer = drawer.Drawer(*characters)
+            expected = '\n'.join(
+                ' '.join(
+                    board_drawer.draw_cell(board[x, y]) for x in xrange(1, 4)
+                )
+                for y in xrange(1, 3)
+            )
+            self.assertEqual(
+                board_drawer.draw_viewport(board, viewport),
+                expected
+            )
+
+    def test_zoomed_out_viewport_draws_block_densities(self):
+        live_cells = [(x, y) for x in xrange(4) for y in xrange(4)]
+        live_cells += [(4, 0), (6, 3)]
+        for board_cls in [Board, DenseBoard, PackedBoard, HashLifeBoard]:
+            board = board_cls(8, 5, live_cells=live_cells)
+            viewport = Viewport(8, 5, 2, 2)
+            viewport.zoom_out()
+            viewport.zoom_out()
+            self.assertEqual(viewport.zoom, 4)
+            self.assertEqual(
+                drawer.Drawer().draw_viewport(board, viewport),
+                '@:\n  '
+            )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,279 @@
+import struct
+import unittest
+import zlib
+
+from game_of_life import exporters
+from game_of_life.board import Board
+from game_of_life.dense_board import numpy
+from game_of_life.generations import Frame
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+def export(exporter, board, frame_count):
+    """Returns the export of `frame_count` generations of `board` and the
+    (y_size, x_size) cell arrays of the generations.
+    """
+    data = exporter.get_header(board)
+    cells = []
+    for generation in xrange(frame_count):
+        if generation:
+            board.step()
+        cells.append(board.get_region_array(0, 0, board.x_size, board.y_size))
+        data += exporter.encode(
+            Frame(generation, board.snapshot(), frozenset(), frozenset())
+        )
+    return data + exporter.get_trailer(), cells
+
+
+def decode_lzw(data, min_code_size):
+    """Decodes GIF LZW data, following the GIF specification."""
+    bits = ''.join(bin(ord(byte))[2:].zfill(8)[::-1] for byte in data)
+    clear_code = 1 << min_code_size
+    end_code = clear_code + 1
+    position = 0
+    output = []
+    table = None
+    previous = None
+    while True:
+        if table is None or len(table) == 1 << 12:
+            table = [[index] for index in xrange(clear_code + 2)]
+        code_width = max(len(table).bit_length(), min_code_size + 1)
+        if previous is None or len(table) == clear_code + 2:
+            code_width = min_code_size + 1
+        code = int(bits[position:position + code_width][::-1], 2)
+        position += code_width
+        if code == clear_code:
+            table = None
+            previous = None
+            continue
+        elif code == end_code:
+            return output
+
+        if code < len(table):
+            entry = table[code]
+            if previous is not None:
+                table.append(previous + entry[:1])
+        else:
+            entry = previous + previous[:1]
+            table.append(entry)
+        output.extend(entry)
+        previous = entry
+
+
+def decode_gif(data):
+    """Returns the (width, height) of a GIF and the array of pixels of every
+    frame, drawn over the frame before.
+    """
+    assert data[:6] == 'GIF89a'
+    width, height, flags = struct.unpack('<HHB', data[6:11])
+    position = 13 + 3 * (2 << (flags & 7))
+    pixels = numpy.zeros((height, width), dtype=numpy.uint8)
+    frames = []
+    while data[position] != ';':
+        if data[position] == '!':
+            position += 2
+            while data[position] != '\x00':
+                position += ord(data[position]) + 1
+            position += 1
+            continue
+
+        assert data[position] == ','
+        x, y, frame_width, frame_height, _ = struct.unpack(
+            '<HHHHB',
+            data[position + 1:position + 10]
+        )
+        min_code_size = ord(data[position + 10])
+        position += 11
+        sub_blocks = []
+        while data[position] != '\x00':
+            size = ord(data[position])
+            sub_blocks.append(data[position + 1:position + 1 + size])
+            position += size + 1
+        position += 1
+        frame_pixels = decode_lzw(''.join(sub_blocks), min_code_size)
+        pixels = pixels.copy()
+        pixels[y:y + frame_height, x:x + frame_width] = numpy.array(
+            frame_pixels,
+            dtype=numpy.uint8
+        ).reshape((frame_height, frame_width))
+        frames.append(pixels)
+    assert position == len(data) - 1
+    return (width, height), frames
+
+
+def decode_apng(data):
+    """Returns the (width, height) of an APNG, its number of frames and the
+    array of pixels of every frame, drawn over the frame before.
+    """
+    assert data[:8] == '\x89PNG\r\n\x1a\n'
+    position = 8
+    chunks = []
+    while position < len(data):
+        length, = struct.unpack('>I', data[position:position + 4])
+        chunk_type = data[position + 4:position + 8]
+        chunk_data = data[position + 8:position + 8 + length]
+        crc, = struct.unpack(
+            '>I',
+            data[position + 8 + length:position + 12 + length]
+        )
+        assert crc == zlib.crc32(chunk_type + chunk_data) & 0xffffffff
+        chunks.append((chunk_type, chunk_data))
+        position += length + 12
+
+    width, height = struct.unpack('>II', chunks[0][1][:8])
+    frame_count, _ = struct.unpack('>II', chunks[2][1])
+    sequence_numbers = []
+    pixels = numpy.zeros((height, width), dtype=numpy.uint8)
+    frames = []
+    for chunk_type, chunk_data in chunks[3:]:
+        if chunk_type == 'fcTL':
+            sequence_number, frame_width, frame_height, x, y = \
+                struct.unpack('>IIIII', chunk_data[:20])
+            sequence_numbers.append(sequence_number)
+            continue
+        elif chunk_type == 'fdAT':
+            sequence_numbers.append(
+                struct.unpack('>I', chunk_data[:4])[0]
+            )
+            chunk_data = chunk_data[4:]
+        elif chunk_type != 'IDAT':
+            assert chunk_type == 'IEND'
+            break
+
+        rows = numpy.frombuffer(
+            zlib.decompress(chunk_data),
+            dtype=numpy.uint8
+        ).reshape((frame_height, -1))
+        assert not rows[:, 0].any()
+        pixels = pixels.copy()
+        pixels[y:y + frame_height, x:x + frame_width] = \
+            numpy.unpackbits(rows[:, 1:], axis=1)[:, :frame_width]
+        frames.append(pixels)
+    assert sequence_numbers == range(len(sequence_numbers))
+    return (width, height), frame_count, frames
+
+
+def scale(cells, factor):
+    return cells.repeat(factor, axis=0).repeat(factor, axis=1)
+
+
+class GifExporterTest(unittest.TestCase):
+
+    def test_frames_decode_to_the_scaled_cells(self):
+        for board_scale in [1, 3]:
+            data, cells = export(
+                exporters.create_exporter(exporters.GIF, scale=board_scale),
+                Board(7, 6, live_cells=GLIDER),
+                12
+            )
+            size, frames = decode_gif(data)
+
+            self.assertEqual(size, (7 * board_scale, 6 * board_scale))
+            self.assertEqual(len(frames), 12)
+            for frame, frame_cells in zip(frames, cells):
+                self.assertEqual(
+                    frame.tolist(),
+                    scale(frame_cells, board_scale).tolist()
+                )
+
+    def test_frames_only_hold_the_changed_region(self):
+        board = Board(100, 100, live_cells=[(50, 50), (50, 51), (50, 52)])
+        exporter = exporters.GifExporter()
+        exporter.get_header(board)
+        first_frame = exporter.encode(Frame(0, board, (), ()))
+        board.step()
+        second_frame = exporter.encode(Frame(1, board, (), ()))
+
+        self.assertEqual(
+            struct.unpack('<HHHH', second_frame[9:17]),
+            (49, 50, 3, 3)
+        )
+        self.assertLess(len(second_frame), len(first_frame) / 100)
+
+    def test_boards_too_large_for_gif(self):
+        with self.assertRaises(ValueError):
+            exporters.GifExporter(scale=2).get_header(Board(40000, 1))
+
+
+class ApngExporterTest(unittest.TestCase):
+
+    def test_frames_decode_to_the_scaled_cells(self):
+        for board_scale in [1, 2]:
+            data, cells = export(
+                exporters.create_exporter(
+                    exporters.APNG,
+                    frame_count=9,
+                    scale=board_scale
+                ),
+                Board(11, 5, live_cells=GLIDER),
+                9
+            )
+            size, frame_count, frames = decode_apng(data)
+
+            self.assertEqual(size, (11 * board_scale, 5 * board_scale))
+            self.assertEqual(frame_count, 9)
+            self.assertEqual(len(frames), 9)
+            for frame, frame_cells in zip(frames, cells):
+                self.assertEqual(
+                    frame.tolist(),
+                    scale(frame_cells, board_scale).tolist()
+                )
+
+    def test_frame_count_of_short_exports_is_corrected(self):
+        exporter = exporters.create_exporter(exporters.APNG, frame_count=9)
+        data, _ = export(exporter, Board(11, 5, live_cells=GLIDER), 4)
+        for offset, header_data in exporter.get_header_updates():
+            data = data[:offset] + header_data + \
+                data[offset + len(header_data):]
+
+        _, frame_count, frames = decode_apng(data)
+
+        self.assertEqual(frame_count, 4)
+        self.assertEqual(len(frames), 4)
+
+    def test_frame_count_is_needed(self):
+        with self.assertRaises(ValueError):
+            exporters.create_exporter(exporters.APNG)
+
+
+class Y4mExporterTest(unittest.TestCase):
+
+    def test_frames_hold_the_luma_of_the_scaled_cells(self):
+        data, cells = export(
+            exporters.create_exporter(
+                exporters.Y4M,
+                scale=2,
+                frames_per_second=29.97
+            ),
+            Board(5, 3, live_cells=GLIDER[:2]),
+            3
+        )
+        header, data = data.split('\n', 1)
+        self.assertEqual(
+            header,
+            'YUV4MPEG2 W10 H6 F2997:100 Ip A1:1 C420jpeg'
+        )
+
+        frame_size = len('FRAME\n') + 10 * 6 + 2 * 5 * 3
+        self.assertEqual(len(data), 3 * frame_size)
+        for index, frame_cells in enumerate(cells):
+            frame = data[index * frame_size:(index + 1) * frame_size]
+            self.assertTrue(frame.startswith('FRAME\n'))
+            luma = numpy.frombuffer(frame[6:66], dtype=numpy.uint8)
+            self.assertEqual(
+                luma.reshape((6, 10)).tolist(),
+                numpy.where(scale(frame_cells, 2), 16, 235).tolist()
+            )
+            self.assertEqual(frame[66:], '\x80' * 30)
+
+
+class CreateExporterTest(unittest.TestCase):
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            exporters.create_exporter('webm')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,19 @@
+import argparse
+import functools
+import StringIO
 import unittest
 
 import mock
 
 import game_of_life_runner
 from game_of_life import animators
+from game_of_life import checkpoints
+from game_of_life import exporters
+from game_of_life import recording
+from game_of_life.board import INFINITE
+from game_of_life.board import Board
+from game_of_life.chunked_board import ChunkedBoard
+from game_of_life.dense_board import DenseBoard
 from game_of_life.loader import Loader
 from game_of_life.drawer import Drawer
 
@@ -30,6 +40,222 @@ class GameOfLifeRunnerIntegrationTest(unittest.TestCase):
 
         print_function.assert_called_once_with('0 0 0\n1 1 1\n0 0 0')
 
+    def test_cycle_crossing_the_edge_of_the_infinite_window(self):
+        print_function = mock.Mock()
+        runner = game_of_life_runner.GameOfLifeRunner(
+            Loader(
+                input_function=lambda: '1 1 1',
+                board_factory=functools.partial(Board, topology=INFINITE)
+            ),
+            animators.SingleFrameAnimator(
+                Drawer(),
+                6,
+                print_function=print_function,
+                detect_cycles=True
+            )
+        )
+        runner.run()
+
+        print_function.assert_called_once_with('0 1 0')
+
+    def test_board_is_closed_when_the_run_fails(self):
+        board = Board(2, 2)
+        loader = mock.Mock()
+        loader.load.return_value = board
+        animator = mock.Mock()
+        animator.animate.side_effect = KeyboardInterrupt
+        runner = game_of_life_runner.GameOfLifeRunner(loader, animator)
+
+        with mock.patch.object(board, 'close') as close:
+            with self.assertRaises(KeyboardInterrupt):
+                runner.run()
+        close.assert_called_once_with()
+
+
+class RunnerCreatorFromArgsTest(unittest.TestCase):
+
+    def _create_args(self, **kwargs):
+        args = dict(
+            animator=None,
+            step_to_print=None,
+            generations_per_frame=1,
+            fps=1.0,
+            engine=None,
+            topology=None,
+            rule=None,
+            workers=None,
+            checkpoint_dir=None,
+            checkpoint_every=None,
+            checkpoint_interval=None,
+            checkpoints_to_keep=checkpoints.DEFAULT_CHECKPOINTS_TO_KEEP,
+            history_memory=0,
+            record=None,
+            record_encoding='text',
+            record_compression=None,
+            record_frames=None,
+            record_scale=1,
+            profile_cpu=None
+        )
+        args.update(kwargs)
+        return argparse.Namespace(**args)
+
+    def test_frame_rate_is_passed_to_animator(self):
+        args = self._create_args(
+            animator='print_all',
+            generations_per_frame=10,
+            fps=30.0
+        )
+        animator = game_of_life_runner.RunnerCreatorFromArgs(
+            args
+        )._create_animator(Drawer())
+
+        self.assertIsInstance(animator, animators.PrintAllAnimator)
+        self.assertEqual(animator._generations_per_frame, 10)
+        self.assertEqual(animator._frames_per_second, 30.0)
+
+    def test_heatmap_creates_profiler(self):
+        creator = game_of_life_runner.RunnerCreatorFromArgs(
+            self._create_args()
+        )
+        self.assertIsNone(creator._create_hooks(None, None))
+
+        heatmap_file = StringIO.StringIO()
+        hooks = creator._create_hooks(None, heatmap_file)
+        board = Board(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        hooks.on_load(board, 0.5)
+        board.step()
+        hooks.on_finish()
+
+        self.assertIsNotNone(board.statistics)
+        self.assertEqual(
+            heatmap_file.getvalue().splitlines()[0],
+            'x,y,changes'
+        )
+
+    def test_invalid_frame_rate(self):
+        for kwargs in [
+            {'generations_per_frame': 0},
+            {'fps': 0},
+            {'checkpoints_to_keep': 0},
+        ]:
+            creator = game_of_life_runner.RunnerCreatorFromArgs(
+                self._create_args(**kwargs)
+            )
+            with self.assertRaises(argparse.ArgumentTypeError):
+                creator._create_animator(Drawer())
+
+    def test_topology_is_passed_to_board_factory(self):
+        for kwargs, board_cls in [
+            ({'topology': 'torus', 'engine': 'sparse'}, Board),
+            ({'topology': 'torus', 'engine': 'dense'}, DenseBoard),
+            ({'topology': 'infinite'}, ChunkedBoard),
+            ({'engine': 'chunked'}, ChunkedBoard),
+        ]:
+            board_factory = game_of_life_runner.RunnerCreatorFromArgs(
+                self._create_args(**kwargs)
+            )._get_board_factory()
+            board = board_factory(3, 3, live_cells=[(0, 0)])
+
+            self.assertIsInstance(board, board_cls)
+            self.assertEqual(
+                board.topology,
+                kwargs.get('topology', 'infinite')
+            )
+
+    def test_invalid_topology(self):
+        for kwargs in [
+            {'topology': 'sphere'},
+            {'topology': 'torus', 'engine': 'packed'},
+            {'topology': 'bounded', 'engine': 'chunked'},
+            {'topology': 'torus', 'workers': 2},
+        ]:
+            creator = game_of_life_runner.RunnerCreatorFromArgs(
+                self._create_args(**kwargs)
+            )
+            with self.assertRaises(argparse.ArgumentTypeError):
+                creator._get_board_factory()
+
+    def test_rule_is_passed_to_board_factory(self):
+        for kwargs, board_cls in [
+            ({'rule': 'highlife', 'engine': 'sparse'}, Board),
+            ({'rule': 'B36/S23', 'engine': 'dense'}, DenseBoard),
+            ({'rule': '23/36', 'topology': 'infinite'}, ChunkedBoard),
+        ]:
+            board_factory = game_of_life_runner.RunnerCreatorFromArgs(
+                self._create_args(**kwargs)
+            )._get_board_factory()
+            board = board_factory(3, 3, live_cells=[(0, 0)], rule='seeds')
+
+            self.assertIsInstance(board, board_cls)
+            self.assertEqual(str(board.rule), 'B36/S23')
+
+    def test_invalid_rule(self):
+        creator = game_of_life_runner.RunnerCreatorFromArgs(
+            self._create_args(rule='B0/S23')
+        )
+        with self.assertRaises(argparse.ArgumentTypeError):
+            creator._get_board_factory()
+
+    def test_record_creates_recording_animator(self):
+        record_file = StringIO.StringIO()
+        animator = game_of_life_runner.RunnerCreatorFromArgs(
+            self._create_args(
+                record='recording.golr.gz',
+                record_encoding='deltas',
+                record_compression='gzip',
+                record_frames=10
+            )
+        )._create_animator(Drawer(), record_file=record_file)
+
+        self.assertIsInstance(animator, animators.RecordingAnimator)
+        self.assertIsInstance(animator._encoder, recording.DeltaEncoder)
+        self.assertEqual(animator._frame_count, 10)
+
+    def test_record_exports_animated_images(self):
+        animator = game_of_life_runner.RunnerCreatorFromArgs(
+            self._create_args(
+                record='recording.png',
+                record_encoding='apng',
+                record_frames=10,
+                record_scale=4,
+                fps=25.0
+            )
+        )._create_animator(Drawer(), record_file=StringIO.StringIO())
+
+        self.assertIsInstance(animator._encoder, exporters.ApngExporter)
+        self.assertEqual(animator._encoder._scale, 4)
+        self.assertEqual(animator._encoder._frames_per_second, 25.0)
+
+    def test_invalid_record_args(self):
+        for kwargs in [
+            {'record_encoding': 'video'},
+            {'record_compression': 'zip'},
+            {'record_frames': 0},
+            {'record_encoding': 'apng'},
+            {'record_encoding': 'gif', 'record_scale': 0},
+            {'animator': 'print_all'},
+            {'step_to_print': 3},
+        ]:
+            creator = game_of_life_runner.RunnerCreatorFromArgs(
+                self._create_args(record='-', **kwargs)
+            )
+            with self.assertRaises(argparse.ArgumentTypeError):
+                creator._create_animator(
+                    Drawer(),
+                    record_file=StringIO.StringIO()
+                )
+
+    def test_infinite_topology_can_not_be_checkpointed(self):
+        creator = game_of_life_runner.RunnerCreatorFromArgs(
+            self._create_args(
+                animator='print_all',
+                topology='infinite',
+                checkpoint_dir='checkpoints'
+            )
+        )
+        with self.assertRaises(argparse.ArgumentTypeError):
+            creator._create_animator(Drawer())
+
 
 if __name__ == '__main__':
     unittest.main()
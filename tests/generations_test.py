@@ -0,0 +1,237 @@
+import itertools
+import threading
+import time
+import unittest
+
+import mock
+
+from game_of_life import generations
+from game_of_life.board import Board
+from game_of_life.hashlife import HashLifeBoard
+from game_of_life.instrumentation import Hooks
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+def _get_boards(generation_count):
+    board = Board(8, 8, live_cells=GLIDER)
+    boards = [board.snapshot()]
+    for _ in xrange(generation_count - 1):
+        board.step()
+        boards.append(board.snapshot())
+    return boards
+
+
+class MergeStepDiffsTest(unittest.TestCase):
+
+    def test_cells_that_change_back_are_left_out(self):
+        self.assertEqual(
+            generations.merge_step_diffs(
+                (frozenset([(0, 0), (1, 1)]), frozenset([(2, 2)])),
+                (frozenset([(2, 2), (3, 3)]), frozenset([(0, 0), (4, 4)]))
+            ),
+            (frozenset([(1, 1), (3, 3)]), frozenset([(4, 4)]))
+        )
+
+
+class IterateGenerationsTest(unittest.TestCase):
+
+    def test_frames_follow_the_board(self):
+        boards = _get_boards(4)
+        frames = list(generations.iterate_generations(
+            Board(8, 8, live_cells=GLIDER),
+            stop=4,
+            track_step_diffs=True
+        ))
+
+        self.assertEqual([frame.generation for frame in frames], [0, 1, 2, 3])
+        self.assertEqual([frame.board for frame in frames], boards)
+        self.assertEqual(
+            (frames[0].born_cells, frames[0].died_cells),
+            (frozenset(), frozenset())
+        )
+        for previous_board, frame in zip(boards, frames[1:]):
+            previous_cells = previous_board.get_live_cells()
+            live_cells = frame.board.get_live_cells()
+            self.assertEqual(frame.born_cells, live_cells - previous_cells)
+            self.assertEqual(frame.died_cells, previous_cells - live_cells)
+
+    def test_start_and_stride(self):
+        boards = _get_boards(12)
+        frames = list(generations.iterate_generations(
+            Board(8, 8, live_cells=GLIDER),
+            start=3,
+            stop=12,
+            stride=4
+        ))
+
+        self.assertEqual([frame.generation for frame in frames], [3, 7, 11])
+        self.assertEqual(
+            [frame.board for frame in frames],
+            [boards[3], boards[7], boards[11]]
+        )
+
+    def test_only_yielded_frames_are_snapshotted(self):
+        board = Board(8, 8, live_cells=GLIDER)
+        with mock.patch.object(board, 'snapshot', wraps=board.snapshot) as \
+                snapshot:
+            with mock.patch.object(board, 'step', wraps=board.step) as step:
+                list(generations.iterate_generations(
+                    board,
+                    start=5,
+                    stop=9,
+                    stride=2
+                ))
+
+        self.assertEqual(snapshot.call_count, 2)
+        self.assertEqual(step.call_count, 7)
+
+    def test_board_is_stepped_lazily(self):
+        board = Board(8, 8, live_cells=GLIDER)
+        with mock.patch.object(board, 'step', wraps=board.step) as step:
+            frames = generations.iterate_generations(board)
+            self.assertFalse(step.called)
+            taken_frames = list(itertools.islice(frames, 3))
+
+        self.assertEqual(
+            [frame.generation for frame in taken_frames],
+            [0, 1, 2]
+        )
+        self.assertEqual(step.call_count, 2)
+
+    def test_boards_that_advance_jump_to_every_frame(self):
+        boards = _get_boards(11)
+        board = HashLifeBoard(8, 8, live_cells=GLIDER)
+        with mock.patch.object(board, 'advance', wraps=board.advance) as \
+                advance:
+            frames = list(generations.iterate_generations(
+                board,
+                start=5,
+                stop=11,
+                stride=5,
+                track_step_diffs=True
+            ))
+
+        self.assertEqual(
+            [frame.board for frame in frames],
+            [boards[5], boards[10]]
+        )
+        self.assertEqual(
+            advance.call_args_list,
+            [mock.call(5), mock.call(5)]
+        )
+        self.assertEqual(
+            frames[1].born_cells,
+            boards[10].get_live_cells() - boards[5].get_live_cells()
+        )
+
+    def test_first_generation_and_hooks(self):
+        hooks = mock.Mock(wraps=Hooks())
+        frames = list(generations.iterate_generations(
+            Board(8, 8, live_cells=GLIDER),
+            stop=13,
+            stride=2,
+            first_generation=10,
+            hooks=hooks
+        ))
+
+        self.assertEqual([frame.generation for frame in frames], [10, 12])
+        self.assertEqual(
+            [call[0][1] for call in hooks.on_step.call_args_list],
+            [11, 12]
+        )
+
+    def test_invalid_arguments(self):
+        board = Board(8, 8, live_cells=GLIDER)
+        for kwargs in [
+            {'stride': 0},
+            {'start': 4, 'first_generation': 5},
+        ]:
+            with self.assertRaises(ValueError):
+                generations.iterate_generations(board, **kwargs)
+
+
+class PrefetchFramesTest(unittest.TestCase):
+
+    def test_frames_are_taken_ahead_on_a_worker_thread(self):
+        thread_names = []
+
+        def get_frames():
+            for frame in xrange(5):
+                thread_names.append(threading.current_thread().name)
+                yield frame
+
+        self.assertEqual(
+            list(generations.prefetch_frames(get_frames(), 2)),
+            range(5)
+        )
+        self.assertNotIn(threading.current_thread().name, thread_names)
+
+    def test_worker_stops_when_closed(self):
+        taken_frames = []
+
+        def get_frames():
+            for frame in itertools.count():
+                taken_frames.append(frame)
+                yield frame
+
+        frames = generations.prefetch_frames(get_frames(), 2)
+        self.assertEqual(next(frames), 0)
+        frames.close()
+        taken_frame_count = len(taken_frames)
+        time.sleep(0.2)
+
+        self.assertLessEqual(taken_frame_count, 4)
+        self.assertEqual(len(taken_frames), taken_frame_count)
+
+    def test_errors_are_raised(self):
+        def get_frames():
+            yield 0
+            raise ValueError
+
+        frames = generations.prefetch_frames(get_frames(), 2)
+        self.assertEqual(next(frames), 0)
+        with self.assertRaises(ValueError):
+            next(frames)
+
+    def test_worker_runs_through_hooks(self):
+        hooks = mock.Mock(wraps=Hooks())
+        self.assertEqual(
+            list(generations.prefetch_frames(iter([1, 2]), 1, hooks=hooks)),
+            [1, 2]
+        )
+        hooks.run.assert_called_once_with(mock.ANY)
+
+
+class BoardGenerationsTest(unittest.TestCase):
+
+    def test_generations(self):
+        boards = _get_boards(7)
+        board = Board(8, 8, live_cells=GLIDER)
+
+        frames = list(board.generations(start=2, stop=7, stride=2))
+
+        self.assertEqual([frame.generation for frame in frames], [2, 4, 6])
+        self.assertEqual(
+            [frame.board for frame in frames],
+            [boards[2], boards[4], boards[6]]
+        )
+        self.assertEqual(board, boards[6])
+
+    def test_prefetched_generations(self):
+        boards = _get_boards(20)
+        frames = Board(8, 8, live_cells=GLIDER).generations(
+            stop=20,
+            track_step_diffs=True,
+            prefetch=3
+        )
+
+        self.assertEqual([frame.board for frame in frames], boards)
+
+    def test_invalid_start(self):
+        with self.assertRaises(ValueError):
+            Board(8, 8, live_cells=GLIDER).generations(start=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
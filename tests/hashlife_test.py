@@ -0,0 +1,187 @@
+import random
+import unittest
+
+import mock
+
+from game_of_life import errors
+from game_of_life.board import Board
+from game_of_life.hashlife import ALIVE
+from game_of_life.hashlife import DEAD
+from game_of_life.hashlife import HashLifeBoard
+from game_of_life.hashlife import NodeCache
+
+
+def create_random_live_cells(x_size, y_size, density=0.4):
+    random.seed(0)
+    return [
+        (x, y) for x in xrange(x_size) for y in xrange(y_size)
+        if random.random() < density
+    ]
+
+
+class HashLifeBoardCreationTest(unittest.TestCase):
+
+    def test_board_with_valid_cell(self):
+        board = HashLifeBoard(3, 2, live_cells=[(2, 1)])
+        self.assertEqual(board[2, 1], True)
+        self.assertEqual(board[1, 1], False)
+        self.assertEqual(board.get_population(), 1)
+
+    def test_out_of_bounds_lookup_is_dead(self):
+        board = HashLifeBoard(1, 1, live_cells=[(0, 0)])
+        for cell in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
+            self.assertEqual(board[cell], False)
+
+    def test_cant_create_live_cells_out_of_bounds(self):
+        for invalid_cell in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
+            with self.assertRaises(errors.InvalidBoardError):
+                HashLifeBoard(1, 1, live_cells=[invalid_cell])
+
+
+class HashLifeBoardAdvanceTest(unittest.TestCase):
+
+    def test_step_matches_sparse_board(self):
+        live_cells = create_random_live_cells(13, 7)
+        board = Board(13, 7, live_cells=live_cells)
+        hashlife_board = HashLifeBoard(13, 7, live_cells=live_cells)
+
+        for _ in xrange(10):
+            board.step()
+            hashlife_board.step()
+            self.assertEqual(hashlife_board, board)
+
+    def test_advance_matches_sparse_board(self):
+        live_cells = create_random_live_cells(20, 11)
+        board = Board(20, 11, live_cells=live_cells)
+        hashlife_board = HashLifeBoard(20, 11, live_cells=live_cells)
+
+        for generations in [1, 6, 37, 100]:
+            for _ in xrange(generations):
+                board.step()
+            hashlife_board.advance(generations)
+            self.assertEqual(hashlife_board, board)
+
+    def test_advance_matches_sparse_board_with_other_rules(self):
+        live_cells = create_random_live_cells(20, 11)
+        for rule in ['highlife', 'day-and-night', 'seeds']:
+            board = Board(20, 11, live_cells=live_cells, rule=rule)
+            hashlife_board = HashLifeBoard(
+                20,
+                11,
+                live_cells=live_cells,
+                rule=rule
+            )
+
+            for generations in [1, 6, 37]:
+                for _ in xrange(generations):
+                    board.step()
+                hashlife_board.advance(generations)
+                self.assertEqual(hashlife_board, board)
+
+    def test_node_cache_of_another_rule(self):
+        with self.assertRaises(ValueError):
+            HashLifeBoard(1, 1, node_cache=NodeCache(), rule='highlife')
+
+    def test_glider_dies_at_the_wall(self):
+        glider = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+        board = HashLifeBoard(8, 8, live_cells=glider)
+        board.advance(10 ** 9)
+        self.assertEqual(board.get_live_cells(), frozenset([
+            (6, 6), (7, 6), (6, 7), (7, 7)
+        ]))
+
+    def test_garbage_collection_keeps_results_correct(self):
+        live_cells = create_random_live_cells(16, 16)
+        board = Board(16, 16, live_cells=live_cells)
+        node_cache = NodeCache(max_nodes=10)
+        hashlife_board = HashLifeBoard(
+            16,
+            16,
+            live_cells=live_cells,
+            node_cache=node_cache
+        )
+
+        for _ in xrange(50):
+            board.step()
+            hashlife_board.step()
+        self.assertEqual(hashlife_board, board)
+        self.assertLess(len(node_cache), 1000)
+
+    def test_garbage_collection_keeps_results_of_kept_nodes(self):
+        node_cache = NodeCache()
+        dead = node_cache.leaf(DEAD)
+        alive = node_cache.leaf(ALIVE)
+        kept_result = node_cache.join(alive, dead, dead, dead)
+        evicted_result = node_cache.join(dead, alive, dead, dead)
+        empty = node_cache.join(dead, dead, dead, dead)
+        root = node_cache.join(kept_result, kept_result, kept_result, empty)
+        root.results = {0: kept_result, 1: evicted_result}
+
+        node_cache.collect_garbage([root])
+        self.assertEqual(root.results, {0: kept_result})
+        self.assertEqual(len(node_cache), 3)
+
+    def test_garbage_is_collected_during_a_jump(self):
+        live_cells = create_random_live_cells(16, 16)
+        board = Board(16, 16, live_cells=live_cells)
+        node_cache = NodeCache(max_nodes=50)
+        hashlife_board = HashLifeBoard(
+            16,
+            16,
+            live_cells=live_cells,
+            node_cache=node_cache
+        )
+
+        cache_sizes = []
+        join = node_cache.join
+
+        def join_and_record_cache_size(*children):
+            cache_sizes.append(len(node_cache))
+            return join(*children)
+
+        with mock.patch.object(
+            node_cache,
+            'join',
+            side_effect=join_and_record_cache_size
+        ):
+            hashlife_board.advance(64)
+        for _ in xrange(64):
+            board.step()
+        self.assertEqual(hashlife_board, board)
+        self.assertLess(max(cache_sizes), 1000)
+
+
+class HashLifeBoardStepDiffTest(unittest.TestCase):
+
+    def test_diff_of_blinker(self):
+        board = HashLifeBoard(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        self.assertEqual(board.get_step_diff(), (frozenset(), frozenset()))
+        board.step()
+        self.assertEqual(
+            board.get_step_diff(),
+            (frozenset([(0, 1), (2, 1)]), frozenset([(1, 0), (1, 2)]))
+        )
+
+
+
+class HashLifeBoardRegionTest(unittest.TestCase):
+
+    def test_block_populations_match_sparse_board(self):
+        live_cells = create_random_live_cells(37, 21)
+        board = Board(37, 21, live_cells=live_cells)
+        hashlife_board = HashLifeBoard(37, 21, live_cells=live_cells)
+
+        for region in [(0, 0, 37, 21), (8, 4, 24, 20), (3, 5, 30, 11)]:
+            for block_size in [1, 2, 3, 4, 8, 64]:
+                self.assertEqual(
+                    hashlife_board.get_block_populations(
+                        *region + (block_size,)
+                    ).tolist(),
+                    board.get_block_populations(
+                        *region + (block_size,)
+                    ).tolist()
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+
+from game_of_life import history
+from game_of_life.board import TORUS
+from game_of_life.board import Board
+from game_of_life.dense_board import DenseBoard
+from game_of_life.packed_board import PackedBoard
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+def record_generations(board_history, board, generations):
+    """Records `generations` generations of `board`, returning snapshots of
+    all of them.
+    """
+    snapshots = []
+    for generation in xrange(generations):
+        if generation:
+            board.step()
+        snapshot = board.snapshot()
+        snapshots.append(snapshot)
+        board_history.record(generation, snapshot, *board.get_step_diff())
+    return snapshots
+
+
+class HistoryTest(unittest.TestCase):
+
+    def test_every_generation_is_rebuilt(self):
+        for board_cls in [Board, DenseBoard, PackedBoard]:
+            board_history = history.History(keyframe_interval=4)
+            snapshots = record_generations(
+                board_history,
+                board_cls(8, 8, live_cells=GLIDER),
+                10
+            )
+
+            self.assertEqual(board_history.get_generations(), range(10))
+            for generation, snapshot in enumerate(snapshots):
+                self.assertEqual(
+                    board_history.get_board(generation),
+                    snapshot
+                )
+
+    def test_topology_and_rule_are_kept(self):
+        for board_cls in [Board, DenseBoard]:
+            board_history = history.History(keyframe_interval=4)
+            record_generations(
+                board_history,
+                board_cls(8, 8, GLIDER, topology=TORUS, rule='highlife'),
+                3
+            )
+
+            board = board_history.get_board(2)
+            self.assertEqual(board.topology, TORUS)
+            self.assertEqual(board.rule, Board(1, 1, rule='highlife').rule)
+
+    def test_keyframes_are_stored_every_interval(self):
+        board_history = history.History(keyframe_interval=4)
+        snapshots = record_generations(
+            board_history,
+            Board(8, 8, live_cells=GLIDER),
+            10
+        )
+
+        for generation in [0, 4, 8]:
+            self.assertIs(
+                board_history.get_board(generation),
+                snapshots[generation]
+            )
+
+    def test_least_recently_used_segments_are_evicted(self):
+        # Every keyframe holds 5 cells, and every delta 4 changed cells.
+        segment_size = 9 * history._CELL_BYTES
+        board_history = history.History(
+            keyframe_interval=2,
+            max_bytes=3 * segment_size
+        )
+        board = Board(20, 20, live_cells=GLIDER)
+        record_generations(board_history, board, 6)
+        board_history.get_board(1)
+        for generation in [6, 7]:
+            board.step()
+            board_history.record(
+                generation,
+                board.snapshot(),
+                *board.get_step_diff()
+            )
+
+        self.assertEqual(board_history.get_generations(), [0, 1, 4, 5, 6, 7])
+        self.assertNotIn(2, board_history)
+        self.assertIn(1, board_history)
+        with self.assertRaises(KeyError):
+            board_history.get_board(3)
+
+    def test_previous_and_next_generations(self):
+        board_history = history.History(keyframe_interval=3)
+        record_generations(board_history, Board(8, 8, live_cells=GLIDER), 5)
+
+        self.assertEqual(board_history.get_previous_generation(3), 2)
+        self.assertEqual(board_history.get_previous_generation(0), None)
+        self.assertEqual(board_history.get_next_generation(3), 4)
+        self.assertEqual(board_history.get_next_generation(4), None)
+
+    def test_generations_must_be_recorded_in_order(self):
+        board_history = history.History()
+        board = Board(3, 3)
+        board_history.record(5, board, (), ())
+
+        with self.assertRaises(ValueError):
+            board_history.record(5, board, (), ())
+
+
+if __name__ == '__main__':
+    unittest.main()
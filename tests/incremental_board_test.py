@@ -0,0 +1,136 @@
+import random
+import unittest
+
+import mock
+
+from game_of_life.board import INFINITE
+from game_of_life.board import TOPOLOGIES
+from game_of_life.board import Board
+from game_of_life.incremental_board import IncrementalBoard
+
+
+class IncrementalBoardStepTest(unittest.TestCase):
+
+    def test_matches_sparse_board_on_random_soup(self):
+        random.seed(0)
+        live_cells = [
+            (x, y) for x in xrange(25) for y in xrange(15)
+            if random.random() < 0.4
+        ]
+        board = Board(25, 15, live_cells=live_cells)
+        incremental_board = IncrementalBoard(25, 15, live_cells=live_cells)
+
+        for _ in xrange(30):
+            board.step()
+            incremental_board.step()
+            self.assertEqual(incremental_board, board)
+
+    def test_matches_sparse_board_on_every_topology(self):
+        random.seed(1)
+        live_cells = [
+            (x, y) for x in xrange(20) for y in xrange(10)
+            if random.random() < 0.4
+        ]
+        for topology in TOPOLOGIES:
+            board = Board(20, 10, live_cells=live_cells, topology=topology)
+            incremental_board = IncrementalBoard(
+                20,
+                10,
+                live_cells=live_cells,
+                topology=topology
+            )
+
+            for _ in xrange(30):
+                board.step()
+                incremental_board.step()
+                self.assertEqual(incremental_board, board)
+
+    def test_matches_sparse_board_with_other_rules(self):
+        random.seed(2)
+        live_cells = [
+            (x, y) for x in xrange(20) for y in xrange(10)
+            if random.random() < 0.4
+        ]
+        for rule in ['highlife', 'day-and-night', 'seeds']:
+            board = Board(20, 10, live_cells=live_cells, rule=rule)
+            incremental_board = IncrementalBoard(
+                20,
+                10,
+                live_cells=live_cells,
+                rule=rule
+            )
+
+            for _ in xrange(20):
+                board.step()
+                incremental_board.step()
+                self.assertEqual(incremental_board, board)
+
+    def test_neighbour_counts_of_infinite_board(self):
+        board = IncrementalBoard(1, 1, live_cells=[(0, 0)], topology=INFINITE)
+        self.assertEqual(len(board._neighbour_counts), 8)
+        self.assertEqual(board._neighbour_counts[-1, -1], 1)
+
+    def test_neighbour_counts_ignore_out_of_bounds_cells(self):
+        board = IncrementalBoard(2, 2, live_cells=[(0, 0)])
+        self.assertEqual(
+            board._neighbour_counts,
+            {(1, 0): 1, (0, 1): 1, (1, 1): 1}
+        )
+
+    def test_still_life_is_not_re_evaluated(self):
+        block = [(1, 1), (2, 1), (1, 2), (2, 2)]
+        board = IncrementalBoard(10, 10, live_cells=block)
+        board.step()
+
+        with mock.patch.object(
+            board,
+            '_should_cell_be_alive_in_next_step'
+        ) as should_cell_be_alive:
+            board.step()
+        self.assertFalse(should_cell_be_alive.called)
+        self.assertEqual(board.get_live_cells(), frozenset(block))
+
+    def test_only_cells_next_to_changes_are_evaluated(self):
+        blinker = [(1, 0), (1, 1), (1, 2)]
+        block = [(7, 7), (8, 7), (7, 8), (8, 8)]
+        board = IncrementalBoard(10, 10, live_cells=blinker + block)
+        board.step()
+
+        cells_with_potential_updates = board._get_cells_with_potential_updates()
+        self.assertFalse(
+            cells_with_potential_updates & set(block)
+        )
+        self.assertIn((1, 1), cells_with_potential_updates)
+
+
+class IncrementalBoardStepDiffTest(unittest.TestCase):
+
+    def test_diff_of_blinker(self):
+        board = IncrementalBoard(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        self.assertEqual(board.get_step_diff(), (frozenset(), frozenset()))
+        board.step()
+        self.assertEqual(
+            board.get_step_diff(),
+            (frozenset([(0, 1), (2, 1)]), frozenset([(1, 0), (1, 2)]))
+        )
+
+
+class IncrementalBoardStatisticsTest(unittest.TestCase):
+
+    def test_step_updates_statistics(self):
+        board = IncrementalBoard(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        statistics = board.track_statistics()
+
+        board.step()
+
+        self.assertEqual(statistics.population, 3)
+        self.assertEqual((statistics.births, statistics.deaths), (2, 2))
+        self.assertEqual(statistics.get_bounding_box(), (0, 1, 3, 2))
+        self.assertEqual(
+            statistics.get_heatmap(),
+            {(0, 1): 1, (2, 1): 1, (1, 0): 1, (1, 2): 1}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+import StringIO
+import csv
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import unittest
+
+import mock
+
+import game_of_life_runner
+from game_of_life import animators
+from game_of_life import instrumentation
+from game_of_life.board import Board
+from game_of_life.drawer import Drawer
+from game_of_life.loader import Loader
+
+BLINKER = [(1, 0), (1, 1), (1, 2)]
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_time_series(self):
+        output_file = StringIO.StringIO()
+        profiler = instrumentation.Profiler(output_file=output_file)
+        board = Board(3, 3, live_cells=BLINKER)
+
+        profiler.on_load(board, 0.5)
+        board.step()
+        profiler.on_step(board, 1, 0.25)
+        profiler.on_render(1, 0.125, 17)
+
+        output_file.seek(0)
+        rows = list(csv.DictReader(output_file))
+        self.assertEqual(
+            [
+                (
+                    row['phase'],
+                    row['generation'],
+                    row['seconds'],
+                    row['population'],
+                    row['candidates'],
+                    row['output_bytes']
+                )
+                for row in rows
+            ],
+            [
+                ('load', '0', '0.5', '3', '', ''),
+                ('step', '1', '0.25', '3', '9', ''),
+                ('render', '1', '0.125', '', '', '17'),
+            ]
+        )
+        self.assertTrue(all(int(row['peak_rss_kb']) > 0 for row in rows))
+
+    def test_time_series_holds_board_statistics(self):
+        output_file = StringIO.StringIO()
+        profiler = instrumentation.Profiler(output_file=output_file)
+        board = Board(3, 3, live_cells=BLINKER)
+
+        profiler.on_load(board, 0.5)
+        board.step()
+        profiler.on_step(board, 1, 0.25)
+
+        output_file.seek(0)
+        self.assertEqual(
+            [
+                [
+                    row[field] for field in
+                    ['births', 'deaths', 'x_start', 'y_start', 'x_stop',
+                     'y_stop']
+                ]
+                for row in csv.DictReader(output_file)
+            ],
+            [
+                ['0', '0', '1', '0', '2', '3'],
+                ['2', '2', '0', '1', '3', '2'],
+            ]
+        )
+
+    def test_heatmap(self):
+        heatmap_file = StringIO.StringIO()
+        profiler = instrumentation.Profiler(heatmap_file=heatmap_file)
+        board = Board(3, 3, live_cells=BLINKER)
+
+        profiler.on_load(board, 0.5)
+        board.step()
+        board.step()
+        profiler.on_finish()
+
+        heatmap_file.seek(0)
+        self.assertEqual(
+            list(csv.reader(heatmap_file)),
+            [
+                ['x', 'y', 'changes'],
+                ['1', '0', '2'],
+                ['0', '1', '2'],
+                ['2', '1', '2'],
+                ['1', '2', '2'],
+            ]
+        )
+
+    def test_boards_without_statistics_are_not_tracked(self):
+        output_file = StringIO.StringIO()
+        heatmap_file = StringIO.StringIO()
+        profiler = instrumentation.Profiler(
+            output_file=output_file,
+            heatmap_file=heatmap_file
+        )
+        board = mock.Mock()
+        board.track_statistics.side_effect = NotImplementedError
+        board.get_population.return_value = 3
+
+        profiler.on_load(board, 0.5)
+        profiler.on_finish()
+
+        output_file.seek(0)
+        self.assertEqual(
+            list(csv.DictReader(output_file))[0]['births'],
+            ''
+        )
+        self.assertEqual(heatmap_file.getvalue(), '')
+
+    def test_cpu_stats_of_every_thread_are_merged(self):
+        cpu_stats_filename = os.path.join(self.directory, 'stats')
+        profiler = instrumentation.Profiler(
+            cpu_stats_filename=cpu_stats_filename
+        )
+
+        def step_board():
+            Board(3, 3, live_cells=BLINKER).step()
+
+        thread = threading.Thread(
+            target=profiler.run,
+            args=(step_board,)
+        )
+        thread.start()
+        thread.join()
+        self.assertEqual(profiler.run(sum, [1, 2]), 3)
+        profiler.on_finish()
+
+        function_names = set(
+            function[2] for function in
+            pstats.Stats(cpu_stats_filename).stats
+        )
+        self.assertIn('step_board', function_names)
+        self.assertIn("<sum>", function_names)
+
+
+class HooksTest(unittest.TestCase):
+
+    def test_runner_and_single_frame_animator_report_every_phase(self):
+        hooks = mock.Mock(wraps=instrumentation.Hooks())
+        print_function = mock.Mock()
+        runner = game_of_life_runner.GameOfLifeRunner(
+            Loader(input_function=lambda: '0 1 0\n0 1 0\n0 1 0'),
+            animators.SingleFrameAnimator(
+                Drawer(),
+                3,
+                print_function=print_function,
+                hooks=hooks
+            ),
+            hooks=hooks
+        )
+
+        runner.run()
+
+        self.assertEqual(
+            [call[0] for call in hooks.method_calls],
+            ['run', 'on_load', 'on_step', 'on_step', 'on_render', 'on_finish']
+        )
+        self.assertEqual(
+            [call[0][1] for call in hooks.on_step.call_args_list],
+            [1, 2]
+        )
+        hooks.on_render.assert_called_once_with(2, mock.ANY, 17)
+        print_function.assert_called_once_with('0 1 0\n0 1 0\n0 1 0')
+
+    def test_finish_is_reported_when_the_run_fails(self):
+        hooks = mock.Mock(wraps=instrumentation.Hooks())
+        animator = mock.Mock()
+        animator.animate.side_effect = KeyboardInterrupt
+        runner = game_of_life_runner.GameOfLifeRunner(
+            Loader(input_function=lambda: '0 1\n1 1'),
+            animator,
+            hooks=hooks
+        )
+
+        with self.assertRaises(KeyboardInterrupt):
+            runner.run()
+        hooks.on_finish.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 import mock
@@ -41,5 +43,61 @@ class LoaderTest(unittest.TestCase):
         self._check_invalid_input_raises_exception("\n1")
 
 
+class StreamingLoaderTest(unittest.TestCase):
+
+    def setUp(self):
+        file_descriptor, self.filename = tempfile.mkstemp()
+        os.close(file_descriptor)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def _load(self, contents, **kwargs):
+        with open(self.filename, 'w') as output_file:
+            output_file.write(contents)
+        return loader.StreamingLoader(self.filename, **kwargs).load()
+
+    def test_load_with_chunks_smaller_than_rows(self):
+        for contents in ["0 0 0 0\n0 1 0 1\n", "0 0 0 0\n0 1 0 1"]:
+            board = self._load(contents, chunk_size=3)
+            self.assertEqual(
+                board,
+                Board(4, 2, live_cells=[(1, 1), (3, 1)])
+            )
+
+    def test_matches_loader(self):
+        with open('boards/gosper_glider_gun.txt') as input_file:
+            contents = input_file.read()
+        self.assertEqual(
+            self._load(contents, chunk_size=100),
+            loader.Loader(input_function=lambda: contents).load()
+        )
+
+    def test_board_factory_receives_live_cells_lazily(self):
+        board_factory = mock.Mock()
+        self._load("0 1\n1 0", board_factory=board_factory)
+
+        (x_size, y_size), kwargs = board_factory.call_args
+        self.assertEqual((x_size, y_size), (2, 2))
+        self.assertEqual(list(kwargs['live_cells']), [(1, 0), (0, 1)])
+
+    def test_reports_progress(self):
+        progress_function = mock.Mock()
+        self._load(
+            "0 1\n1 0\n",
+            chunk_size=4,
+            progress_function=progress_function
+        )
+        self.assertEqual(
+            progress_function.call_args_list,
+            [mock.call(4, 8), mock.call(8, 8)]
+        )
+
+    def test_invalid_boards_raise_invalid_board(self):
+        for contents in ["0 0 0 0\n0 1 k 0", "0 0\n0 1 k 0", "", "\n1"]:
+            with self.assertRaises(errors.InvalidBoardError):
+                self._load(contents)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,126 @@
+import random
+import unittest
+
+from game_of_life import errors
+from game_of_life.board import Board
+from game_of_life.dense_board import numpy
+from game_of_life.packed_board import PackedBoard
+
+
+def create_random_live_cells(x_size, y_size, density=0.4):
+    random.seed(0)
+    return [
+        (x, y) for x in xrange(x_size) for y in xrange(y_size)
+        if random.random() < density
+    ]
+
+
+class PackedBoardCreationTest(unittest.TestCase):
+
+    def test_board_with_valid_cell(self):
+        board = PackedBoard(70, 2, live_cells=[(0, 1), (69, 0)])
+        self.assertEqual(board[0, 1], True)
+        self.assertEqual(board[69, 0], True)
+        self.assertEqual(board[68, 0], False)
+
+    def test_out_of_bounds_lookup_is_dead(self):
+        board = PackedBoard(1, 1, live_cells=[(0, 0)])
+        for cell in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
+            self.assertEqual(board[cell], False)
+
+    def test_cant_create_live_cells_out_of_bounds(self):
+        for invalid_cell in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
+            with self.assertRaises(errors.InvalidBoardError):
+                PackedBoard(1, 1, live_cells=[invalid_cell])
+
+
+class PackedBoardConversionTest(unittest.TestCase):
+
+    def test_round_trip_through_board(self):
+        board = Board(130, 3, live_cells=create_random_live_cells(130, 3))
+        packed_board = PackedBoard.from_board(board)
+        self.assertEqual(packed_board, board)
+        self.assertEqual(packed_board.to_board(), board)
+
+    def test_round_trip_through_array(self):
+        live_cells = create_random_live_cells(100, 4)
+        packed_board = PackedBoard(100, 4, live_cells=live_cells)
+        cells = packed_board.to_array()
+
+        self.assertEqual(cells.shape, (4, 100))
+        self.assertEqual(cells.sum(), len(live_cells))
+        self.assertEqual(PackedBoard.from_array(cells), packed_board)
+
+
+class PackedBoardStepTest(unittest.TestCase):
+
+    def test_matches_sparse_board_across_word_boundaries(self):
+        for x_size in [1, 63, 64, 65, 150]:
+            live_cells = create_random_live_cells(x_size, 12)
+            board = Board(x_size, 12, live_cells=live_cells)
+            packed_board = PackedBoard(x_size, 12, live_cells=live_cells)
+
+            for _ in xrange(8):
+                board.step()
+                packed_board.step()
+                self.assertEqual(packed_board, board)
+
+    def test_matches_sparse_board_with_other_rules(self):
+        live_cells = create_random_live_cells(70, 12)
+        for rule in ['highlife', 'day-and-night', 'seeds', 'B1/S012345678']:
+            board = Board(70, 12, live_cells=live_cells, rule=rule)
+            packed_board = PackedBoard(
+                70,
+                12,
+                live_cells=live_cells,
+                rule=rule
+            )
+
+            for _ in xrange(8):
+                board.step()
+                packed_board.step()
+                self.assertEqual(packed_board, board)
+            self.assertEqual(packed_board.to_board().rule, board.rule)
+
+    def test_uses_one_bit_per_cell(self):
+        board = PackedBoard(128, 10)
+        self.assertEqual(board._words.nbytes, 128 * 10 / 8)
+        self.assertEqual(board._words.dtype, numpy.dtype('<u8'))
+
+
+class PackedBoardStepDiffTest(unittest.TestCase):
+
+    def test_diff_of_blinker(self):
+        board = PackedBoard(3, 3, live_cells=[(1, 0), (1, 1), (1, 2)])
+        self.assertEqual(board.get_step_diff(), (frozenset(), frozenset()))
+        board.step()
+        self.assertEqual(
+            board.get_step_diff(),
+            (frozenset([(0, 1), (2, 1)]), frozenset([(1, 0), (1, 2)]))
+        )
+
+
+
+class PackedBoardRegionTest(unittest.TestCase):
+
+    def test_matches_sparse_board_across_word_boundaries(self):
+        live_cells = create_random_live_cells(150, 20)
+        board = Board(150, 20, live_cells=live_cells)
+        packed_board = PackedBoard(150, 20, live_cells=live_cells)
+
+        for region in [(0, 0, 150, 20), (60, 3, 130, 17), (64, 0, 150, 20)]:
+            self.assertTrue(numpy.array_equal(
+                packed_board.get_region_array(*region),
+                board.get_region_array(*region)
+            ))
+            for block_size in [1, 3, 8, 16]:
+                self.assertTrue(numpy.array_equal(
+                    packed_board.get_block_populations(
+                        *region + (block_size,)
+                    ),
+                    board.get_block_populations(*region + (block_size,))
+                ))
+
+
+if __name__ == '__main__':
+    unittest.main()
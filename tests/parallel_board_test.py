@@ -0,0 +1,90 @@
+import multiprocessing
+import random
+import unittest
+
+from game_of_life.board import Board
+from game_of_life.parallel_board import ParallelBoard
+
+
+def create_random_live_cells(x_size, y_size, density=0.4):
+    random.seed(0)
+    return [
+        (x, y) for x in xrange(x_size) for y in xrange(y_size)
+        if random.random() < density
+    ]
+
+
+class ParallelBoardStepTest(unittest.TestCase):
+
+    def _check_matches_sparse_board(self, **kwargs):
+        live_cells = create_random_live_cells(23, 17)
+        board = Board(
+            23,
+            17,
+            live_cells=live_cells,
+            rule=kwargs.get('rule', 'conway')
+        )
+        parallel_board = ParallelBoard(23, 17, live_cells=live_cells, **kwargs)
+
+        try:
+            for _ in xrange(10):
+                board.step()
+                parallel_board.step()
+                self.assertEqual(parallel_board, board)
+        finally:
+            parallel_board.close()
+
+    def test_horizontal_tiles_in_process(self):
+        self._check_matches_sparse_board(workers=1)
+
+    def test_rectangular_tiles_in_process(self):
+        self._check_matches_sparse_board(workers=1, tile_shape=(5, 4))
+
+    def test_rectangular_tiles_on_worker_processes(self):
+        self._check_matches_sparse_board(workers=2, tile_shape=(7, 3))
+
+    def test_other_rule_on_worker_processes(self):
+        self._check_matches_sparse_board(workers=2, rule='day-and-night')
+
+    def test_diff_of_blinker(self):
+        board = ParallelBoard(3, 3, [(1, 0), (1, 1), (1, 2)], workers=1)
+        board.step()
+        self.assertEqual(
+            board.get_step_diff(),
+            (frozenset([(0, 1), (2, 1)]), frozenset([(1, 0), (1, 2)]))
+        )
+
+    def test_tiles_cover_the_board(self):
+        board = ParallelBoard(10, 7, workers=1, tile_shape=(4, 3))
+        self.assertEqual(len(board._tiles), 9)
+        self.assertEqual(
+            sum(
+                (x_stop - x_start) * (y_stop - y_start)
+                for x_start, x_stop, y_start, y_stop in board._tiles
+            ),
+            70
+        )
+
+
+    def test_snapshot_is_not_changed_by_later_steps(self):
+        live_cells = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+        board = ParallelBoard(6, 6, live_cells, workers=1)
+        snapshot = board.snapshot()
+        board.step()
+        board.step()
+        self.assertEqual(snapshot, Board(6, 6, live_cells))
+        self.assertNotEqual(snapshot, board)
+
+    def test_workers_are_stopped_on_exit(self):
+        processes = set(multiprocessing.active_children())
+        with ParallelBoard(6, 6, [(1, 0), (1, 1), (1, 2)], workers=2) as board:
+            board.step()
+            self.assertEqual(
+                len(set(multiprocessing.active_children()) - processes),
+                2
+            )
+        self.assertEqual(set(multiprocessing.active_children()), processes)
+
+
+if __name__ == '__main__':
+    unittest.main()
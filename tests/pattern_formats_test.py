@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+
+from game_of_life import errors
+from game_of_life import pattern_formats
+from game_of_life.board import INFINITE
+from game_of_life.board import Board
+from game_of_life.loader import Loader
+from game_of_life.loader import create_input_function_from_filename
+
+GLIDER_RLE = """#N Glider
+#C A comment
+x = 3, y = 3, rule = B3/S23
+bob$2bo$3o!
+"""
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+class RleLoaderTest(unittest.TestCase):
+
+    def _load(self, rle):
+        return pattern_formats.RleLoader(input_function=lambda: rle).load()
+
+    def test_load_glider(self):
+        self.assertEqual(self._load(GLIDER_RLE), Board(3, 3, GLIDER))
+
+    def test_load_multi_row_runs_and_wrapped_lines(self):
+        board = self._load('x = 4, y = 4\n2o2$\n3bo!')
+        self.assertEqual(board, Board(4, 4, [(0, 0), (1, 0), (3, 2)]))
+
+    def test_load_rule_from_header(self):
+        board = self._load('x = 3, y = 1, rule = 23/36\n3o!')
+        self.assertEqual(str(board.rule), 'B36/S23')
+
+    def test_invalid_rle_raises_invalid_board(self):
+        for rle in [
+            '',
+            'bo$2bo$3o!',
+            'x = 3, y = 3\nbo$2bo$3o',
+            'x = 3, y = 3\nbk!',
+            'x = 3, y = 3, rule = B0/S23\nbo!',
+            'x = 3, y = 3, rule = life\nbo!',
+            'x = 1, y = 1\n2o!',
+        ]:
+            with self.assertRaises(errors.InvalidBoardError):
+                self._load(rle)
+
+
+class Life106LoaderTest(unittest.TestCase):
+
+    def _load(self, life_106):
+        return pattern_formats.Life106Loader(
+            input_function=lambda: life_106
+        ).load()
+
+    def test_load_moves_bounding_box_to_origin(self):
+        board = self._load('#Life 1.06\n0 -1\n1 0\n-1 1\n0 1\n1 1\n')
+        self.assertEqual(board, Board(3, 3, GLIDER))
+
+    def test_invalid_life_106_raises_invalid_board(self):
+        for life_106 in ['#Life 1.06\n', '#Life 1.06\n0 1 2', '#Life 1.06\na b']:
+            with self.assertRaises(errors.InvalidBoardError):
+                self._load(life_106)
+
+
+class DumpTest(unittest.TestCase):
+
+    def setUp(self):
+        self.board = Loader(
+            create_input_function_from_filename('boards/gosper_glider_gun.txt')
+        ).load()
+
+    def test_dump_rle_round_trip(self):
+        rle = pattern_formats.dump_rle(self.board)
+        self.assertTrue(
+            all(len(line) <= 70 for line in rle.splitlines())
+        )
+        self.assertEqual(
+            pattern_formats.RleLoader(input_function=lambda: rle).load(),
+            self.board
+        )
+
+    def test_dump_rle_glider(self):
+        self.assertEqual(
+            pattern_formats.dump_rle(Board(3, 3, GLIDER)),
+            'x = 3, y = 3, rule = B3/S23\nbo$2bo$3o!'
+        )
+
+    def test_dump_rle_keeps_rule(self):
+        rle = pattern_formats.dump_rle(Board(3, 3, GLIDER, rule='highlife'))
+        self.assertEqual(rle, 'x = 3, y = 3, rule = B36/S23\nbo$2bo$3o!')
+        self.assertEqual(
+            pattern_formats.RleLoader(input_function=lambda: rle).load().rule,
+            Board(1, 1, rule='highlife').rule
+        )
+
+    def test_dump_rle_cells_outside_of_the_window(self):
+        board = Board(
+            3,
+            3,
+            [(x - 2, y - 1) for x, y in GLIDER] + [(4, 0)],
+            topology=INFINITE
+        )
+        rle = pattern_formats.dump_rle(board)
+        self.assertEqual(rle, 'x = 7, y = 4, rule = B3/S23\nbo$2bo3bo$3o!')
+        self.assertEqual(
+            pattern_formats.RleLoader(input_function=lambda: rle).load(),
+            Board(7, 4, GLIDER + [(6, 1)])
+        )
+
+    def test_dump_life_106(self):
+        self.assertEqual(
+            pattern_formats.dump_life_106(Board(3, 3, GLIDER)),
+            '#Life 1.06\n1 0\n2 1\n0 2\n1 2\n2 2'
+        )
+
+
+class GetPatternLoaderClsTest(unittest.TestCase):
+
+    def _get_loader_cls(self, contents, suffix=''):
+        file_descriptor, filename = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(file_descriptor, 'w') as output_file:
+            output_file.write(contents)
+        try:
+            return pattern_formats.get_pattern_loader_cls(filename)
+        finally:
+            os.remove(filename)
+
+    def test_detects_formats(self):
+        self.assertEqual(
+            self._get_loader_cls('bo!', suffix='.rle'),
+            pattern_formats.RleLoader
+        )
+        self.assertEqual(
+            self._get_loader_cls(GLIDER_RLE),
+            pattern_formats.RleLoader
+        )
+        self.assertEqual(
+            self._get_loader_cls('#Life 1.06\n0 0'),
+            pattern_formats.Life106Loader
+        )
+        self.assertEqual(self._get_loader_cls('0 1\n1 0'), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import bz2
+import gzip
+import StringIO
+import unittest
+
+import mock
+
+from game_of_life import errors
+from game_of_life import recording
+from game_of_life.board import INFINITE
+from game_of_life.board import Board
+from game_of_life.drawer import Drawer
+from game_of_life.generations import Frame
+from game_of_life.packed_board import PackedBoard
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+def record_frames(encoder, board, frame_count):
+    output_file = StringIO.StringIO()
+    output_file.write(encoder.get_header(board))
+    for generation in xrange(frame_count):
+        if generation:
+            board.step()
+        output_file.write(encoder.encode(
+            Frame(generation, board.snapshot(), *board.get_step_diff())
+        ))
+    output_file.seek(0)
+    return output_file
+
+
+class EncoderTest(unittest.TestCase):
+
+    def test_text_frames_are_printed_like_print_all(self):
+        encoder = recording.create_encoder(recording.TEXT, Drawer())
+        board = Board(2, 2, live_cells=[(1, 1)])
+        self.assertEqual(encoder.get_header(board), '')
+        self.assertEqual(
+            encoder.encode(Frame(4, board, frozenset(), frozenset())),
+            'Iteration 5\n0 0\n0 1\n\n'
+        )
+
+    def test_delta_frames_round_trip(self):
+        board = Board(
+            3,
+            3,
+            live_cells=GLIDER,
+            topology=INFINITE,
+            rule='B36/S23'
+        )
+        expected_board = board.snapshot()
+        frames = list(recording.read_frames(record_frames(
+            recording.create_encoder(recording.DELTAS, Drawer()),
+            board,
+            30
+        )))
+
+        self.assertEqual([frame.generation for frame in frames], range(30))
+        self.assertEqual(frames[0].born_cells, frozenset(GLIDER))
+        for frame in frames:
+            self.assertEqual(frame.board, expected_board)
+            self.assertEqual(frame.board.topology, INFINITE)
+            self.assertEqual(str(frame.board.rule), 'B36/S23')
+            expected_board.step()
+        # The glider has left the window.
+        self.assertFalse(frames[-1].board.get_region_array(0, 0, 3, 3).any())
+
+    def test_bitmap_frames_round_trip(self):
+        board = Board(70, 5, live_cells=GLIDER + [(69, 4), (68, 4), (67, 4)])
+        expected_board = board.snapshot()
+        frames = list(recording.read_frames(record_frames(
+            recording.create_encoder(recording.BITMAP, Drawer()),
+            board,
+            5
+        )))
+
+        self.assertEqual(len(frames), 5)
+        for frame in frames:
+            self.assertIsInstance(frame.board, PackedBoard)
+            self.assertEqual(frame.board, expected_board)
+            expected_board.step()
+
+    def test_invalid_recordings_raise_invalid_board(self):
+        recorded = record_frames(
+            recording.create_encoder(recording.DELTAS, Drawer()),
+            Board(3, 3, live_cells=GLIDER),
+            2
+        ).getvalue()
+        for data in ['', 'GOLB' + recorded[4:], recorded[:-1]]:
+            with self.assertRaises(errors.InvalidBoardError):
+                list(recording.read_frames(StringIO.StringIO(data)))
+
+    def test_unknown_encoding(self):
+        with self.assertRaises(ValueError):
+            recording.create_encoder('video', Drawer())
+
+
+class FrameWriterTest(unittest.TestCase):
+
+    def test_writes_are_buffered_into_chunks(self):
+        output_file = mock.Mock()
+        writer = recording.FrameWriter(
+            output_file,
+            buffer_size=4,
+            background=False
+        )
+        writer.write('ab')
+        self.assertFalse(output_file.write.called)
+        writer.write('cd')
+        writer.write('e')
+        writer.close()
+
+        self.assertEqual(
+            output_file.write.call_args_list,
+            [mock.call('abcd'), mock.call('e'), mock.call('')]
+        )
+        self.assertEqual(writer.bytes_written, 5)
+
+    def test_compressed_streams_can_be_opened(self):
+        data = ''.join(
+            'Iteration %i\n0 1 0\n\n' % index for index in xrange(999)
+        )
+        for compression, open_function in [
+            (recording.GZIP, lambda data: gzip.GzipFile(fileobj=data)),
+            (recording.BZ2, lambda data: StringIO.StringIO(
+                bz2.decompress(data.getvalue())
+            )),
+        ]:
+            output_file = StringIO.StringIO()
+            writer = recording.FrameWriter(
+                output_file,
+                compression=compression,
+                buffer_size=1000
+            )
+            for index in xrange(0, len(data), 300):
+                writer.write(data[index:index + 300])
+            writer.close()
+            output_file.seek(0)
+
+            self.assertLess(len(output_file.getvalue()), len(data) / 5)
+            self.assertEqual(open_function(output_file).read(), data)
+
+    def test_overwrite_bytes_of_the_recording(self):
+        output_file = StringIO.StringIO()
+        output_file.write('Previous output\n')
+        writer = recording.FrameWriter(output_file, buffer_size=2)
+        writer.write('abcd')
+        writer.write('ef')
+        writer.close()
+
+        self.assertTrue(writer.overwrite(1, 'XY'))
+        writer.write('g')
+        self.assertEqual(output_file.getvalue(), 'Previous output\naXYdef')
+
+    def test_overwrite_needs_an_uncompressed_file_that_can_seek(self):
+        output_file = mock.Mock()
+        output_file.tell.side_effect = IOError
+        writer = recording.FrameWriter(output_file, background=False)
+        writer.write('ab')
+        writer.close()
+        self.assertFalse(writer.overwrite(0, 'X'))
+
+        writer = recording.FrameWriter(
+            StringIO.StringIO(),
+            compression=recording.GZIP
+        )
+        writer.write('ab')
+        writer.close()
+        self.assertFalse(writer.overwrite(0, 'X'))
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            recording.FrameWriter(StringIO.StringIO(), compression='zip')
+
+    def test_background_errors_are_raised(self):
+        output_file = mock.Mock()
+        output_file.write.side_effect = IOError
+        writer = recording.FrameWriter(output_file, buffer_size=1)
+        writer.write('a')
+
+        with self.assertRaises(IOError):
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
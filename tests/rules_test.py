@@ -0,0 +1,53 @@
+import unittest
+
+from game_of_life import errors
+from game_of_life.rules import CONWAY
+from game_of_life.rules import Rule
+from game_of_life.rules import parse_rule
+
+
+class ParseRuleTest(unittest.TestCase):
+
+    def test_notations_and_names(self):
+        for rule in ['B36/S23', 'b36/s23', 'B36S23', '23/36', 'HighLife']:
+            self.assertEqual(parse_rule(rule), Rule([3, 6], [2, 3]))
+
+    def test_rule_objects_are_returned_as_they_are(self):
+        self.assertIs(parse_rule(CONWAY), CONWAY)
+
+    def test_empty_counts(self):
+        rule = parse_rule('seeds')
+        self.assertEqual(rule.births, frozenset([2]))
+        self.assertEqual(rule.survivals, frozenset())
+
+    def test_invalid_rules(self):
+        for rule in ['', 'life', 'B3/S29', 'S23/B3', 'B0/S23', '23/03']:
+            with self.assertRaises(errors.InvalidRuleError):
+                parse_rule(rule)
+
+    def test_invalid_rules_are_invalid_boards(self):
+        self.assertTrue(
+            issubclass(errors.InvalidRuleError, errors.InvalidBoardError)
+        )
+
+
+class RuleTest(unittest.TestCase):
+
+    def test_table_of_conway(self):
+        self.assertEqual(
+            CONWAY.table,
+            (0, 0, 0, 1, 0, 0, 0, 0, 0) + (0, 0, 1, 1, 0, 0, 0, 0, 0)
+        )
+
+    def test_str_sorts_counts(self):
+        self.assertEqual(str(Rule([8, 3, 7, 6], [3, 4])), 'B3678/S34')
+        self.assertEqual(repr(parse_rule('seeds')), "Rule('B2/S')")
+
+    def test_equality(self):
+        self.assertEqual(parse_rule('B3/S23'), CONWAY)
+        self.assertNotEqual(parse_rule('highlife'), CONWAY)
+        self.assertEqual(len(set([parse_rule('23/3'), CONWAY])), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import time
+import unittest
+
+import mock
+
+from game_of_life import simulation
+from game_of_life.board import Board
+from game_of_life.hashlife import HashLifeBoard
+from game_of_life.instrumentation import Hooks
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+class SimulationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.simulation = None
+
+    def tearDown(self):
+        if self.simulation is not None:
+            self.simulation.stop()
+
+    def _start(self, board, **kwargs):
+        self.simulation = simulation.Simulation(board, **kwargs)
+        self.simulation.start()
+        return self.simulation
+
+    def _wait_until_queue_is_full(self):
+        while not self.simulation._frames.full():
+            time.sleep(0.01)
+
+    def test_frames_follow_the_board(self):
+        expected_board = Board(6, 6, live_cells=GLIDER)
+        frames = self._start(Board(6, 6, live_cells=GLIDER))
+
+        for generation in xrange(4):
+            frame = frames.get_frame()
+            self.assertEqual(frame.generation, generation)
+            self.assertEqual(frame.board, expected_board)
+            if generation:
+                self.assertEqual(
+                    (frame.born_cells, frame.died_cells),
+                    expected_board.get_step_diff()
+                )
+            expected_board.step()
+
+    def test_step_diffs_can_be_left_out(self):
+        frames = self._start(
+            Board(6, 6, live_cells=GLIDER),
+            generations_per_frame=2,
+            track_step_diffs=False
+        )
+        frames.get_frame()
+        frame = frames.get_frame()
+
+        self.assertEqual(frame.generation, 2)
+        self.assertEqual(frame.born_cells, frozenset())
+        self.assertEqual(frame.died_cells, frozenset())
+
+    def test_boards_are_advanced_a_frame_at_a_time(self):
+        expected_board = Board(8, 8, live_cells=GLIDER)
+        for _ in xrange(5):
+            expected_board.step()
+
+        frames = self._start(
+            HashLifeBoard(8, 8, live_cells=GLIDER),
+            generations_per_frame=5
+        )
+        frames.get_frame()
+        frame = frames.get_frame()
+
+        self.assertEqual(frame.generation, 5)
+        self.assertEqual(frame.board, expected_board)
+        self.assertEqual(
+            frame.born_cells,
+            expected_board.get_live_cells() - frozenset(GLIDER)
+        )
+
+    def test_dropped_frames_are_merged_into_the_latest_frame(self):
+        frames = self._start(
+            Board(6, 6, live_cells=GLIDER),
+            max_queued_frames=2
+        )
+        first_frame = frames.get_frame()
+        self._wait_until_queue_is_full()
+
+        frame = frames.get_frame(drop_queued_frames=True)
+
+        self.assertEqual(frame.generation, 2)
+        live_cells = frame.board.get_live_cells()
+        first_live_cells = first_frame.board.get_live_cells()
+        self.assertEqual(frame.born_cells, live_cells - first_live_cells)
+        self.assertEqual(frame.died_cells, first_live_cells - live_cells)
+
+    def test_every_step_is_reported_to_the_hooks(self):
+        hooks = mock.Mock(wraps=Hooks())
+        frames = self._start(
+            Board(6, 6, live_cells=GLIDER),
+            generations_per_frame=2,
+            hooks=hooks
+        )
+        frames.get_frame()
+        frames.get_frame()
+        frames.get_frame()
+
+        hooks.run.assert_called_once_with(mock.ANY)
+        self.assertEqual(
+            [call[0][1] for call in hooks.on_step.call_args_list[:4]],
+            [1, 2, 3, 4]
+        )
+
+    def test_frames_start_at_the_first_generation_and_are_checkpointed(self):
+        checkpointer = mock.Mock()
+        frames = self._start(
+            Board(6, 6, live_cells=GLIDER),
+            first_generation=10,
+            checkpointer=checkpointer
+        )
+        first_frame = frames.get_frame()
+        frame = frames.get_frame()
+
+        self.assertEqual(first_frame.generation, 10)
+        self.assertEqual(frame.generation, 11)
+        checkpointer.update.assert_any_call(frame.board, 11)
+
+    def test_no_frame_within_timeout(self):
+        board = mock.Mock(spec=['step', 'get_step_diff', 'snapshot'])
+        board.step.side_effect = lambda: time.sleep(0.5)
+        frames = self._start(board)
+        frames.get_frame()
+
+        self.assertIsNone(frames.get_frame(timeout=0))
+
+    def test_errors_while_stepping_are_raised(self):
+        board = mock.Mock(spec=['step', 'get_step_diff', 'snapshot'])
+        board.step.side_effect = ValueError
+        frames = self._start(board)
+        frames.get_frame()
+
+        with self.assertRaises(ValueError):
+            frames.get_frame()
+
+
+if __name__ == '__main__':
+    unittest.main()
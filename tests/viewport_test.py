@@ -0,0 +1,63 @@
+import unittest
+
+from game_of_life.viewport import Viewport
+
+
+class ViewportTest(unittest.TestCase):
+
+    def test_region_is_clipped_to_the_board(self):
+        self.assertEqual(Viewport(10, 3, 7, 5).get_region(), (0, 0, 4, 3))
+        self.assertEqual(Viewport(2, 2, 80, 20).get_region(), (0, 0, 2, 2))
+
+    def test_pan_stays_on_the_board(self):
+        viewport = Viewport(100, 100, 39, 10)
+        viewport.pan(-1, -1)
+        self.assertEqual((viewport.x, viewport.y), (0, 0))
+
+        viewport.pan(1, 1)
+        self.assertEqual((viewport.x, viewport.y), (5, 2))
+
+        for _ in xrange(100):
+            viewport.pan(1, 1)
+        self.assertEqual(viewport.get_region(), (80, 90, 100, 100))
+
+    def test_zoom_out_stops_when_the_whole_board_fits(self):
+        viewport = Viewport(1000, 300, 80, 20)
+        for _ in xrange(10):
+            viewport.zoom_out()
+        self.assertEqual(viewport.zoom, 16)
+        self.assertEqual(viewport.get_region(), (0, 0, 1000, 300))
+
+        for _ in xrange(10):
+            viewport.zoom_in()
+        self.assertEqual(viewport.zoom, 1)
+
+    def test_zoom_keeps_the_centre_in_place(self):
+        viewport = Viewport(1000, 1000, 20, 10)
+        viewport.x = 500
+        viewport.y = 500
+        viewport.zoom_out()
+        self.assertEqual(viewport.zoom, 2)
+        self.assertEqual(viewport.get_region(), (486, 496, 526, 516))
+
+    def test_resize_limits_zoom(self):
+        viewport = Viewport(64, 64, 4, 4)
+        viewport.zoom_out()
+        viewport.zoom_out()
+        viewport.zoom_out()
+        self.assertEqual(viewport.zoom, 8)
+
+        viewport.resize(16, 16)
+        self.assertEqual(viewport.zoom, 4)
+
+    def test_contains_and_relative_position(self):
+        viewport = Viewport(100, 100, 19, 10)
+        viewport.pan(1, 1)
+        self.assertEqual(viewport.get_region(), (2, 2, 12, 12))
+        self.assertTrue(viewport.contains((2, 11)))
+        self.assertFalse(viewport.contains((12, 2)))
+        self.assertEqual(viewport.get_relative_position((3, 4)), (1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()